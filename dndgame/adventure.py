@@ -1,7 +1,16 @@
 """Adventure orchestration utilities.
 
 Contains the `Adventure` class that manages encounters and story
-progression for a single-player session.
+progression for a single-player session. Completed encounters and combat
+results are kept in bounded-memory `History` buffers, so sessions can
+run indefinitely without growing. Given a `World`, an adventure loads its
+scenes and encounters from disk on demand and only offers the encounters
+of the current scene.
+
+Every status change bumps the adventure's `version` and is written to a
+bounded change journal, so polling clients can ask `changes_since` for
+just the changes after the version they last saw, while callbacks
+registered with `subscribe` get each change pushed as it happens.
 
 Examples:
     >>> from dndgame.character import Character
@@ -11,11 +20,114 @@ Examples:
     >>> adv = Adventure("Intro", "A small quest.", c)
     >>> bool(adv.get_available_encounters_list())
     True
+    >>> adv.changes_since(adv.version).changes
+    ()
 """
 
 from __future__ import annotations
 
+import os
+from types import MappingProxyType, TracebackType
+from typing import Any, Callable, Iterator, Mapping, NamedTuple, Optional, Sequence, Type
+
 from dndgame.character import Character
+from dndgame.combat import LogEvent
+from dndgame.history import History
+from dndgame.world import Scene, World
+
+
+class SceneEncounters(Mapping[str, dict[str, Any]]):
+    """The encounters of an adventure's current scene, loaded on demand.
+
+    Only the current scene's encounter keys are consulted; definitions
+    are read from the world when looked up.
+    """
+
+    def __init__(self, adventure: Adventure, world: World) -> None:
+        """Initialize the view.
+
+        Args:
+            adventure: The adventure whose current scene is used.
+            world: The world to load encounters from.
+        """
+        self._adventure = adventure
+        self._world = world
+
+    def _keys(self) -> tuple[str, ...]:
+        return self._world.scene(self._adventure.current_scene).encounters
+
+    def __getitem__(self, key: str) -> dict[str, Any]:
+        if key not in self._keys():
+            raise KeyError(key)
+        return self._world.encounter(key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._keys()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys())
+
+    def __len__(self) -> int:
+        return len(self._keys())
+
+
+class _CompletedBits:
+    """The completed encounters of a world, one bit per encounter.
+
+    Memory is fixed by the world's encounter count rather than growing
+    with every encounter completed.
+    """
+
+    def __init__(self, world: World) -> None:
+        self._world = world
+        self._bits = bytearray((world.encounter_count + 7) // 8)
+
+    def add(self, key: str) -> None:
+        index = self._world.encounter_index(key)
+        self._bits[index >> 3] |= 1 << (index & 7)
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, str):
+            return False
+        try:
+            index = self._world.encounter_index(key)
+        except KeyError:
+            return False
+        return bool(self._bits[index >> 3] >> (index & 7) & 1)
+
+
+class Change(NamedTuple):
+    """One change to an adventure's status.
+
+    Attributes:
+        version: The adventure's version after the change.
+        kind: "scene" when the current scene changed, "completed" when an
+            encounter was completed.
+        key: The new scene key or the completed encounter key.
+        available: For scene changes, the encounters available in the new
+            scene; empty otherwise.
+    """
+
+    version: int
+    kind: str
+    key: str
+    available: tuple[str, ...] = ()
+
+
+class StatusDelta(NamedTuple):
+    """Answer to `Adventure.changes_since`.
+
+    Attributes:
+        version: The adventure's current version.
+        changes: Changes after the requested version, oldest first.
+        snapshot: The full status instead, as a read-only copy with tuples
+            for lists, when the requested version is no longer in the
+            journal or was never issued; None otherwise.
+    """
+
+    version: int
+    changes: tuple[Change, ...]
+    snapshot: Optional[Mapping[str, int | str | Sequence[str]]] = None
 
 
 class Adventure:
@@ -28,25 +140,67 @@ class Adventure:
         name: The adventure's title/name.
         description: A description of the adventure's plot.
         player: The main character participating in the adventure.
-        current_scene: The current location or scene in the adventure.
-        completed_encounters: List of encounter names that have been completed.
-        available_encounters: Dictionary of available encounters to choose from.
+        current_scene: The current location or scene in the adventure; the
+            scene key in world mode.
+        world: The world scenes are loaded from, or None for the built-in
+            three-encounter adventure.
+        completed_encounters: Encounter keys completed so far, oldest first.
+        combat_history: Results of combats recorded with `record_combat`.
+        available_encounters: Mapping of available encounters to choose from.
+        version: Number of status changes so far.
+        journal_size: Most recent changes kept for `changes_since`.
     """
 
-    def __init__(self, name: str, description: str, player: Character) -> None:
+    def __init__(self, name: str, description: str, player: Character,
+                 history_capacity: int = 256,
+                 history_dir: Optional[str] = None,
+                 world: Optional[World] = None,
+                 journal_size: int = 1024) -> None:
         """Initialize a new adventure.
 
         Args:
             name: The adventure's title.
             description: A description of the adventure's main plot.
             player: The character who will participate in this adventure.
+            history_capacity: Entries of each history kept in memory.
+            history_dir: Directory for history spill files; defaults to
+                anonymous temporary files.
+            world: Load scenes and encounters from this world, starting
+                at its start scene.
+            journal_size: Most recent changes kept for `changes_since`.
         """
         self.name: str = name
         self.description: str = description
         self.player: Character = player
-        self.current_scene: str = "Starting Area"
-        self.completed_encounters: list[str] = []
-        self.available_encounters: dict[str, dict[str, str]] = {
+        self._current_scene: str = "Starting Area"
+        self.version: int = 0
+        self.journal_size: int = journal_size
+        # Changes for versions _journal_base + 1 onwards, trimmed in batches
+        self._journal: list[Change] = []
+        self._journal_base = 0
+        self._subscribers: tuple[Callable[[Change], None], ...] = ()
+
+        def spill_path(kind: str) -> Optional[str]:
+            if history_dir is None:
+                return None
+            return os.path.join(history_dir, f"{kind}.jsonl")
+
+        self.completed_encounters: History[str] = History(
+            history_capacity, spill_path("encounters"))
+        self.combat_history: History[dict[str, Any]] = History(
+            history_capacity, spill_path("combats"))
+        # Completed keys for lookups without reading spilled history
+        self._completed: set[str] | _CompletedBits = set()
+        self.world: Optional[World] = world
+        # Set by `restore`, which opens the world itself
+        self._owns_world = False
+        self.available_encounters: Mapping[str, dict[str, Any]]
+        if world is not None:
+            self._current_scene = world.start
+            self._completed = _CompletedBits(world)
+            self.available_encounters = SceneEncounters(self, world)
+            return
+        self.available_encounters = {
             "goblin_ambush": {
                 "name": "Goblin Ambush",
                 "description": "A group of goblins blocks your path",
@@ -64,6 +218,147 @@ class Adventure:
             }
         }
 
+    @property
+    def current_scene(self) -> str:
+        """The current location, or the scene key in world mode."""
+        return self._current_scene
+
+    @current_scene.setter
+    def current_scene(self, scene: str) -> None:
+        if scene == self._current_scene:
+            return
+        self._current_scene = scene
+        self._record("scene", scene, tuple(self.get_available_encounters_list()))
+
+    def _record(self, kind: str, key: str, available: tuple[str, ...] = ()) -> None:
+        """Bump the version, journal the change and push it to subscribers."""
+        self.version += 1
+        change = Change(self.version, kind, key, available)
+        journal = self._journal
+        journal.append(change)
+        if len(journal) >= 2 * self.journal_size:
+            dropped = len(journal) - self.journal_size
+            del journal[:dropped]
+            self._journal_base += dropped
+        for callback in self._subscribers:
+            callback(change)
+
+    def changes_since(self, version: int) -> StatusDelta:
+        """Get the status changes made after a version.
+
+        Answers in constant time when nothing has changed.
+
+        Args:
+            version: The last version the caller has seen, e.g. from
+                `get_adventure_status` or a previous delta.
+
+        Returns:
+            A `StatusDelta` with the missed changes, or with a full
+            snapshot if they are no longer journaled.
+        """
+        if version == self.version:
+            return StatusDelta(version, ())
+        start = version - self._journal_base
+        if version > self.version or start < 0:
+            status = self.get_adventure_status()
+            snapshot = {key: tuple(value) if isinstance(value, list) else value
+                        for key, value in status.items()}
+            return StatusDelta(self.version, (), MappingProxyType(snapshot))
+        return StatusDelta(self.version, tuple(self._journal[start:]))
+
+    def subscribe(self, callback: Callable[[Change], None]) -> Callable[[], None]:
+        """Push every future status change to a callback.
+
+        Args:
+            callback: Called with each `Change` right after it is made.
+
+        Returns:
+            A function that cancels the subscription.
+        """
+        self._subscribers += (callback,)
+
+        def unsubscribe() -> None:
+            self._subscribers = tuple(cb for cb in self._subscribers if cb is not callback)
+
+        return unsubscribe
+
+    def export_state(self) -> dict[str, Any]:
+        """Get the adventure's state as plain, picklable data.
+
+        Covers the progress, both histories (spilled entries included),
+        the world's path, the version and the change journal, so
+        `restore` continues the adventure exactly where it was. The
+        player and the subscribers are not included.
+
+        Returns:
+            The state, for `restore`.
+        """
+        return {
+            "name": self.name,
+            "description": self.description,
+            "current_scene": self.current_scene,
+            "world": self.world.path if self.world is not None else None,
+            "history_capacity": self.completed_encounters.capacity,
+            "completed_encounters": list(self.completed_encounters),
+            "combat_history": list(self.combat_history),
+            "version": self.version,
+            "journal_size": self.journal_size,
+            "journal_base": self._journal_base,
+            "journal": [tuple(change) for change in self._journal],
+        }
+
+    @classmethod
+    def restore(cls, state: Mapping[str, Any], player: Character,
+                history_dir: Optional[str] = None) -> Adventure:
+        """Rebuild an adventure from `export_state` without recording changes.
+
+        Args:
+            state: The exported state.
+            player: The character participating in the adventure.
+            history_dir: Directory for the restored histories' spill files.
+
+        Returns:
+            The adventure, at the exported version.
+        """
+        world = World(state["world"]) if state["world"] is not None else None
+        adventure = cls(state["name"], state["description"], player,
+                        history_capacity=state["history_capacity"],
+                        history_dir=history_dir, world=world,
+                        journal_size=state["journal_size"])
+        adventure._owns_world = world is not None
+        adventure._current_scene = state["current_scene"]
+        for key in state["completed_encounters"]:
+            adventure.completed_encounters.append(key)
+            adventure._completed.add(key)
+        for entry in state["combat_history"]:
+            adventure.combat_history.append(entry)
+        adventure.version = state["version"]
+        adventure._journal_base = state["journal_base"]
+        adventure._journal = [Change(version, kind, key, tuple(available))
+                              for version, kind, key, available in state["journal"]]
+        return adventure
+
+    def close(self) -> None:
+        """Close the history spill files, and the world if `restore` opened it.
+
+        Spilled history entries are no longer readable afterwards.
+        """
+        self.completed_encounters.close()
+        self.combat_history.close()
+        if self._owns_world and self.world is not None:
+            self.world.close()
+
+    def __enter__(self) -> Adventure:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
     def start_adventure(self) -> None:
         """Begin the adventure and display the initial setup.
 
@@ -72,7 +367,39 @@ class Adventure:
         """
         print(f"Beginning adventure: {self.name}")
         print(f"Description: {self.description}")
-        print(f"Current location: {self.current_scene}")
+        scene = self.scene
+        print(f"Current location: {scene.name if scene else self.current_scene}")
+
+    @property
+    def scene(self) -> Optional[Scene]:
+        """The current scene loaded from the world, or None without a world."""
+        if self.world is None:
+            return None
+        return self.world.scene(self.current_scene)
+
+    def get_exits(self) -> list[str]:
+        """Get the keys of the scenes reachable from the current scene.
+
+        Returns:
+            Scene keys; empty without a world.
+        """
+        scene = self.scene
+        return list(scene.exits) if scene else []
+
+    def move_to(self, scene_key: str) -> None:
+        """Move to a neighboring scene.
+
+        Args:
+            scene_key: Key of a scene listed in the current scene's exits.
+
+        Raises:
+            ValueError: If there is no world or the scene is not an exit.
+        """
+        if scene_key not in self.get_exits():
+            raise ValueError(f"Cannot move to '{scene_key}' from '{self.current_scene}'")
+        assert self.world is not None
+        self.current_scene = scene_key
+        print(f"You travel to {self.world.scene(scene_key).name}")
 
     def choose_encounter(self, encounter_key: str) -> bool:
         """Attempt to start a specific encounter.
@@ -90,7 +417,7 @@ class Adventure:
             raise KeyError(f"Encounter '{encounter_key}' not found")
 
         encounter = self.available_encounters[encounter_key]
-        if encounter_key in self.completed_encounters:
+        if encounter_key in self._completed:
             print(f"Encounter '{encounter['name']}' already completed!")
             return False
 
@@ -100,7 +427,7 @@ class Adventure:
         return True
 
     def complete_encounter(self, encounter_key: str) -> None:
-        """Mark an encounter as completed and provide rewards.
+        """Mark an encounter as completed and award experience to the player.
 
         Args:
             encounter_key: The key of the encounter that was completed.
@@ -112,11 +439,12 @@ class Adventure:
         if encounter_key not in self.available_encounters:
             raise ValueError(f"Encounter '{encounter_key}' not found")
 
-        if encounter_key in self.completed_encounters:
+        if encounter_key in self._completed:
             raise ValueError(f"Encounter '{encounter_key}' already completed")
 
         encounter = self.available_encounters[encounter_key]
         self.completed_encounters.append(encounter_key)
+        self._completed.add(encounter_key)
 
         # Provide rewards based on encounter difficulty
         if encounter["difficulty"] == "Easy":
@@ -128,6 +456,10 @@ class Adventure:
 
         print(f"Completed: {encounter['name']}")
         print(f"Experience gained: {exp_gain}")
+        if self.player.gain_experience(exp_gain):
+            print(f"{self.player.name} reached level {self.player.level}!")
+        # Publish only once the reward is applied, so subscribers see it
+        self._record("completed", encounter_key)
 
     def get_available_encounters_list(self) -> list[str]:
         """Get a list of encounters that haven't been completed yet.
@@ -136,18 +468,37 @@ class Adventure:
             List of encounter keys that are available to start.
         """
         return [key for key in self.available_encounters.keys()
-                if key not in self.completed_encounters]
+                if key not in self._completed]
 
-    def get_adventure_status(self) -> dict[str, str | list[str]]:
+    def record_combat(self, winner: str, log: list[LogEvent]) -> None:
+        """Add a finished combat to the combat history.
+
+        Args:
+            winner: "Player" or "Enemy".
+            log: The combat log returned by `Combat.run`.
+        """
+        # Only attack events are rounds, not a final max_rounds_reached event
+        rounds = sum(1 for event in log if "defender_hp" in event)
+        self.combat_history.append({"winner": winner, "rounds": rounds, "log": log})
+
+    def get_adventure_status(self) -> dict[str, int | str | Sequence[str]]:
         """Get the current status of the adventure.
 
+        Only the completed encounters still held in memory are listed, so
+        polling never reads spilled history back from disk;
+        ``completed_count`` gives the total. Pass the returned version to
+        `changes_since` to poll for changes.
+
         Returns:
-            Dictionary containing adventure name, current scene, completed
-            encounters, and available encounters.
+            Dictionary containing the version, adventure name, current
+            scene, the most recent completed encounters, the number of
+            completed encounters, and available encounters.
         """
         return {
+            "version": self.version,
             "name": self.name,
             "current_scene": self.current_scene,
-            "completed_encounters": self.completed_encounters.copy(),
+            "completed_encounters": self.completed_encounters.recent(),
+            "completed_count": len(self.completed_encounters),
             "available_encounters": self.get_available_encounters_list()
         }
\ No newline at end of file
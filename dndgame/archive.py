@@ -0,0 +1,354 @@
+"""Columnar on-disk archive of combat logs.
+
+Stores the attack events of many combats as fixed-width columns (roll,
+crit, dmg, defender_hp, dictionary-encoded attacker/defender names and
+the defender's dictionary-encoded type, i.e. its race) plus a per-combat
+offset index. Archives are opened through `mmap`, and columns are
+exposed as memoryviews over the mapped file, so queries scan only the
+columns they need and never rebuild `AttackEvent` dicts unless asked to.
+
+File layout (native little-endian, sections padded to 8 bytes):
+    header, roll, dmg, defender_hp, attacker, defender, defender_type,
+    crit, combat offsets, winners, max_rounds flags, name and type
+    tables (JSON)
+
+Examples:
+    >>> from dndgame.archive import ArchiveWriter, CombatArchive
+    >>> with ArchiveWriter("fights.dca") as writer:
+    ...     writer.add("Player", [{"attacker": "Hero", "defender": "Goblin",
+    ...                            "roll": 18, "crit": False, "dmg": 3,
+    ...                            "defender_hp": 4}],
+    ...                types={"Hero": "Human", "Goblin": "Goblin"})
+    >>> with CombatArchive("fights.dca") as archive:
+    ...     archive.damage_histogram(enemy_type="Goblin")
+    {3: 1}
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import struct
+import sys
+from array import array
+from collections import Counter
+from types import TracebackType
+from typing import Iterable, List, Literal, Mapping, Optional, Tuple, Type
+
+from dndgame.combat import AttackEvent, LogEvent
+
+
+MAGIC = b"DNDCLOG2"
+_HEADER = struct.Struct("<8sQQQ")
+
+# Array typecodes used by the archive sections
+TypeCode = Literal["i", "I", "B", "Q"]
+
+# Fixed-width event columns and their array typecodes
+COLUMNS: Tuple[Tuple[str, TypeCode], ...] = (
+    ("roll", "i"),
+    ("dmg", "i"),
+    ("defender_hp", "i"),
+    ("attacker", "I"),
+    ("defender", "I"),
+    ("defender_type", "I"),
+    ("crit", "B"),
+)
+
+# Type id of defenders whose type was not given
+UNKNOWN_TYPE = 0xFFFFFFFF
+
+
+def _padded(n: int) -> int:
+    return (n + 7) // 8 * 8
+
+
+def _check_byteorder() -> None:
+    if sys.byteorder != "little":
+        raise ValueError("Combat archives require a little-endian platform")
+
+
+class ArchiveWriter:
+    """Builds a combat archive file.
+
+    Events are buffered in compact arrays and written out on `close`.
+
+    Attributes:
+        path: Destination file path.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Start a new archive.
+
+        Args:
+            path: Destination file path; an existing file is replaced on close.
+        """
+        _check_byteorder()
+        self.path: str = path
+        self._columns: dict[str, array[int]] = {
+            name: array(code) for name, code in COLUMNS
+        }
+        self._offsets: array[int] = array("Q", [0])
+        self._winners: array[int] = array("B")
+        self._capped: array[int] = array("B")
+        self._names: dict[str, int] = {}
+        self._types: dict[str, int] = {}
+
+    @staticmethod
+    def _intern(table: dict[str, int], name: str) -> int:
+        name_id = table.get(name)
+        if name_id is None:
+            name_id = table[name] = len(table)
+        return name_id
+
+    def add(self, winner: str, log: Iterable[LogEvent],
+            types: Optional[Mapping[str, str]] = None) -> None:
+        """Append one combat.
+
+        Args:
+            winner: "Player" or "Enemy", as returned by `Combat.run`.
+            log: The combat log.
+            types: Type (race) of each combatant by name, such as
+                ``{player.name: player.race, enemy.name: enemy.race}``.
+                Defenders missing from it are stored with an unknown type.
+        """
+        columns = self._columns
+        types = types or {}
+        type_ids = {name: self._intern(self._types, kind) for name, kind in types.items()}
+        capped = 0
+        for event in log:
+            if "defender_hp" not in event:
+                capped = 1
+                continue
+            attack: AttackEvent = event  # type: ignore[assignment]
+            columns["roll"].append(attack["roll"])
+            columns["dmg"].append(attack["dmg"])
+            columns["defender_hp"].append(attack["defender_hp"])
+            columns["attacker"].append(self._intern(self._names, attack["attacker"]))
+            columns["defender"].append(self._intern(self._names, attack["defender"]))
+            columns["defender_type"].append(type_ids.get(attack["defender"], UNKNOWN_TYPE))
+            columns["crit"].append(1 if attack["crit"] else 0)
+        self._offsets.append(len(columns["roll"]))
+        self._winners.append(0 if winner == "Player" else 1)
+        self._capped.append(capped)
+
+    def close(self) -> None:
+        """Write the archive to disk."""
+        names = json.dumps({
+            "names": sorted(self._names, key=self._names.__getitem__),
+            "types": sorted(self._types, key=self._types.__getitem__),
+        }).encode()
+        sections = [self._columns[name] for name, _ in COLUMNS]
+        sections += [self._offsets, self._winners, self._capped]
+        with open(self.path, "wb") as fh:
+            fh.write(_HEADER.pack(MAGIC, len(self._columns["roll"]),
+                                  len(self._winners), len(names)))
+            for section in sections:
+                data = section.tobytes()
+                fh.write(data)
+                fh.write(bytes(_padded(len(data)) - len(data)))
+            fh.write(names)
+
+    def __enter__(self) -> ArchiveWriter:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        if exc_type is None:
+            self.close()
+
+
+class CombatArchive:
+    """A memory-mapped, read-only view of a combat archive.
+
+    Attributes:
+        path: The archive file path.
+        events: Number of attack events stored.
+        combats: Number of combats stored.
+        names: Entity names, indexed by their dictionary id.
+        types: Defender types, indexed by their dictionary id.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Open an archive.
+
+        Args:
+            path: The archive file path.
+
+        Raises:
+            ValueError: If the file is not a combat archive.
+        """
+        _check_byteorder()
+        self.path: str = path
+        with open(path, "rb") as fh:
+            self._mmap = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, events, combats, names_len = _HEADER.unpack_from(self._mmap)
+        if magic != MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a combat archive")
+        self.events: int = events
+        self.combats: int = combats
+
+        self._view = memoryview(self._mmap)
+        self._columns: dict[str, memoryview] = {}
+        pos = _padded(_HEADER.size)
+        sections: List[Tuple[str, TypeCode]] = list(COLUMNS) + [("offsets", "Q"), ("winners", "B"), ("capped", "B")]
+        for name, code in sections:
+            count = combats + 1 if name == "offsets" else (
+                combats if name in ("winners", "capped") else events)
+            size = count * array(code).itemsize
+            self._columns[name] = self._view[pos:pos + size].cast(code)
+            pos += _padded(size)
+        tables = json.loads(bytes(self._view[pos:pos + names_len]))
+        self.names: List[str] = tables["names"]
+        self.types: List[str] = tables["types"]
+        self._ids: dict[str, int] = {name: i for i, name in enumerate(self.names)}
+        self._type_ids: dict[str, int] = {kind: i for i, kind in enumerate(self.types)}
+
+    def column(self, name: str) -> memoryview:
+        """Get a zero-copy view of a column.
+
+        Args:
+            name: A name from `COLUMNS`, or "offsets", "winners" or "capped".
+
+        Returns:
+            A memoryview over the mapped file.
+
+        Raises:
+            KeyError: If the column does not exist.
+        """
+        return self._columns[name]
+
+    def combat(self, index: int) -> List[LogEvent]:
+        """Rebuild the log of one combat.
+
+        Args:
+            index: Combat number, in the order combats were added.
+
+        Returns:
+            The combat log, including a max_rounds_reached event if the
+            combat was force-resolved.
+        """
+        offsets = self._columns["offsets"]
+        start, end = offsets[index], offsets[index + 1]
+        c = self._columns
+        names = self.names
+        log: List[LogEvent] = [
+            {
+                "attacker": names[c["attacker"][i]],
+                "defender": names[c["defender"][i]],
+                "roll": c["roll"][i],
+                "crit": bool(c["crit"][i]),
+                "dmg": c["dmg"][i],
+                "defender_hp": c["defender_hp"][i],
+            }
+            for i in range(start, end)
+        ]
+        if c["capped"][index]:
+            log.append({"event": "max_rounds_reached", "rounds": end - start})
+        return log
+
+    def winner(self, index: int) -> str:
+        """Get the winner of one combat.
+
+        Args:
+            index: Combat number.
+
+        Returns:
+            "Player" or "Enemy".
+        """
+        return "Enemy" if self._columns["winners"][index] else "Player"
+
+    def combat_of(self, event: int) -> int:
+        """Find the combat an event belongs to using the offset index.
+
+        Args:
+            event: Event number.
+
+        Returns:
+            The combat number.
+        """
+        offsets = self._columns["offsets"]
+        lo, hi = 0, self.combats
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if offsets[mid + 1] <= event:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def crits_by(self, attacker: str) -> List[int]:
+        """Find every critical hit by an attacker.
+
+        Only the crit and attacker columns are scanned.
+
+        Args:
+            attacker: The attacker's name.
+
+        Returns:
+            Event numbers of the matching attacks.
+        """
+        name_id = self._ids.get(attacker)
+        if name_id is None:
+            return []
+        crit, attackers = self._columns["crit"], self._columns["attacker"]
+        return [i for i, (c, a) in enumerate(zip(crit, attackers)) if c and a == name_id]
+
+    def damage_histogram(
+        self, attacker: Optional[str] = None, defender: Optional[str] = None,
+        enemy_type: Optional[str] = None,
+    ) -> dict[int, int]:
+        """Count attacks by damage dealt.
+
+        Args:
+            attacker: Only count attacks made by this name.
+            defender: Only count attacks against this name.
+            enemy_type: Only count attacks against defenders of this type,
+                as given to `ArchiveWriter.add`.
+
+        Returns:
+            Mapping of damage to number of attacks, sorted by damage.
+        """
+        dmg = self._columns["dmg"]
+        filters = []
+        for name, column, ids in ((attacker, "attacker", self._ids),
+                                  (defender, "defender", self._ids),
+                                  (enemy_type, "defender_type", self._type_ids)):
+            if name is not None:
+                if name not in ids:
+                    return {}
+                filters.append((self._columns[column], ids[name]))
+
+        if not filters:
+            counts = Counter(dmg)
+        elif len(filters) == 1:
+            values, wanted_id = filters[0]
+            counts = Counter(d for d, i in zip(dmg, values) if i == wanted_id)
+        else:
+            columns = [column for column, _ in filters]
+            wanted_row = tuple(want for _, want in filters)
+            counts = Counter(d for d, *row in zip(dmg, *columns) if tuple(row) == wanted_row)
+        return dict(sorted(counts.items()))
+
+    def close(self) -> None:
+        """Release the column views and unmap the file."""
+        for view in self._columns.values():
+            view.release()
+        self._view.release()
+        self._mmap.close()
+
+    def __enter__(self) -> CombatArchive:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
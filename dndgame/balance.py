@@ -0,0 +1,293 @@
+"""Exact racial-balance analytics for the race registry.
+
+For every race in `races.RACES` the exact 3d6 ability score distribution
+is shifted by the race's bonuses and pushed through the same formulas
+the game uses: `ability_modifier`, `max_hp_for_level` and
+`attack_bonus_for_level`. Probabilities are exact fractions, so a report
+takes milliseconds instead of minutes of sampling.
+
+Duel win rates pit two unarmed characters against each other under the
+rules of `Combat.run`. A character's kill time (the attack on which its
+damage first reaches the opponent's hit points) depends only on its own
+attack and the opponent's max HP, which come from independent stats, so
+each side's kill-time distribution is mixed separately and the two are
+combined in one pass. Win rates average over who attacks first. Fights
+still going at ``max_rounds``, where `Combat.finish` would compare hit
+points, are reported as undecided.
+
+Derived values are computed from the bonused scores. Note that
+`Character.roll_stats` sets max HP and attack before
+`Character.apply_racial_bonuses` is called, so in play only the ability
+modifiers reflect the bonuses.
+
+Reports are cached and rebuilt automatically when the registry changes,
+including races added with `register_race`. Cached reports are handed
+out as read-only mappings.
+
+Examples:
+    >>> from dndgame.balance import race_report
+    >>> dwarf = race_report("Dwarf")
+    >>> dwarf.mean_modifiers["CON"], dwarf.mean_max_hp
+    (Fraction(1, 1), Fraction(11, 1))
+    >>> race_report("Dwarf") is dwarf
+    True
+"""
+
+from __future__ import annotations
+
+from fractions import Fraction
+from functools import lru_cache
+from itertools import accumulate
+from types import MappingProxyType
+from typing import Callable, Mapping, NamedTuple
+
+from dndgame import dice
+from dndgame.progression import ability_modifier, attack_bonus_for_level, max_hp_for_level
+from dndgame.races import RACES, STAT_NAMES
+from dndgame.solver import NEGLIGIBLE_MASS, damage_distribution
+
+
+# Armor class every character starts with, and so its defense
+ARMOR_CLASS = 10
+
+Distribution = Mapping[int, Fraction]
+
+
+class Duel(NamedTuple):
+    """Outcome probabilities of a duel between two races.
+
+    Attributes:
+        win: Probability the race wins.
+        loss: Probability the opponent wins.
+        undecided: Probability the fight reaches ``max_rounds``.
+    """
+
+    win: float
+    loss: float
+    undecided: float
+
+
+class RaceReport(NamedTuple):
+    """Exact balance figures for one race.
+
+    Attributes:
+        race: The race name.
+        bonuses: The race's stat bonuses.
+        modifiers: Distribution of each stat's ability modifier.
+        max_hp: Distribution of max HP.
+        attack: Distribution of the attack bonus.
+        duels: Duel outcome against every race in the registry.
+    """
+
+    race: str
+    bonuses: Mapping[str, int]
+    modifiers: Mapping[str, Distribution]
+    max_hp: Distribution
+    attack: Distribution
+    duels: Mapping[str, Duel]
+
+    @property
+    def mean_modifiers(self) -> dict[str, Fraction]:
+        """Expected ability modifier per stat."""
+        return {stat: mean(dist) for stat, dist in self.modifiers.items()}
+
+    @property
+    def mean_max_hp(self) -> Fraction:
+        """Expected max HP."""
+        return mean(self.max_hp)
+
+    @property
+    def mean_attack(self) -> Fraction:
+        """Expected attack bonus."""
+        return mean(self.attack)
+
+
+def mean(distribution: Distribution) -> Fraction:
+    """Get the expected value of an exact distribution."""
+    return sum((value * p for value, p in distribution.items()), Fraction(0))
+
+
+def _push(distribution: Distribution, f: Callable[[int], int]) -> Distribution:
+    result: dict[int, Fraction] = {}
+    for value, p in distribution.items():
+        mapped = f(value)
+        result[mapped] = result.get(mapped, Fraction(0)) + p
+    return MappingProxyType(dict(sorted(result.items())))
+
+
+def modifier_distribution(bonus: int = 0) -> Distribution:
+    """Get the exact distribution of an ability modifier.
+
+    Args:
+        bonus: Racial bonus added to the 3d6 score.
+
+    Returns:
+        Mapping of modifier to probability.
+    """
+    scores = dice.compile_dice("3d6").distribution()
+    return _push(scores, lambda score: ability_modifier(score + bonus))
+
+
+@lru_cache(maxsize=4096)
+def kill_times(attack: int, defense: int, hp: int, attacks: int) -> tuple[float, ...]:
+    """Get the distribution of the attack on which a target first drops.
+
+    Args:
+        attack: The attacker's attack bonus.
+        defense: The target's defense.
+        hp: The target's hit points.
+        attacks: Most attacks the attacker gets.
+
+    Returns:
+        ``p`` where ``p[k]`` is the probability the target drops on attack
+        ``k``; ``p[0]`` is 1 when the target starts at 0 HP or less. Mass
+        missing from the total is the chance the target survives.
+    """
+    if hp <= 0:
+        return (1.0,)
+    damage = damage_distribution(attack, defense)
+    remaining = [0.0] * (hp + 1)
+    remaining[hp] = 1.0
+    times = [0.0]
+    for _ in range(attacks):
+        after = [0.0] * (hp + 1)
+        killed = 0.0
+        for left in range(1, hp + 1):
+            mass = remaining[left]
+            if not mass:
+                continue
+            for dmg, prob in damage:
+                if dmg >= left:
+                    killed += mass * prob
+                else:
+                    after[left - dmg] += mass * prob
+        times.append(killed)
+        remaining = after
+        if sum(remaining) < NEGLIGIBLE_MASS:
+            break
+    return tuple(times)
+
+
+def _kill_time_mixture(attack: Distribution, target_hp: Distribution,
+                       attacks: int) -> list[float]:
+    """Mix kill-time distributions over attack bonuses and target max HP."""
+    mixture = [0.0] * (attacks + 1)
+    for atk, p_atk in attack.items():
+        for hp, p_hp in target_hp.items():
+            weight = float(p_atk * p_hp)
+            for k, p in enumerate(kill_times(atk, ARMOR_CLASS, hp, attacks)):
+                mixture[k] += weight * p
+    return mixture
+
+
+def _first_strike(first: list[float], second: list[float]) -> tuple[float, float]:
+    """Win and loss odds for whoever attacks first, from both kill times.
+
+    The first attacker's k-th attack lands before the second's k-th, so it
+    wins when its kill time is at most the second's; if both start at
+    0 HP the second attacker wins, as `Combat.finish` decides.
+    """
+    # Probability the second kills on attack k or later, or never
+    second_before = [0.0, *accumulate(second)]
+
+    def second_later(k: int) -> float:
+        return 1.0 - second_before[min(k, len(second))]
+
+    win = sum(p * second_later(max(k, 1)) for k, p in enumerate(first))
+    # first_after[j]: probability the first kills after attack j, or never
+    first_after = 1.0 - first[0]
+    loss = second[0]
+    for j in range(1, len(second)):
+        if j < len(first):
+            first_after -= first[j]
+        loss += second[j] * first_after
+    return win, loss
+
+
+def duel(report: RaceReport, opponent: RaceReport, max_rounds: int = 300) -> Duel:
+    """Compute a duel between two races' characters.
+
+    Args:
+        report: The race whose odds are wanted.
+        opponent: The opposing race.
+        max_rounds: Maximum rounds before combat is force-resolved.
+
+    Returns:
+        The `Duel` odds, averaged over who attacks first.
+    """
+    first_attacks, second_attacks = (max_rounds + 1) // 2, max_rounds // 2
+    outcomes = []
+    for a, b in ((report, opponent), (opponent, report)):
+        a_first = _kill_time_mixture(a.attack, b.max_hp, first_attacks)
+        b_second = _kill_time_mixture(b.attack, a.max_hp, second_attacks)
+        outcomes.append(_first_strike(a_first, b_second))
+    (win_first, loss_first), (opp_first, own_second) = outcomes
+    win = (win_first + own_second) / 2
+    loss = (loss_first + opp_first) / 2
+    return Duel(win, loss, max(0.0, 1.0 - win - loss))
+
+
+def _stats_report(race: str, bonuses: dict[str, int], level: int,
+                  base_hp: int) -> RaceReport:
+    modifiers = {stat: modifier_distribution(bonuses.get(stat, 0)) for stat in STAT_NAMES}
+    max_hp = _push(modifiers["CON"], lambda mod: max_hp_for_level(base_hp, mod, level))
+    attack = _push(modifiers["STR"], lambda mod: mod + attack_bonus_for_level(level))
+    return RaceReport(race, MappingProxyType(dict(bonuses)), MappingProxyType(modifiers),
+                      max_hp, attack, MappingProxyType({}))
+
+
+# Registry fingerprint and settings the cached reports were built for
+_cache_key: tuple[object, ...] = ()
+_reports: Mapping[str, RaceReport] = MappingProxyType({})
+
+
+def balance_report(level: int = 1, base_hp: int = 10,
+                   max_rounds: int = 300) -> Mapping[str, RaceReport]:
+    """Get balance reports for every registered race.
+
+    Args:
+        level: Character level.
+        base_hp: Base hit points before modifiers.
+        max_rounds: Maximum rounds of a duel.
+
+    Returns:
+        Read-only mapping of race name to `RaceReport`, in registry
+        order. The result is cached until the registry or the arguments
+        change.
+    """
+    global _cache_key, _reports
+    key = (tuple((name, tuple(sorted(bonuses.items()))) for name, bonuses in RACES.items()),
+           level, base_hp, max_rounds)
+    if key == _cache_key:
+        return _reports
+    stats = {name: _stats_report(name, bonuses, level, base_hp)
+             for name, bonuses in RACES.items()}
+    reports = MappingProxyType({
+        name: report._replace(duels=MappingProxyType(
+            {other: duel(report, opponent, max_rounds) for other, opponent in stats.items()}))
+        for name, report in stats.items()
+    })
+    _cache_key, _reports = key, reports
+    return reports
+
+
+def race_report(race: str, level: int = 1, base_hp: int = 10,
+                max_rounds: int = 300) -> RaceReport:
+    """Get the balance report for one race.
+
+    Args:
+        race: A registered race name.
+        level: Character level.
+        base_hp: Base hit points before modifiers.
+        max_rounds: Maximum rounds of a duel.
+
+    Returns:
+        The race's `RaceReport`.
+
+    Raises:
+        KeyError: If the race is not registered.
+    """
+    reports = balance_report(level, base_hp, max_rounds)
+    if race not in reports:
+        raise KeyError(f"Race '{race}' not registered")
+    return reports[race]
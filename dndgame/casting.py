@@ -0,0 +1,368 @@
+"""Spell slots and cooldowns for many casters.
+
+`CasterPool` tracks, for every caster, the spell slots left per spell
+level and the spells cooling down, and keeps an up-to-date index of
+which casters can cast what. Cantrips (level 0) need no slot; other
+spells use up a slot of their level, which comes back after
+``slot_recharge`` turns or at the next `CasterPool.rest`. Casting a
+spell with a `Spell.cooldown` makes it unavailable to that caster for as
+many turns.
+
+Every pending slot recharge and cooldown is a timer in a hierarchical
+`TimingWheel`, so `CasterPool.advance` only touches the timers due this
+turn. It never scans the casters, and its cost is proportional to the
+readiness changes it reports, however many casters are idle.
+
+Examples:
+    >>> from dndgame.spells import Spell, SpellBook
+    >>> from dndgame.casting import CasterPool
+    >>> book = SpellBook()
+    >>> book.add_spell(Spell("Fire Bolt", 0, "Evocation", 2))
+    >>> book.add_spell(Spell("Fireball", 3, "Evocation", 8, cooldown=2))
+    >>> pool = CasterPool(slot_recharge=5)
+    >>> _ = pool.add_caster("mage", book, slots={3: 1})
+    >>> sorted(pool.ready("mage"))
+    ['Fire Bolt', 'Fireball']
+    >>> pool.cast("mage", "Fireball")
+    [ReadyChange(caster='mage', spell='Fireball', ready=False)]
+    >>> [pool.advance() for _ in range(5)][-1]
+    [ReadyChange(caster='mage', spell='Fireball', ready=True)]
+"""
+
+from __future__ import annotations
+
+from typing import Generic, Hashable, Mapping, NamedTuple, TypeVar
+
+from dndgame.spells import Spell, SpellBook
+
+
+T = TypeVar("T")
+
+
+class TimingWheel(Generic[T]):
+    """A hierarchical timing wheel of items due on whole turns.
+
+    Level ``n`` has `slots` buckets, each covering ``slots ** n`` turns.
+    An item goes into the lowest level whose span covers its delay and
+    moves down one level each time its bucket comes round, so scheduling
+    is O(1) and every item is touched at most once per level. Items due
+    beyond the top level wait in an overflow list that is checked once
+    per top-level bucket.
+
+    Attributes:
+        now: The current turn.
+        slots: Buckets per level.
+        levels: Number of levels.
+    """
+
+    def __init__(self, slots: int = 64, levels: int = 4) -> None:
+        """Create an empty wheel at turn 0.
+
+        Args:
+            slots: Buckets per level.
+            levels: Number of levels; delays up to ``slots ** levels``
+                turns avoid the overflow list.
+        """
+        self.now: int = 0
+        self.slots: int = slots
+        self.levels: int = levels
+        self._spans = [slots ** level for level in range(levels + 1)]
+        self._wheels: list[list[list[tuple[int, T]]]] = [
+            [[] for _ in range(slots)] for _ in range(levels)]
+        self._overflow: list[tuple[int, T]] = []
+        self._pending = 0
+
+    def __len__(self) -> int:
+        return self._pending
+
+    def schedule(self, delay: int, item: T) -> int:
+        """Schedule an item.
+
+        Args:
+            delay: Turns from now; at least 1.
+            item: The item to return from `advance` when it is due.
+
+        Returns:
+            The turn the item is due.
+
+        Raises:
+            ValueError: If delay is less than 1.
+        """
+        if delay < 1:
+            raise ValueError("delay must be at least 1")
+        due = self.now + delay
+        self._place(due, item)
+        self._pending += 1
+        return due
+
+    def _place(self, due: int, item: T) -> None:
+        delta = due - self.now
+        spans = self._spans
+        for level in range(self.levels):
+            if delta < spans[level + 1]:
+                self._wheels[level][(due // spans[level]) % self.slots].append((due, item))
+                return
+        self._overflow.append((due, item))
+
+    def advance(self) -> list[T]:
+        """Move to the next turn.
+
+        Returns:
+            The items due on the new turn, in scheduling order per bucket.
+        """
+        self.now = now = self.now + 1
+        spans = self._spans
+        top = self.levels - 1
+        if self._overflow and now % spans[top] == 0:
+            waiting, self._overflow = self._overflow, []
+            for due, item in waiting:
+                self._place(due, item)
+        # Higher levels first, so items they hand down are cascaded again
+        for level in range(top, 0, -1):
+            if now % spans[level]:
+                continue
+            index = (now // spans[level]) % self.slots
+            bucket = self._wheels[level][index]
+            if bucket:
+                self._wheels[level][index] = []
+                for due, item in bucket:
+                    self._place(due, item)
+        index = now % self.slots
+        bucket = self._wheels[0][index]
+        if not bucket:
+            return []
+        self._wheels[0][index] = []
+        self._pending -= len(bucket)
+        return [item for _, item in bucket]
+
+
+class ReadyChange(NamedTuple):
+    """A caster gaining or losing the ability to cast a spell.
+
+    Attributes:
+        caster: The caster's id.
+        spell: The spell's name.
+        ready: Whether the caster can now cast it.
+    """
+
+    caster: Hashable
+    spell: str
+    ready: bool
+
+
+class _Caster:
+    """Resources of one caster."""
+
+    def __init__(self, book: SpellBook, slots: Mapping[int, int]) -> None:
+        self.spells: dict[str, Spell] = {spell.name: spell for spell in book.spells}
+        self.by_level: dict[int, list[str]] = {}
+        for spell in self.spells.values():
+            self.by_level.setdefault(spell.level, []).append(spell.name)
+        self.max_slots: dict[int, int] = dict(slots)
+        self.slots: dict[int, int] = dict(slots)
+        self.cooling: set[str] = set()
+        self.ready: set[str] = set()
+        # Bumped by a rest, voiding slot recharges still in the wheel
+        self.generation = 0
+
+    def can_cast(self, spell: Spell) -> bool:
+        return spell.name not in self.cooling and (
+            spell.level == 0 or self.slots.get(spell.level, 0) > 0)
+
+
+# Timer kinds in the wheel
+_COOLDOWN = 0
+_RECHARGE = 1
+
+
+class CasterPool:
+    """Spell slots, cooldowns and readiness for a population of casters.
+
+    Attributes:
+        slot_recharge: Turns until a spent slot comes back; 0 means only
+            `rest` restores slots.
+        wheel: The timing wheel holding every pending cooldown and recharge.
+    """
+
+    def __init__(self, slot_recharge: int = 0, wheel_slots: int = 64,
+                 wheel_levels: int = 4) -> None:
+        """Create an empty pool at turn 0.
+
+        Args:
+            slot_recharge: Turns until a spent slot comes back; 0 for never.
+            wheel_slots: Buckets per timing wheel level.
+            wheel_levels: Timing wheel levels.
+        """
+        self.slot_recharge: int = slot_recharge
+        self.wheel: TimingWheel[tuple[int, _Caster, Hashable, int, int | str]] = \
+            TimingWheel(wheel_slots, wheel_levels)
+        self._casters: dict[Hashable, _Caster] = {}
+        self._ready_by_spell: dict[str, set[Hashable]] = {}
+
+    @property
+    def turn(self) -> int:
+        """The current turn."""
+        return self.wheel.now
+
+    def __len__(self) -> int:
+        return len(self._casters)
+
+    def add_caster(self, caster_id: Hashable, book: SpellBook,
+                   slots: Mapping[int, int]) -> list[ReadyChange]:
+        """Start tracking a caster with full slots and no cooldowns.
+
+        Args:
+            caster_id: Unique id of the caster.
+            book: The caster's spells; later changes to it are not seen.
+            slots: Slots per spell level.
+
+        Returns:
+            The spells the caster can cast right away.
+
+        Raises:
+            ValueError: If the id is already tracked.
+        """
+        if caster_id in self._casters:
+            raise ValueError(f"Caster '{caster_id}' already added")
+        caster = _Caster(book, slots)
+        self._casters[caster_id] = caster
+        changes: list[ReadyChange] = []
+        for spell in caster.spells.values():
+            self._refresh(caster_id, caster, spell, changes)
+        return changes
+
+    def remove_caster(self, caster_id: Hashable) -> None:
+        """Stop tracking a caster; its pending timers are ignored when due.
+
+        Raises:
+            KeyError: If the caster is not tracked.
+        """
+        caster = self._casters.pop(caster_id)
+        for name in caster.ready:
+            self._ready_by_spell[name].discard(caster_id)
+
+    def _refresh(self, caster_id: Hashable, caster: _Caster, spell: Spell,
+                 changes: list[ReadyChange]) -> None:
+        """Bring one spell's readiness up to date, noting any flip."""
+        ready = caster.can_cast(spell)
+        if ready == (spell.name in caster.ready):
+            return
+        if ready:
+            caster.ready.add(spell.name)
+            self._ready_by_spell.setdefault(spell.name, set()).add(caster_id)
+        else:
+            caster.ready.discard(spell.name)
+            self._ready_by_spell[spell.name].discard(caster_id)
+        changes.append(ReadyChange(caster_id, spell.name, ready))
+
+    def _refresh_level(self, caster_id: Hashable, caster: _Caster, level: int,
+                       changes: list[ReadyChange]) -> None:
+        for name in caster.by_level.get(level, ()):
+            self._refresh(caster_id, caster, caster.spells[name], changes)
+
+    def can_cast(self, caster_id: Hashable, spell: str) -> bool:
+        """Check whether a caster can cast a spell now.
+
+        Raises:
+            KeyError: If the caster is not tracked.
+        """
+        return spell in self._casters[caster_id].ready
+
+    def ready(self, caster_id: Hashable) -> frozenset[str]:
+        """Get the spells a caster can cast now.
+
+        Raises:
+            KeyError: If the caster is not tracked.
+        """
+        return frozenset(self._casters[caster_id].ready)
+
+    def casters_ready(self, spell: str) -> frozenset[Hashable]:
+        """Get the casters that can cast a spell now."""
+        return frozenset(self._ready_by_spell.get(spell, ()))
+
+    def slots_left(self, caster_id: Hashable, level: int) -> int:
+        """Get a caster's unspent slots of a spell level.
+
+        Raises:
+            KeyError: If the caster is not tracked.
+        """
+        return self._casters[caster_id].slots.get(level, 0)
+
+    def cast(self, caster_id: Hashable, spell: str) -> list[ReadyChange]:
+        """Spend the resources for casting a spell.
+
+        Uses a slot of the spell's level (none for cantrips) and starts
+        its cooldown.
+
+        Args:
+            caster_id: The caster.
+            spell: Name of a spell in the caster's book.
+
+        Returns:
+            The readiness changes the cast caused.
+
+        Raises:
+            KeyError: If the caster or spell is unknown.
+            ValueError: If the spell is on cooldown or no slot is left.
+        """
+        caster = self._casters[caster_id]
+        chosen = caster.spells[spell]
+        if spell not in caster.ready:
+            raise ValueError(f"'{caster_id}' cannot cast {spell} now")
+        changes: list[ReadyChange] = []
+        if chosen.cooldown > 0:
+            caster.cooling.add(spell)
+            self.wheel.schedule(chosen.cooldown,
+                                (_COOLDOWN, caster, caster_id, caster.generation, spell))
+        if chosen.level > 0:
+            caster.slots[chosen.level] -= 1
+            if self.slot_recharge > 0:
+                self.wheel.schedule(self.slot_recharge, (
+                    _RECHARGE, caster, caster_id, caster.generation, chosen.level))
+            if caster.slots[chosen.level] == 0:
+                self._refresh_level(caster_id, caster, chosen.level, changes)
+        self._refresh(caster_id, caster, chosen, changes)
+        return changes
+
+    def advance(self) -> list[ReadyChange]:
+        """Move to the next turn, expiring due cooldowns and recharging slots.
+
+        Returns:
+            The readiness changes of this turn.
+        """
+        changes: list[ReadyChange] = []
+        for kind, caster, caster_id, generation, what in self.wheel.advance():
+            if self._casters.get(caster_id) is not caster:
+                continue  # removed since
+            if kind == _COOLDOWN:
+                assert isinstance(what, str)
+                caster.cooling.discard(what)
+                self._refresh(caster_id, caster, caster.spells[what], changes)
+            elif generation == caster.generation:
+                assert isinstance(what, int)
+                caster.slots[what] += 1
+                if caster.slots[what] == 1:
+                    self._refresh_level(caster_id, caster, what, changes)
+        return changes
+
+    def rest(self, caster_id: Hashable) -> list[ReadyChange]:
+        """Restore all of a caster's slots; cooldowns keep running.
+
+        Args:
+            caster_id: The caster.
+
+        Returns:
+            The readiness changes the rest caused.
+
+        Raises:
+            KeyError: If the caster is not tracked.
+        """
+        caster = self._casters[caster_id]
+        caster.generation += 1
+        changes: list[ReadyChange] = []
+        for level, maximum in caster.max_slots.items():
+            was_empty = caster.slots[level] == 0
+            caster.slots[level] = maximum
+            if was_empty:
+                self._refresh_level(caster_id, caster, level, changes)
+        return changes
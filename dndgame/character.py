@@ -13,7 +13,13 @@ Examples:
 
 from __future__ import annotations
 
-from dndgame.dice import roll
+from dndgame import dice
+from dndgame.progression import (
+    ability_modifier,
+    apply_experience,
+    attack_bonus_for_level,
+    max_hp_for_level,
+)
 from dndgame.races import apply_race_bonuses
 from dndgame.entity import Entity
 
@@ -32,8 +38,9 @@ class Character(Entity):
         hp: Current hit points (inherited from Entity).
         max_hp: Maximum hit points including modifiers.
         level: Character level.
+        experience: Total experience points earned.
         armor_class: Armor class for defense.
-        attack: Attack bonus (derived from STR modifier).
+        attack: Attack bonus (derived from STR modifier and level).
         defense: Defense bonus (same as armor_class).
     """
     def __init__(self, name: str, race: str, base_hp: int) -> None:
@@ -53,6 +60,7 @@ class Character(Entity):
         self.base_hp: int = base_hp
         self.max_hp: int = 0
         self.level: int = 1
+        self.experience: int = 0
         self.armor_class: int = 10
 
     def get_modifier(self, stat: str) -> int:
@@ -67,7 +75,7 @@ class Character(Entity):
         Raises:
             KeyError: If the stat is not found in self.stats.
         """
-        return (self.stats[stat] - 10) // 2
+        return ability_modifier(self.stats[stat])
 
     def roll_stats(self) -> None:
         """Roll ability scores for all six stats and calculate hit points.
@@ -76,19 +84,59 @@ class Character(Entity):
         using 3d6 rolls, then calculates max HP including Constitution modifier.
         Also updates Entity attributes (attack and defense).
         """
-        print("Rolling stats...\n")
+        verbose = dice.is_verbose()
+        if verbose:
+            print("Rolling stats...\n")
         stats = ["STR", "DEX", "CON", "INT", "WIS", "CHA"]
+        rolled: dict[str, int] = {}
         for stat in stats:
-            print(f"Rolling {stat}...")
-            self.stats[stat] = roll(6, 3)
+            if verbose:
+                print(f"Rolling {stat}...")
+            rolled[stat] = dice.roll(6, 3)
+        self.set_stats(rolled)
 
-        self.max_hp = self.base_hp + self.get_modifier("CON")
+    def set_stats(self, stats: dict[str, int]) -> None:
+        """Set ability scores and calculate hit points, attack and defense.
+
+        Args:
+            stats: Mapping of every stat name to its score.
+        """
+        self.stats.update(stats)
+        self.max_hp = max_hp_for_level(self.base_hp, self.get_modifier("CON"), self.level)
         self.hp = self.max_hp
 
         # Update Entity attributes after stats are rolled
-        self.attack = self.get_modifier("STR")  # Attack bonus from STR
+        self.attack = self.get_modifier("STR") + attack_bonus_for_level(self.level)
         self.defense = self.armor_class  # Defense is armor class
 
+    def gain_experience(self, amount: int) -> int:
+        """Add experience points and level up when thresholds are crossed.
+
+        Args:
+            amount: Experience points earned.
+
+        Returns:
+            The number of levels gained.
+        """
+        return apply_experience([self], amount)[0]
+
+    def level_up(self, level: int) -> None:
+        """Move to a new level and recompute max HP and attack.
+
+        Current HP grows by the same amount as max HP, so damage taken
+        before the level-up carries over.
+
+        Args:
+            level: The new level.
+        """
+        self.level = level
+        if not self.stats:
+            return
+        old_max_hp = self.max_hp
+        self.max_hp = max_hp_for_level(self.base_hp, self.get_modifier("CON"), level)
+        self.hp += self.max_hp - old_max_hp
+        self.attack = self.get_modifier("STR") + attack_bonus_for_level(level)
+
     def apply_racial_bonuses(self) -> None:
         """Apply racial bonuses to ability scores via the race registry."""
         apply_race_bonuses(self.stats, self.race)
@@ -101,7 +149,7 @@ class Character(Entity):
             - roll_value: The attack roll result (1d20 + STR modifier)
             - is_crit: True if the roll was a critical hit (natural 20)
         """
-        attack_roll = roll(20, 1)  # Roll 1d20
+        attack_roll = dice.roll(20, 1)  # Roll 1d20
         is_crit = (attack_roll == 20)  # Natural 20 is always a crit
         roll_value = attack_roll + self.attack  # Add STR modifier
 
@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+import time
+
+from dndgame import dice, metrics
+from dndgame.character import Character
 from dndgame.dice import roll
+from dndgame.enemy import Enemy
 from dndgame.entity import Entity
-from typing import TypedDict, Literal, Union, List, Tuple
+from typing import Any, Callable, TypedDict, Literal, Union, List, Tuple
 
 
 class AttackEvent(TypedDict):
@@ -21,32 +26,215 @@ class MaxRoundsEvent(TypedDict):
 
 LogEvent = Union[AttackEvent, MaxRoundsEvent]
 
+# Observer hooks accepted by Combat.subscribe, with their callback arguments:
+#   on_round_start(combat, round_number)  before the attack roll
+#   on_attack(combat, event)              after every attack is logged
+#   on_crit(combat, event)                after an attack that was a crit
+#   on_death(combat, entity)              when an attack drops an entity to 0 HP
+#   on_max_rounds(combat, rounds)         when the round cap ends the fight
+HOOKS = ("on_round_start", "on_attack", "on_crit", "on_death", "on_max_rounds")
+
 
 class Combat:
     """Orchestrates combat between two Entity instances.
 
     Manages turn-based combat with proper attack resolution using Entity
-    methods and attributes.
+    methods and attributes. A fight can be run to completion with `run`
+    or driven one round at a time with `start`, `step` and `finish`.
+
+    When the player is exactly a `Character` and the enemy exactly an
+    `Enemy`, `run` uses a specialized loop that inlines their attack rolls
+    and keeps hit points in locals. It consumes the RNG in the same order
+    as the generic loop, so both give identical results for the same
+    seed. Subclasses take the generic path, since they may override
+    `roll_attack`, `take` or `alive`.
+
+    Observers attached with `subscribe` are called from `step` and
+    `finish`. While a combat has no subscribers its loops contain no
+    dispatch code at all: subscribing swaps in an observed `step` on the
+    instance, and removing the last subscriber swaps it back out.
 
     Attributes:
         player: The player Entity.
         enemy: The enemy Entity.
         max_rounds: Maximum number of rounds before forced resolution.
+        keep_log: Whether `run` records attack events in the log.
+        damage_counts: Optional damage histogram that `run` adds every
+            attack to; the last bin collects anything higher.
         log: List of combat events.
+        rounds: Number of rounds played so far.
+        attacker: The Entity attacking in the next round.
+        defender: The Entity defending in the next round.
     """
 
-    def __init__(self, player: Entity, enemy: Entity, max_rounds: int = 300) -> None:
+    def __init__(self, player: Entity, enemy: Entity, max_rounds: int = 300,
+                 keep_log: bool = True) -> None:
         """Initialize a new combat encounter.
 
         Args:
             player: The player Entity participating in combat.
             enemy: The enemy Entity participating in combat.
             max_rounds: Maximum rounds before combat is force-resolved.
+            keep_log: Record attack events during `run`; turn off for bulk
+                simulations that only need the winner.
         """
         self.player: Entity = player
         self.enemy: Entity = enemy
         self.max_rounds: int = max_rounds
+        self.keep_log: bool = keep_log
+        self.damage_counts: List[int] | memoryview | None = None
+        self._observers: dict[str, tuple[Callable[..., Any], ...]] = {}
         self.log: List[LogEvent] = []
+        self.rounds: int = 0
+        self.attacker: Entity = player
+        self.defender: Entity = enemy
+
+    def start(self) -> None:
+        """Reset the log and turn order so the player attacks first."""
+        metrics.COMBATS_STARTED.inc()
+        self.log = []
+        self.rounds = 0
+        self.attacker = self.player
+        self.defender = self.enemy
+
+    def finished(self) -> bool:
+        """Check whether the combat is over.
+
+        Returns:
+            True if either entity is dead or max_rounds has been reached.
+        """
+        return not (self.player.alive() and self.enemy.alive() and
+                    self.rounds < self.max_rounds)
+
+    def step(self) -> AttackEvent:
+        """Play a single round.
+
+        The current attacker rolls against the defender, the damage is
+        applied and logged, and turns alternate unless the defender died.
+        Unarmed attackers deal ``roll - defense``; armed attackers hit when
+        the roll reaches the defense (or on a crit) and roll weapon damage.
+
+        Returns:
+            The logged attack event.
+        """
+        self.rounds += 1
+        attacker = self.attacker
+        defender = self.defender
+
+        # Perform attack
+        attack_roll, is_crit = attacker.roll_attack()
+        if attacker.weapon is None:
+            damage = max(0, attack_roll - defender.defense)
+        elif is_crit or attack_roll >= defender.defense:
+            damage = attacker.roll_damage(is_crit)
+        else:
+            damage = 0
+
+        # Apply damage
+        defender.take(damage)
+
+        # Log the attack
+        event: AttackEvent = {
+            "attacker": attacker.name,
+            "defender": defender.name,
+            "roll": attack_roll,
+            "crit": is_crit,
+            "dmg": damage,
+            "defender_hp": defender.hp
+        }
+        self.log.append(event)
+
+        # Alternate turns while the defender is still standing
+        if defender.alive():
+            self.attacker, self.defender = defender, attacker
+        return event
+
+    @property
+    def observed(self) -> bool:
+        """Whether any observer is subscribed to this combat."""
+        return bool(self._observers)
+
+    def subscribe(self, hook: str, callback: Callable[..., Any]) -> Callable[[], None]:
+        """Call a function on a combat event.
+
+        Args:
+            hook: One of `HOOKS`.
+            callback: Called with the combat and the hook's argument.
+
+        Returns:
+            A function that removes this subscription.
+
+        Raises:
+            ValueError: If hook is not a known hook name.
+        """
+        if hook not in HOOKS:
+            raise ValueError(f"Unknown hook '{hook}'; expected one of {', '.join(HOOKS)}")
+        self._observers[hook] = self._observers.get(hook, ()) + (callback,)
+        self.step = self._observed_step  # type: ignore[method-assign]
+
+        def unsubscribe() -> None:
+            callbacks = list(self._observers.get(hook, ()))
+            if callback in callbacks:
+                callbacks.remove(callback)
+                if callbacks:
+                    self._observers[hook] = tuple(callbacks)
+                else:
+                    del self._observers[hook]
+            if not self._observers:
+                vars(self).pop("step", None)
+
+        return unsubscribe
+
+    def _observed_step(self) -> AttackEvent:
+        """Play a round like `step`, dispatching to subscribed observers."""
+        observers = self._observers
+        for callback in observers.get("on_round_start", ()):
+            callback(self, self.rounds + 1)
+        defender = self.defender
+        event = Combat.step(self)
+        for callback in observers.get("on_attack", ()):
+            callback(self, event)
+        if event["crit"]:
+            for callback in observers.get("on_crit", ()):
+                callback(self, event)
+        if not defender.alive():
+            for callback in observers.get("on_death", ()):
+                callback(self, defender)
+        return event
+
+    def finish(self, record_metrics: bool = True) -> str:
+        """Determine the winner of a finished combat.
+
+        Appends a max_rounds_reached event to the log when the round cap
+        was hit, so it should be called once per fight.
+
+        Args:
+            record_metrics: Count the fight in the combat metrics; replays
+                of an already counted fight pass False.
+
+        Returns:
+            "Player" or "Enemy".
+        """
+        if record_metrics:
+            metrics.COMBATS_FINISHED.inc()
+            metrics.COMBAT_ROUNDS.observe(self.rounds)
+        if self.rounds >= self.max_rounds:
+            # Max rounds reached - determine winner by HP
+            self.log.append({
+                "event": "max_rounds_reached",
+                "rounds": self.rounds
+            })
+            for callback in self._observers.get("on_max_rounds", ()):
+                callback(self, self.rounds)
+
+            if self.player.hp >= self.enemy.hp:
+                return "Player"
+            return "Enemy"
+
+        # Normal victory
+        if self.player.alive():
+            return "Player"
+        return "Enemy"
 
     def run(self) -> Tuple[str, List[LogEvent]]:
         """Orchestrate the combat between player and enemy.
@@ -70,57 +258,93 @@ class Combat:
             "defender_hp": defender_hp_after
         }
         """
-        self.log = []
-        rounds: int = 0
-        current_attacker: Entity = self.player
-        current_defender: Entity = self.enemy
-
-        while (self.player.alive() and self.enemy.alive() and
-               rounds < self.max_rounds):
-
-            rounds += 1
-
-            # Perform attack
-            attack_roll, is_crit = current_attacker.roll_attack()
-            damage = max(0, attack_roll - current_defender.defense)
-
-            # Apply damage
-            current_defender.take(damage)
-
-            # Log the attack
-            self.log.append({
-                "attacker": current_attacker.name,
-                "defender": current_defender.name,
-                "roll": attack_roll,
-                "crit": is_crit,
-                "dmg": damage,
-                "defender_hp": current_defender.hp
-            })
-
-            # Check if defender died from this attack
-            if not current_defender.alive():
-                break
+        started = time.perf_counter()
+        self.start()
+        if (type(self.player) is Character and type(self.enemy) is Enemy
+                and not self._observers):
+            self._run_fast()
+        else:
+            keep_log = self.keep_log
+            counts = self.damage_counts
+            step = self.step
+            while not self.finished():
+                damage = step()["dmg"]
+                if counts is not None:
+                    counts[min(damage, len(counts) - 1)] += 1
+                if not keep_log:
+                    self.log.clear()
+        winner = self.finish()
+        metrics.COMBAT_DURATION.observe(time.perf_counter() - started)
+        return winner, self.log
 
-            # Alternate turns
-            current_attacker, current_defender = current_defender, current_attacker
+    def _run_fast(self) -> None:
+        """Play a Character-vs-Enemy fight to the end with inlined rules.
 
-        # Determine winner
-        if rounds >= self.max_rounds:
-            # Max rounds reached - determine winner by HP
-            self.log.append({
-                "event": "max_rounds_reached",
-                "rounds": rounds
-            })
+        Mirrors `step` for `Character.roll_attack` (crits on a natural 20)
+        and `Enemy.roll_attack` (never crits), drawing the same d20s and
+        weapon damage rolls in the same order.
+        """
+        player, enemy = self.player, self.enemy
+        d20 = dice.die_roller(20)
+        log = self.log
+        keep_log = self.keep_log
+        counts = self.damage_counts
+        top = len(counts) - 1 if counts is not None else 0
+        max_rounds = self.max_rounds
+        rounds = self.rounds
+        player_name, enemy_name = player.name, enemy.name
+        player_hp, enemy_hp = player.hp, enemy.hp
+        player_attack, enemy_attack = player.attack, enemy.attack
+        player_defense, enemy_defense = player.defense, enemy.defense
+        player_weapon, enemy_weapon = player.weapon, enemy.weapon
+        player_turn = self.attacker is player
 
-            if self.player.hp >= self.enemy.hp:
-                winner = "Player"
-            else:
-                winner = "Enemy"
-        else:
-            # Normal victory
-            if self.player.alive():
-                winner = "Player"
+        while player_hp > 0 and enemy_hp > 0 and rounds < max_rounds:
+            rounds += 1
+            face = d20()
+            if player_turn:
+                is_crit = face == 20
+                attack_roll = face + player_attack
+                if player_weapon is None:
+                    damage = attack_roll - enemy_defense
+                    if damage < 0:
+                        damage = 0
+                elif is_crit or attack_roll >= enemy_defense:
+                    damage = player_weapon.roll_damage(player_attack, is_crit)
+                else:
+                    damage = 0
+                enemy_hp = enemy_hp - damage if damage < enemy_hp else 0
+                if counts is not None:
+                    counts[damage if damage < top else top] += 1
+                if keep_log:
+                    log.append({"attacker": player_name, "defender": enemy_name,
+                                "roll": attack_roll, "crit": is_crit,
+                                "dmg": damage, "defender_hp": enemy_hp})
             else:
-                winner = "Enemy"
+                attack_roll = face + enemy_attack
+                if enemy_weapon is None:
+                    damage = attack_roll - player_defense
+                    if damage < 0:
+                        damage = 0
+                elif attack_roll >= player_defense:
+                    damage = enemy_weapon.roll_damage(enemy_attack, False)
+                else:
+                    damage = 0
+                player_hp = player_hp - damage if damage < player_hp else 0
+                if counts is not None:
+                    counts[damage if damage < top else top] += 1
+                if keep_log:
+                    log.append({"attacker": enemy_name, "defender": player_name,
+                                "roll": attack_roll, "crit": False,
+                                "dmg": damage, "defender_hp": player_hp})
+            player_turn = not player_turn
 
-        return winner, self.log
+        player.hp, enemy.hp = player_hp, enemy_hp
+        if rounds == self.rounds:
+            return  # No round played, so step would not have touched the turn order
+        self.rounds = rounds
+        # Leave the turn order where step would have left it
+        if player_hp > 0 and enemy_hp > 0:
+            self.attacker, self.defender = (player, enemy) if player_turn else (enemy, player)
+        else:
+            self.attacker, self.defender = (enemy, player) if player_turn else (player, enemy)
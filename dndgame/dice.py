@@ -1,25 +1,237 @@
 """Dice rolling helpers.
 
-Pure functions to roll dice with/without advantage or disadvantage.
+Pure functions to roll dice with/without advantage or disadvantage, and
+a compiler for dice notation such as ``2d6+3``, ``4d6kh3`` or
+``1d20adv+5``. Compiled expressions are cached, so hot paths can look
+them up by string without re-parsing.
+
+Simulations can switch on buffered rolling with `set_buffered`, which
+serves d4/d6/d8/d10/d12/d20 rolls from bulk-generated buffers instead of
+calling `random.randint` per die, and silence the per-roll printout with
+`set_verbose`. Use `seed` rather than `random.seed` so buffered draws
+stay reproducible.
 
 Examples:
-    >>> from dndgame.dice import roll, roll_with_advantage
+    >>> from dndgame.dice import roll, roll_with_advantage, compile_dice
     >>> total = roll(6, 2); isinstance(total, int)
     True
     >>> isinstance(roll_with_advantage(20), int)
     True
+    >>> compile_dice("2d6+3").mean()
+    Fraction(10, 1)
 """
 
 from __future__ import annotations
 
 import random
+import re
+from fractions import Fraction
+from functools import lru_cache
+from math import comb
+from typing import Any, Callable, NamedTuple
+
+
+# Die sizes served from buffers when buffered rolling is on
+BUFFERED_SIDES = (4, 6, 8, 10, 12, 20)
+
+
+class DieBuffer:
+    """Pre-generated rolls of a single die size.
+
+    Refills draw random bytes in bulk from the `random` module and map
+    them to faces with one ``bytes.translate`` call. Bytes at or above the
+    largest multiple of ``sides`` are discarded, so every face stays
+    exactly equally likely.
+
+    Attributes:
+        sides: Number of sides on the die.
+        size: Random bytes drawn per refill.
+    """
+
+    def __init__(self, sides: int, size: int = 4096) -> None:
+        """Initialize an empty buffer.
+
+        Args:
+            sides: Number of sides on the die (2-256).
+            size: Random bytes drawn per refill.
+        """
+        self.sides: int = sides
+        self.size: int = size
+        limit = 256 - 256 % sides
+        self._table: bytes = bytes((b % sides) + 1 if b < limit else 0
+                                   for b in range(256))
+        self._reject: bytes = bytes(range(limit, 256))
+        self._data: bytes = b""
+        self._pos: int = 0
+
+    def _refill(self) -> None:
+        data = b""
+        while not data:
+            data = random.randbytes(self.size).translate(self._table, self._reject)
+        self._data = data
+        self._pos = 0
+
+    def draw(self) -> int:
+        """Roll the die once.
+
+        Returns:
+            A face between 1 and sides.
+        """
+        if self._pos >= len(self._data):
+            self._refill()
+        pos = self._pos
+        self._pos = pos + 1
+        return self._data[pos]
+
+    def draw_many(self, n: int) -> list[int]:
+        """Roll the die n times.
+
+        Args:
+            n: Number of rolls.
+
+        Returns:
+            A list of n faces.
+        """
+        pos = self._pos
+        end = pos + n
+        if end <= len(self._data):
+            self._pos = end
+            return list(self._data[pos:end])
+        rolls = list(self._data[pos:])
+        while len(rolls) < n:
+            self._refill()
+            take = min(n - len(rolls), len(self._data))
+            rolls.extend(self._data[:take])
+            self._pos = take
+        return rolls
+
+    def reset(self) -> None:
+        """Discard all buffered rolls."""
+        self._data = b""
+        self._pos = 0
+
+    def getstate(self) -> tuple[bytes, int]:
+        """Get the buffered rolls and read position."""
+        return self._data, self._pos
+
+    def setstate(self, state: tuple[bytes, int]) -> None:
+        """Restore the state returned by `getstate`."""
+        self._data, self._pos = state
+
+
+_buffers: dict[int, DieBuffer] = {sides: DieBuffer(sides) for sides in BUFFERED_SIDES}
+_buffered = False
+_verbose = True
+
+
+def set_buffered(enabled: bool) -> None:
+    """Turn buffered rolling of the standard dice on or off.
+
+    Args:
+        enabled: Serve d4-d20 rolls from buffers when True.
+    """
+    global _buffered
+    _buffered = enabled
+
+
+def set_verbose(enabled: bool) -> None:
+    """Turn the printout of every roll on or off.
+
+    Args:
+        enabled: Print each roll when True (the default).
+    """
+    global _verbose
+    _verbose = enabled
+
+
+def is_buffered() -> bool:
+    """Check whether the standard dice are served from buffers.
+
+    Returns:
+        True if buffered rolling is on.
+    """
+    return _buffered
+
+
+def is_verbose() -> bool:
+    """Check whether rolls are printed.
+
+    Returns:
+        True if `roll` prints every roll.
+    """
+    return _verbose
+
+
+def seed(value: int | None = None) -> None:
+    """Seed the dice RNG and discard buffered rolls.
+
+    Args:
+        value: Seed passed to `random.seed`.
+    """
+    random.seed(value)
+    for buffer in _buffers.values():
+        buffer.reset()
+
+
+def getstate() -> tuple[Any, ...]:
+    """Capture the full dice RNG state, including buffered rolls.
+
+    Returns:
+        A state object for `setstate`.
+    """
+    return (random.getstate(),
+            tuple(buffer.getstate() for buffer in _buffers.values()))
+
+
+def setstate(state: tuple[Any, ...]) -> None:
+    """Restore a state captured by `getstate`.
+
+    Args:
+        state: The captured state.
+    """
+    rng_state, buffer_states = state
+    random.setstate(rng_state)
+    for buffer, buffer_state in zip(_buffers.values(), buffer_states):
+        buffer.setstate(buffer_state)
+
+
+def _rolls(dice_type: int, number_of_dice: int) -> list[int]:
+    """Roll dice without printing and return the individual results."""
+    if _buffered:
+        buffer = _buffers.get(dice_type)
+        if buffer is not None:
+            return buffer.draw_many(number_of_dice)
+    return [random.randint(1, dice_type) for _ in range(number_of_dice)]
+
+
+def die_roller(sides: int) -> Callable[[], int]:
+    """Get a function rolling one die, for tight loops.
+
+    The returned function consumes the RNG exactly like ``roll(sides, 1)``
+    but skips building a list of rolls. While rolls are printed it simply
+    calls `roll`, so look the roller up again after `set_verbose` or
+    `set_buffered` changes.
+
+    Args:
+        sides: The number of sides on the die.
+
+    Returns:
+        A function with no arguments returning one roll.
+    """
+    if _verbose:
+        return lambda: roll(sides, 1)
+    if _buffered and sides in _buffers:
+        return _buffers[sides].draw
+    randint = random.randint
+    return lambda: randint(1, sides)
 
 
 def roll(dice_type: int, number_of_dice: int) -> int:
     """Roll multiple dice and return the sum.
 
     Simulates rolling the specified number of dice with the given number
-    of sides and returns the total result.
+    of sides and returns the total result. The individual rolls are
+    printed unless silenced with `set_verbose`.
 
     Args:
         dice_type: The number of sides on each die (e.g., 6 for d6, 20 for d20).
@@ -32,9 +244,10 @@ def roll(dice_type: int, number_of_dice: int) -> int:
         roll(6, 2)  # Roll 2d6
         roll(20, 1)  # Roll 1d20
     """
-    rolls = [random.randint(1, dice_type) for _ in range(number_of_dice)]
+    rolls = _rolls(dice_type, number_of_dice)
     total = sum(rolls)
-    print(f"Rolling {number_of_dice}d{dice_type}: {rolls} = {total}")
+    if _verbose:
+        print(f"Rolling {number_of_dice}d{dice_type}: {rolls} = {total}")
     return total
 
 
@@ -78,3 +291,251 @@ def roll_with_disadvantage(dice_type: int) -> int:
     roll1 = roll(dice_type, 1)
     roll2 = roll(dice_type, 1)
     return min(roll1, roll2)
+
+
+class DiceTerm(NamedTuple):
+    """One group of dice in a dice expression.
+
+    Attributes:
+        number: Number of dice rolled.
+        sides: Number of sides on each die.
+        keep: Number of dice kept (equal to number when all are summed).
+        highest: Keep the highest dice when True, the lowest when False.
+        sign: 1 to add the group's total, -1 to subtract it.
+    """
+
+    number: int
+    sides: int
+    keep: int
+    highest: bool = True
+    sign: int = 1
+
+
+_TERM = re.compile(
+    r"([+-])(?:(\d*)d(\d+)(?:(kh|kl)(\d+)|(adv|dis))?|(\d+))"
+)
+
+
+def parse_dice(expression: str) -> tuple[tuple[DiceTerm, ...], int]:
+    """Parse dice notation into dice terms and a flat modifier.
+
+    Supports sums of ``NdM`` groups and integer constants, ``khK``/``klK``
+    to keep the K highest/lowest dice of a group, and ``adv``/``dis`` on a
+    single die. Whitespace and case are ignored.
+
+    Args:
+        expression: Dice notation, e.g. "2d6+3", "4d6kh3" or "1d20adv+5".
+
+    Returns:
+        A tuple of (terms, modifier).
+
+    Raises:
+        ValueError: If the expression is malformed.
+    """
+    text = "".join(expression.lower().split())
+    if not text:
+        raise ValueError("Empty dice expression")
+    if text[0] not in "+-":
+        text = "+" + text
+
+    terms: list[DiceTerm] = []
+    modifier = 0
+    pos = 0
+    while pos < len(text):
+        match = _TERM.match(text, pos)
+        if match is None:
+            raise ValueError(f"Invalid dice expression: {expression!r}")
+        pos = match.end()
+        sign, count, sides, keep_mode, keep, adv, constant = match.groups()
+        direction = 1 if sign == "+" else -1
+        if constant is not None:
+            modifier += direction * int(constant)
+            continue
+
+        n = int(count) if count else 1
+        m = int(sides)
+        if n < 1 or m < 1:
+            raise ValueError(f"Invalid dice group in {expression!r}")
+        if adv is not None:
+            if n != 1:
+                raise ValueError(f"{adv} applies to a single die in {expression!r}")
+            terms.append(DiceTerm(2, m, 1, adv == "adv", direction))
+        elif keep_mode is not None:
+            k = int(keep)
+            if not 1 <= k <= n:
+                raise ValueError(f"Cannot keep {k} of {n} dice in {expression!r}")
+            terms.append(DiceTerm(n, m, k, keep_mode == "kh", direction))
+        else:
+            terms.append(DiceTerm(n, m, n, True, direction))
+    return tuple(terms), modifier
+
+
+def _compile_term(term: DiceTerm) -> Callable[[], int]:
+    """Build a zero-argument evaluator for one dice term."""
+    count, sides, keep, sign = term.number, term.sides, term.keep, term.sign
+    if keep == count:
+        return lambda: sign * sum(_rolls(sides, count))
+    if term.highest:
+        return lambda: sign * sum(sorted(_rolls(sides, count))[count - keep:])
+    return lambda: sign * sum(sorted(_rolls(sides, count))[:keep])
+
+
+def _term_counts(term: DiceTerm) -> dict[int, int]:
+    """Count the ordered dice outcomes giving each total of a term.
+
+    Faces are visited from most to least preferred; at each face we choose
+    how many of the remaining dice show it, and only dice that still fit in
+    the kept set add to the total.
+    """
+    count, keep = term.number, term.keep
+    faces = range(term.sides, 0, -1) if term.highest else range(1, term.sides + 1)
+    # (dice assigned so far, kept total) -> number of ordered outcomes
+    states: dict[tuple[int, int], int] = {(0, 0): 1}
+    for face in faces:
+        next_states: dict[tuple[int, int], int] = {}
+        for (assigned, total), ways in states.items():
+            remaining = count - assigned
+            for j in range(remaining + 1):
+                kept = min(assigned + j, keep) - min(assigned, keep)
+                key = (assigned + j, total + face * kept)
+                next_states[key] = next_states.get(key, 0) + ways * comb(remaining, j)
+        states = next_states
+    return {term.sign * total: ways for (assigned, total), ways in states.items()
+            if assigned == count}
+
+
+class DiceExpression:
+    """A compiled dice expression.
+
+    Parsing happens once; `roll` and `roll_many` run a prebuilt evaluator
+    and never print, so they are suitable for simulations.
+
+    Attributes:
+        expression: The source dice notation.
+        terms: The parsed dice terms.
+        modifier: The flat modifier added to every roll.
+    """
+
+    def __init__(self, expression: str) -> None:
+        """Parse and compile a dice expression.
+
+        Args:
+            expression: Dice notation, e.g. "2d6+3".
+
+        Raises:
+            ValueError: If the expression is malformed.
+        """
+        self.expression: str = expression
+        self.terms: tuple[DiceTerm, ...]
+        self.modifier: int
+        self.terms, self.modifier = parse_dice(expression)
+        self._distribution: dict[int, Fraction] | None = None
+
+        evaluators = [_compile_term(t) for t in self.terms]
+        modifier = self.modifier
+        if len(evaluators) == 1:
+            only = evaluators[0]
+            self._evaluate: Callable[[], int] = lambda: only() + modifier
+        else:
+            self._evaluate = lambda: sum([f() for f in evaluators]) + modifier
+
+    def __repr__(self) -> str:
+        return f"DiceExpression({self.expression!r})"
+
+    def roll(self) -> int:
+        """Roll the expression once.
+
+        Returns:
+            The rolled total.
+        """
+        return self._evaluate()
+
+    def roll_many(self, n: int) -> list[int]:
+        """Roll the expression repeatedly.
+
+        Args:
+            n: Number of rolls.
+
+        Returns:
+            A list of n rolled totals.
+        """
+        evaluate = self._evaluate
+        return [evaluate() for _ in range(n)]
+
+    def distribution(self) -> dict[int, Fraction]:
+        """Get the exact probability of every possible total.
+
+        The distribution is computed on first use and then kept.
+
+        Returns:
+            Mapping of total to probability, sorted by total.
+        """
+        if self._distribution is None:
+            counts = {self.modifier: 1}
+            outcomes = 1
+            for term in self.terms:
+                combined: dict[int, int] = {}
+                for value, ways in counts.items():
+                    for term_value, term_ways in _term_counts(term).items():
+                        total = value + term_value
+                        combined[total] = combined.get(total, 0) + ways * term_ways
+                counts = combined
+                outcomes *= term.sides ** term.number
+            self._distribution = {
+                total: Fraction(ways, outcomes) for total, ways in sorted(counts.items())
+            }
+        return self._distribution
+
+    def mean(self) -> Fraction:
+        """Get the exact expected total.
+
+        Returns:
+            The mean of the distribution.
+        """
+        return sum((v * p for v, p in self.distribution().items()), Fraction(0))
+
+    def at_least(self, target: int) -> Fraction:
+        """Get the exact probability of rolling at least a target.
+
+        Args:
+            target: The minimum total.
+
+        Returns:
+            The probability that a roll is >= target.
+        """
+        return sum((p for v, p in self.distribution().items() if v >= target),
+                   Fraction(0))
+
+
+@lru_cache(maxsize=256)
+def compile_dice(expression: str) -> DiceExpression:
+    """Get the compiled form of a dice expression.
+
+    Compiled expressions are kept in an LRU cache keyed by the source
+    string, so repeated lookups skip parsing.
+
+    Args:
+        expression: Dice notation, e.g. "4d6kh3".
+
+    Returns:
+        The compiled `DiceExpression`.
+
+    Raises:
+        ValueError: If the expression is malformed.
+    """
+    return DiceExpression(expression)
+
+
+def roll_expression(expression: str) -> int:
+    """Roll a dice expression once.
+
+    Args:
+        expression: Dice notation, e.g. "1d20adv+5".
+
+    Returns:
+        The rolled total.
+
+    Raises:
+        ValueError: If the expression is malformed.
+    """
+    return compile_dice(expression).roll()
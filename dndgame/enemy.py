@@ -13,8 +13,9 @@ Examples:
 
 from __future__ import annotations
 
-from dndgame.dice import roll
+from dndgame import dice
 from dndgame.entity import Entity
+from dndgame.progression import ability_modifier
 
 
 class Enemy(Entity):
@@ -67,7 +68,7 @@ class Enemy(Entity):
         Raises:
             KeyError: If the stat is not found in self.stats.
         """
-        return (self.stats[stat] - 10) // 2
+        return ability_modifier(self.stats[stat])
 
     def roll_stats(self) -> None:
         """Roll ability scores for all six stats and calculate hit points.
@@ -76,10 +77,11 @@ class Enemy(Entity):
         using 3d6 rolls, then calculates max HP including Constitution modifier.
         Also updates Entity attributes (attack and defense).
         """
-        print(f"Rolling stats for {self.name}...")
+        if dice.is_verbose():
+            print(f"Rolling stats for {self.name}...")
         stats = ["STR", "DEX", "CON", "INT", "WIS", "CHA"]
         for stat in stats:
-            self.stats[stat] = roll(6, 3)
+            self.stats[stat] = dice.roll(6, 3)
 
         self.max_hp = self.base_hp + self.get_modifier("CON")
         self.hp = self.max_hp
@@ -115,7 +117,7 @@ class Enemy(Entity):
             - roll_value: The attack roll result (1d20 + STR modifier)
             - is_crit: Always False for enemies (no critical hits)
         """
-        attack_roll = roll(20, 1)  # Roll 1d20
+        attack_roll = dice.roll(20, 1)  # Roll 1d20
         roll_value = attack_roll + self.attack  # Add STR modifier
 
         return roll_value, False  # Enemies don't crit
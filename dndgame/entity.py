@@ -19,6 +19,8 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 
+from dndgame.weapons import Weapon, get_weapon
+
 
 class Entity(ABC):
     """Abstract base class for all entities in the game.
@@ -31,6 +33,7 @@ class Entity(ABC):
         hp: Current hit points (health).
         attack: Attack bonus/strength value.
         defense: Defense bonus/armor class value.
+        weapon: The equipped weapon, or None to fight unarmed.
     """
 
     def __init__(self, name: str, hp: int, attack: int, defense: int) -> None:
@@ -46,6 +49,7 @@ class Entity(ABC):
         self.hp = hp
         self.attack = attack
         self.defense = defense
+        self.weapon: Weapon | None = None
 
     def alive(self) -> bool:
         """Check if the entity is still alive.
@@ -63,6 +67,38 @@ class Entity(ABC):
         """
         self.hp = max(0, self.hp - dmg)
 
+    def equip(self, weapon: Weapon | str) -> None:
+        """Equip a weapon.
+
+        Args:
+            weapon: A weapon, or the name of a registered weapon.
+
+        Raises:
+            KeyError: If no weapon is registered under the given name.
+        """
+        if isinstance(weapon, str):
+            found = get_weapon(weapon)
+            if found is None:
+                raise KeyError(f"Weapon '{weapon}' not found")
+            weapon = found
+        self.weapon = weapon
+
+    def roll_damage(self, is_crit: bool) -> int:
+        """Roll damage for a hit with the equipped weapon.
+
+        Args:
+            is_crit: True if the hit was a critical hit (doubles the dice).
+
+        Returns:
+            Weapon dice plus the attack bonus, never below 0.
+
+        Raises:
+            ValueError: If no weapon is equipped.
+        """
+        if self.weapon is None:
+            raise ValueError(f"{self.name} has no weapon equipped")
+        return self.weapon.roll_damage(self.attack, is_crit)
+
     @abstractmethod
     def roll_attack(self) -> tuple[int, bool]:
         """Roll an attack for this entity.
@@ -0,0 +1,167 @@
+"""Bounded-memory history for long-running sessions.
+
+A `History` keeps its most recent entries in memory and spills older
+ones to an append-only file of JSON lines, so a session's memory stays
+flat however long it runs. Spilled entries are read back lazily, one
+block at a time, when they are indexed or iterated. Entries must be
+JSON-serializable; tuples come back as lists.
+
+Examples:
+    >>> from dndgame.history import History
+    >>> history = History(capacity=4)
+    >>> for n in range(10):
+    ...     history.append(f"event {n}")
+    >>> len(history), history.spilled
+    (10, 6)
+    >>> history[0], history[-1]
+    ('event 0', 'event 9')
+    >>> history.recent(2)
+    ['event 8', 'event 9']
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from array import array
+from collections import deque
+from types import TracebackType
+from typing import IO, Generic, Iterator, Optional, Sequence, Type, TypeVar, overload
+
+T = TypeVar("T")
+
+
+class History(Sequence[T], Generic[T]):
+    """An append-only sequence holding at most ``capacity`` entries in memory.
+
+    When the in-memory buffer exceeds its capacity, the oldest half is
+    written to the spill file as one block. Only the byte offset of each
+    block is kept in memory.
+
+    Attributes:
+        capacity: Maximum number of entries held in memory.
+        path: Spill file path, or None for an anonymous temporary file.
+        spilled: Number of entries written to disk.
+    """
+
+    def __init__(self, capacity: int = 256, path: Optional[str] = None) -> None:
+        """Initialize an empty history.
+
+        Args:
+            capacity: Maximum number of entries held in memory.
+            path: File to spill to; it is truncated. Defaults to an
+                anonymous temporary file created on the first spill.
+
+        Raises:
+            ValueError: If capacity is less than 2.
+        """
+        if capacity < 2:
+            raise ValueError("capacity must be at least 2")
+        self.capacity: int = capacity
+        self.path: Optional[str] = path
+        self.spilled: int = 0
+        self._block_size = capacity // 2
+        self._buffer: deque[T] = deque()
+        self._offsets = array("q")
+        self._file: Optional[IO[bytes]] = None
+        # Last block read back from disk, for sequential access
+        self._cached_block = -1
+        self._cached_entries: list[T] = []
+
+    def append(self, entry: T) -> None:
+        """Add an entry, spilling the oldest block if memory is full.
+
+        Args:
+            entry: A JSON-serializable value.
+        """
+        self._buffer.append(entry)
+        if len(self._buffer) > self.capacity:
+            self._spill()
+
+    def _spill(self) -> None:
+        if self._file is None:
+            if self.path is None:
+                self._file = tempfile.TemporaryFile()
+            else:
+                self._file = open(self.path, "w+b")
+        handle = self._file
+        handle.seek(0, os.SEEK_END)
+        self._offsets.append(handle.tell())
+        popleft = self._buffer.popleft
+        lines = [json.dumps(popleft()) for _ in range(self._block_size)]
+        handle.write(("\n".join(lines) + "\n").encode())
+        self.spilled += self._block_size
+
+    def _read_block(self, block: int) -> list[T]:
+        if block != self._cached_block:
+            assert self._file is not None
+            self._file.flush()
+            self._file.seek(self._offsets[block])
+            self._cached_entries = [json.loads(self._file.readline())
+                                    for _ in range(self._block_size)]
+            self._cached_block = block
+        return self._cached_entries
+
+    def __len__(self) -> int:
+        return self.spilled + len(self._buffer)
+
+    @overload
+    def __getitem__(self, index: int) -> T: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[T]: ...
+
+    def __getitem__(self, index: int | slice) -> T | list[T]:
+        """Get an entry, reading it back from disk if it was spilled.
+
+        Raises:
+            IndexError: If the index is out of range.
+        """
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("history index out of range")
+        if index >= self.spilled:
+            return self._buffer[index - self.spilled]
+        block, position = divmod(index, self._block_size)
+        return self._read_block(block)[position]
+
+    def __iter__(self) -> Iterator[T]:
+        """Iterate oldest first, streaming spilled entries block by block."""
+        for block in range(len(self._offsets)):
+            yield from self._read_block(block)
+        yield from list(self._buffer)
+
+    def recent(self, n: Optional[int] = None) -> list[T]:
+        """Get the newest entries still held in memory.
+
+        Args:
+            n: Maximum number of entries; defaults to all in memory.
+
+        Returns:
+            Up to n entries, oldest first.
+        """
+        entries = list(self._buffer)
+        if n is None:
+            return entries
+        return entries[-n:] if n > 0 else []
+
+    def close(self) -> None:
+        """Close the spill file. Spilled entries are no longer readable."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> History[T]:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
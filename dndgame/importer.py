@@ -0,0 +1,392 @@
+"""Streaming bulk import of characters and custom races.
+
+Reads character records from JSON Lines or CSV without loading the whole
+file, validates them a chunk at a time and builds `Character` objects in
+bulk, optionally in worker processes. Invalid records are skipped and
+reported with their line number instead of aborting the import.
+
+A JSON Lines record looks like::
+
+    {"name": "Mira", "race": "Tiefling", "base_hp": 10,
+     "stats": {"STR": 12, "DEX": 15, "CON": 13, "INT": 11, "WIS": 9, "CHA": 16},
+     "race_bonuses": {"CHA": 2, "INT": 1}, "experience": 900, "weapon": "Dagger"}
+
+Only ``name`` and ``race`` are required. CSV files use the columns
+``name``, ``race``, ``base_hp``, ``experience``, ``weapon``, one column
+per stat (``STR`` ... ``CHA``) and ``bonus_STR`` ... ``bonus_CHA`` for
+custom race bonuses; blank cells mean "not given". Stats that are not
+given are rolled like `Character.roll_stats`, and given stats are the
+scores before racial bonuses, matching the interactive flow in main.py.
+
+A custom race is registered once, the first time a record defines it;
+later records may repeat the same bonuses or leave them out, and records
+that define different bonuses for an existing race are rejected.
+
+Examples:
+    >>> import io
+    >>> from dndgame.importer import CharacterImporter
+    >>> source = io.StringIO(
+    ...     '{"name": "Ada", "race": "Dwarf", "stats": {"STR": 14, "DEX": 10, '
+    ...     '"CON": 12, "INT": 10, "WIS": 10, "CHA": 10}}\\n'
+    ...     '{"name": "Bad", "race": "Unknown"}\\n')
+    >>> importer = CharacterImporter()
+    >>> [c.stats["CON"] for chunk in importer.iter_chunks(source, "jsonl") for c in chunk]
+    [14]
+    >>> importer.report.errors
+    [RecordError(line=2, message="Unknown race 'Unknown'")]
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import IO, Any, Iterable, Iterator, NamedTuple, Optional
+
+from dndgame import dice
+from dndgame.character import Character
+from dndgame.progression import apply_experience
+from dndgame.races import RACES, STAT_NAMES, register_race
+from dndgame.weapons import get_weapon
+
+
+class RecordError(NamedTuple):
+    """A record that could not be imported.
+
+    Attributes:
+        line: Line number of the record in the source, starting at 1.
+        message: Why the record was rejected.
+    """
+
+    line: int
+    message: str
+
+
+class ImportReport:
+    """Running totals of an import.
+
+    Attributes:
+        records: Records read so far.
+        imported: Characters built so far.
+        races_registered: Custom races registered by the import, in order.
+        errors: Rejected records, in source order.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty report."""
+        self.records: int = 0
+        self.imported: int = 0
+        self.races_registered: list[str] = []
+        self.errors: list[RecordError] = []
+
+
+class _Record(NamedTuple):
+    """A validated character record, cheap to send to a worker."""
+
+    name: str
+    race: str
+    base_hp: int
+    stats: Optional[dict[str, int]]
+    experience: int
+    weapon: Optional[str]
+
+
+def _int(value: Any, field: str) -> int:
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise ValueError(f"'{field}' must be an integer")
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"'{field}' must be an integer") from None
+
+
+def _read_jsonl(source: IO[str]) -> Iterator[tuple[int, dict[str, Any] | str]]:
+    for line_number, line in enumerate(source, start=1):
+        if not line.strip():
+            continue
+        try:
+            raw = json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield line_number, f"Invalid JSON: {exc.msg}"
+            continue
+        if not isinstance(raw, dict):
+            yield line_number, "Record must be a JSON object"
+            continue
+        yield line_number, raw
+
+
+def _read_csv(source: IO[str]) -> Iterator[tuple[int, dict[str, Any] | str]]:
+    reader = csv.DictReader(source)
+    for row in reader:
+        raw: dict[str, Any] = {}
+        stats: dict[str, str] = {}
+        bonuses: dict[str, str] = {}
+        for column, cell in row.items():
+            if column is None or cell is None or not cell.strip():
+                continue
+            cell = cell.strip()
+            if column.upper() in STAT_NAMES:
+                stats[column.upper()] = cell
+            elif column.lower().startswith("bonus_"):
+                bonuses[column[6:].upper()] = cell
+            else:
+                raw[column.strip().lower()] = cell
+        if stats:
+            raw["stats"] = stats
+        if bonuses:
+            raw["race_bonuses"] = bonuses
+        yield reader.line_num, raw
+
+
+def _build(
+    records: list[_Record], races: dict[str, dict[str, int]], seed: Optional[int]
+) -> list[Character]:
+    """Build characters from validated records.
+
+    Runs in the importing process or in a worker. ``races`` holds the
+    custom races the records need, so workers can register them first.
+    A seeded build restores the caller's dice state afterwards.
+    """
+    for name, bonuses in races.items():
+        if RACES.get(name) != bonuses:
+            register_race(name, bonuses)
+    state = dice.getstate()
+    if seed is not None:
+        dice.seed(seed)
+    verbose = dice.is_verbose()
+    dice.set_verbose(False)
+    try:
+        characters: list[Character] = []
+        for record in records:
+            character = Character(record.name, record.race, record.base_hp)
+            if record.stats is None:
+                character.roll_stats()
+            else:
+                character.set_stats(record.stats)
+            character.apply_racial_bonuses()
+            if record.weapon is not None:
+                character.equip(record.weapon)
+            characters.append(character)
+        if any(record.experience for record in records):
+            apply_experience(characters, [record.experience for record in records])
+    finally:
+        dice.set_verbose(verbose)
+        if seed is not None:
+            dice.setstate(state)
+    return characters
+
+
+class CharacterImporter:
+    """Imports characters from JSON Lines or CSV in bounded-size chunks.
+
+    Attributes:
+        chunk_size: Records validated and built together.
+        workers: Worker processes building chunks, or None to build in
+            the importing process.
+        seed: Base seed for rolled stats; chunk n uses ``seed + n``.
+        report: Totals and errors of the current import.
+    """
+
+    def __init__(self, chunk_size: int = 1000, workers: Optional[int] = None,
+                 seed: Optional[int] = None) -> None:
+        """Initialize an importer.
+
+        Args:
+            chunk_size: Records validated and built together.
+            workers: Worker processes for building; None builds in process.
+            seed: Base seed for rolled stats, for reproducible imports.
+
+        Raises:
+            ValueError: If chunk_size is less than 1.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+        self.chunk_size: int = chunk_size
+        self.workers: Optional[int] = workers
+        self.seed: Optional[int] = seed
+        self.report: ImportReport = ImportReport()
+        # Lower-cased race name -> registered name, refreshed per import
+        self._races: dict[str, str] = {}
+
+    def _validate(self, raw: dict[str, Any],
+                  new_races: dict[str, dict[str, int]]) -> _Record:
+        name = raw.get("name")
+        if not isinstance(name, str) or not name.strip():
+            raise ValueError("Missing 'name'")
+        race = raw.get("race")
+        if not isinstance(race, str) or not race.strip():
+            raise ValueError("Missing 'race'")
+        race = race.strip()
+
+        bonuses_raw = raw.get("race_bonuses")
+        known = self._races.get(race.lower())
+        defines_race = False
+        bonuses: dict[str, int] = {}
+        if bonuses_raw is not None:
+            if not isinstance(bonuses_raw, dict):
+                raise ValueError("'race_bonuses' must be a mapping")
+            for stat, value in bonuses_raw.items():
+                if str(stat).upper() not in STAT_NAMES:
+                    raise ValueError(f"Unknown stat '{stat}' in race_bonuses")
+                bonuses[str(stat).upper()] = _int(value, f"race_bonuses.{stat}")
+            if known is None:
+                defines_race = True
+                known = race
+            elif new_races.get(known, RACES.get(known)) != bonuses:
+                raise ValueError(f"Conflicting bonuses for race '{known}'")
+        if known is None:
+            raise ValueError(f"Unknown race '{race}'")
+
+        stats_raw = raw.get("stats")
+        stats: Optional[dict[str, int]] = None
+        if stats_raw is not None:
+            if not isinstance(stats_raw, dict):
+                raise ValueError("'stats' must be a mapping")
+            stats = {str(stat).upper(): _int(value, f"stats.{stat}")
+                     for stat, value in stats_raw.items()}
+            missing = [stat for stat in STAT_NAMES if stat not in stats]
+            if missing or len(stats) != len(STAT_NAMES):
+                raise ValueError(f"'stats' must have exactly {', '.join(STAT_NAMES)}")
+            if not all(1 <= value <= 30 for value in stats.values()):
+                raise ValueError("Stats must be between 1 and 30")
+
+        base_hp = _int(raw.get("base_hp", 10), "base_hp")
+        if base_hp < 1:
+            raise ValueError("'base_hp' must be positive")
+        experience = _int(raw.get("experience", 0), "experience")
+        if experience < 0:
+            raise ValueError("'experience' must not be negative")
+
+        weapon = raw.get("weapon")
+        if weapon is not None:
+            found = get_weapon(str(weapon))
+            if found is None:
+                raise ValueError(f"Unknown weapon '{weapon}'")
+            weapon = found.name
+
+        if defines_race:
+            # First valid definition wins; it is registered once per chunk
+            new_races[race] = bonuses
+            self._races[race.lower()] = race
+            self.report.races_registered.append(race)
+        return _Record(name.strip(), known, base_hp, stats, experience, weapon)
+
+    def _validate_chunk(
+        self, rows: list[tuple[int, dict[str, Any] | str]]
+    ) -> tuple[list[_Record], dict[str, dict[str, int]]]:
+        records: list[_Record] = []
+        new_races: dict[str, dict[str, int]] = {}
+        errors = self.report.errors
+        for line_number, raw in rows:
+            self.report.records += 1
+            if isinstance(raw, str):
+                errors.append(RecordError(line_number, raw))
+                continue
+            try:
+                records.append(self._validate(raw, new_races))
+            except ValueError as exc:
+                errors.append(RecordError(line_number, str(exc)))
+        for name, bonuses in new_races.items():
+            register_race(name, bonuses)
+        return records, new_races
+
+    def iter_chunks(self, source: str | IO[str],
+                    fmt: Optional[str] = None) -> Iterator[list[Character]]:
+        """Stream characters from a file, one chunk at a time.
+
+        Args:
+            source: A path, or an open text file.
+            fmt: "jsonl" or "csv"; guessed from the file extension when
+                source is a path.
+
+        Yields:
+            Lists of up to chunk_size built characters, in source order.
+
+        Raises:
+            ValueError: If the format is unknown.
+        """
+        if isinstance(source, str):
+            if fmt is None:
+                fmt = "csv" if source.lower().endswith(".csv") else "jsonl"
+            with open(source, newline="", encoding="utf-8") as handle:
+                yield from self.iter_chunks(handle, fmt)
+            return
+        if fmt not in ("jsonl", "csv"):
+            raise ValueError(f"Unknown import format '{fmt}'")
+
+        self.report = ImportReport()
+        self._races = {name.lower(): name for name in RACES}
+        rows = _read_csv(source) if fmt == "csv" else _read_jsonl(source)
+        chunks = self._validated_chunks(rows)
+        if self.workers is None:
+            for index, (records, _) in enumerate(chunks):
+                characters = _build(records, {}, self._chunk_seed(index))
+                self.report.imported += len(characters)
+                yield characters
+        else:
+            yield from self._build_parallel(chunks)
+
+    def _validated_chunks(
+        self, rows: Iterable[tuple[int, dict[str, Any] | str]]
+    ) -> Iterator[tuple[list[_Record], dict[str, dict[str, int]]]]:
+        iterator = iter(rows)
+        while True:
+            chunk = list(islice(iterator, self.chunk_size))
+            if not chunk:
+                return
+            yield self._validate_chunk(chunk)
+
+    def _chunk_seed(self, index: int) -> Optional[int]:
+        return None if self.seed is None else self.seed + index
+
+    def _build_parallel(
+        self, chunks: Iterator[tuple[list[_Record], dict[str, dict[str, int]]]]
+    ) -> Iterator[list[Character]]:
+        workers = self.workers or os.cpu_count() or 1
+        # Custom races seen so far; workers need every one their chunk uses
+        races: dict[str, dict[str, int]] = {}
+        in_flight: deque[Future[list[Character]]] = deque()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for index, (records, new_races) in enumerate(chunks):
+                races.update(new_races)
+                needed = {record.race for record in records}
+                chunk_races = {name: races[name] for name in needed if name in races}
+                in_flight.append(pool.submit(_build, records, chunk_races,
+                                             self._chunk_seed(index)))
+                # Bound memory to a couple of chunks per worker
+                while len(in_flight) >= 2 * workers:
+                    characters = in_flight.popleft().result()
+                    self.report.imported += len(characters)
+                    yield characters
+            while in_flight:
+                characters = in_flight.popleft().result()
+                self.report.imported += len(characters)
+                yield characters
+
+
+def import_characters(
+    source: str | IO[str], fmt: Optional[str] = None, chunk_size: int = 1000,
+    workers: Optional[int] = None, seed: Optional[int] = None,
+) -> tuple[list[Character], ImportReport]:
+    """Import every character from a file.
+
+    Convenience wrapper around `CharacterImporter.iter_chunks` that keeps
+    all characters; use the importer directly to process chunks as they
+    arrive with bounded memory.
+
+    Args:
+        source: A path, or an open text file.
+        fmt: "jsonl" or "csv"; guessed from the extension of a path.
+        chunk_size: Records validated and built together.
+        workers: Worker processes for building; None builds in process.
+        seed: Base seed for rolled stats.
+
+    Returns:
+        A tuple of (characters, report).
+    """
+    importer = CharacterImporter(chunk_size, workers, seed)
+    characters = [c for chunk in importer.iter_chunks(source, fmt) for c in chunk]
+    return characters, importer.report
@@ -0,0 +1,362 @@
+"""Load testing of the interactive game with scripted virtual players.
+
+Each virtual player runs `main.py` in its own process and plays it the
+way a person would: it waits for a prompt, thinks for a while, and types
+the next line of its `Script`. Prompts that only show up in some games,
+such as the offer to rest at 0 HP, are answered from the script's
+``replies``. The local transport is the child's stdin and stdout pipes,
+so the whole interactive flow is exercised, prompts included.
+
+The latency of a step is the time from sending its input to seeing the
+next prompt (or the game exiting), which leaves think time out. A
+`LoadReport` has p50/p95/p99 per step label plus sessions per second and
+serializes to JSON for charting across releases.
+
+Run it with ``python -m dndgame.loadtest --players 8 --sessions 40``.
+
+Examples:
+    >>> from dndgame.loadtest import Script, Step, run_load
+    >>> quit_early = Script("quitter", (Step("name", "Ann"), Step("race", "1"),
+    ...                                 Step("quit", "3")))
+    >>> report = run_load([quit_early], players=1, sessions=1, seed=1)
+    >>> report.sessions, report.errors, sorted(report.steps)
+    (1, 0, ['name', 'quit', 'race', 'start'])
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import selectors
+import subprocess
+import sys
+import threading
+import time
+from types import MappingProxyType
+from typing import Any, Mapping, NamedTuple, Optional, Sequence
+
+# The game entry point next to the package
+MAIN_PY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                       "main.py")
+
+# Every prompt in main.py ends this way; print output never does
+PROMPT_END = b": "
+
+# Label for the time from launching the game to its first prompt
+START = "start"
+
+
+class Step(NamedTuple):
+    """One line a virtual player types.
+
+    Attributes:
+        label: Name the step's latency is reported under.
+        text: The line sent to the game.
+    """
+
+    label: str
+    text: str
+
+
+class Script(NamedTuple):
+    """What a virtual player does in one session.
+
+    Attributes:
+        name: Script name.
+        steps: Lines to type in order, one per prompt.
+        replies: Answers to conditional prompts, keyed by a substring of
+            the prompt; these do not consume a step.
+        think: Minimum and maximum seconds to think before each input.
+    """
+
+    name: str
+    steps: tuple[Step, ...]
+    replies: Mapping[str, Step] = MappingProxyType({})
+    think: tuple[float, float] = (0.0, 0.0)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Script:
+        """Build a script from its JSON form.
+
+        Args:
+            data: A mapping with "name", "steps" as ``[label, text]`` pairs,
+                and optional "replies" and "think".
+
+        Returns:
+            The script.
+        """
+        return cls(
+            data["name"],
+            tuple(Step(*step) for step in data["steps"]),
+            {prompt: Step(*step) for prompt, step in data.get("replies", {}).items()},
+            tuple(data.get("think", (0.0, 0.0))),
+        )
+
+
+DEFAULT_SCRIPT = Script(
+    "fighter",
+    (Step("name", "Tester"), Step("race", "3"),
+     *(Step("fight", "1") for _ in range(5)),
+     Step("view", "2"), Step("quit", "3")),
+    {"0 HP": Step("rest", "y")},
+    (0.0, 0.01),
+)
+
+
+class StepStats(NamedTuple):
+    """Latency summary for one step label.
+
+    Attributes:
+        samples: Samples recorded.
+        p50: Median latency in seconds.
+        p95: 95th percentile latency in seconds.
+        p99: 99th percentile latency in seconds.
+    """
+
+    samples: int
+    p50: float
+    p95: float
+    p99: float
+
+    @classmethod
+    def of(cls, latencies: Sequence[float]) -> StepStats:
+        """Summarize latency samples."""
+        ordered = sorted(latencies)
+
+        def percentile(q: float) -> float:
+            if not ordered:
+                return 0.0
+            return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+        return cls(len(ordered), percentile(0.5), percentile(0.95), percentile(0.99))
+
+
+class LoadReport(NamedTuple):
+    """Result of a load test.
+
+    Attributes:
+        players: Concurrent virtual players.
+        sessions: Sessions that ran to completion.
+        errors: Sessions that crashed, timed out or exited with an error.
+        seconds: Wall-clock duration of the test.
+        steps: Latency summary per step label.
+    """
+
+    players: int
+    sessions: int
+    errors: int
+    seconds: float
+    steps: dict[str, StepStats]
+
+    @property
+    def sessions_per_second(self) -> float:
+        """Completed sessions per second of wall-clock time."""
+        return self.sessions / self.seconds if self.seconds else 0.0
+
+    def to_json(self) -> str:
+        """Serialize the report, latencies in milliseconds."""
+        return json.dumps({
+            "players": self.players,
+            "sessions": self.sessions,
+            "errors": self.errors,
+            "seconds": round(self.seconds, 6),
+            "sessions_per_second": round(self.sessions_per_second, 3),
+            "steps": {
+                label: {"samples": stats.samples,
+                        "p50_ms": round(stats.p50 * 1000, 3),
+                        "p95_ms": round(stats.p95 * 1000, 3),
+                        "p99_ms": round(stats.p99 * 1000, 3)}
+                for label, stats in sorted(self.steps.items())
+            },
+        }, indent=2)
+
+
+class _Game:
+    """A running main.py reached through its stdin and stdout."""
+
+    def __init__(self, args: Sequence[str], timeout: float) -> None:
+        env = dict(os.environ, PYTHONUNBUFFERED="1")
+        self.process = subprocess.Popen(
+            [sys.executable, MAIN_PY, *args], stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, env=env)
+        assert self.process.stdin is not None and self.process.stdout is not None
+        self._stdin = self.process.stdin
+        self._fd = self.process.stdout.fileno()
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._fd, selectors.EVENT_READ)
+        self._timeout = timeout
+
+    def read_prompt(self) -> Optional[str]:
+        """Wait for the next prompt.
+
+        Returns:
+            The prompt line, or None if the game exited.
+
+        Raises:
+            TimeoutError: If the game went quiet without prompting.
+        """
+        buffer = b""
+        while True:
+            if not self._selector.select(self._timeout):
+                raise TimeoutError("game stopped responding")
+            chunk = os.read(self._fd, 65536)
+            if not chunk:
+                return None
+            buffer += chunk
+            if buffer.endswith(PROMPT_END):
+                return buffer.rsplit(b"\n", 1)[-1].decode(errors="replace")
+
+    def send(self, text: str) -> None:
+        self._stdin.write(text.encode() + b"\n")
+        self._stdin.flush()
+
+    def close(self) -> int:
+        """Hang up and collect the exit code."""
+        try:
+            self._stdin.close()
+        except OSError:
+            pass
+        try:
+            code = self.process.wait(timeout=self._timeout)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            code = self.process.wait()
+        self._selector.close()
+        assert self.process.stdout is not None
+        self.process.stdout.close()
+        return code
+
+
+def play_session(script: Script, rng: random.Random, seed: Optional[int] = None,
+                 timeout: float = 30.0) -> dict[str, list[float]]:
+    """Play one scripted session of the game.
+
+    Args:
+        script: What the virtual player types.
+        rng: Source of think times.
+        seed: Passed to the game as ``--seed``.
+        timeout: Seconds to wait for any single prompt.
+
+    Returns:
+        Latencies in seconds per step label.
+
+    Raises:
+        TimeoutError: If the game stopped responding.
+        RuntimeError: If the game exited with an error before the script
+            ran out.
+    """
+    latencies: dict[str, list[float]] = {}
+    steps = iter(script.steps)
+    hung_up = False
+    game = _Game(["--seed", str(seed)] if seed is not None else [], timeout)
+    try:
+        label = START
+        sent = time.perf_counter()
+        while True:
+            prompt = game.read_prompt()
+            latencies.setdefault(label, []).append(time.perf_counter() - sent)
+            if prompt is None:
+                break
+            step = next((reply for key, reply in script.replies.items() if key in prompt),
+                        None) or next(steps, None)
+            if step is None:
+                # Out of script: the player leaves mid-game
+                hung_up = True
+                break
+            low, high = script.think
+            if high > 0:
+                time.sleep(rng.uniform(low, high))
+            label = step.label
+            sent = time.perf_counter()
+            game.send(step.text)
+    finally:
+        code = game.close()
+    if code != 0 and not hung_up:
+        raise RuntimeError(f"game exited with status {code}")
+    return latencies
+
+
+def run_load(scripts: Sequence[Script] = (DEFAULT_SCRIPT,), players: int = 4,
+             sessions: int = 20, seed: Optional[int] = None,
+             timeout: float = 30.0) -> LoadReport:
+    """Run sessions with concurrent virtual players.
+
+    Player ``n`` plays ``scripts[n % len(scripts)]`` over and over until
+    the players have started ``sessions`` sessions between them.
+
+    Args:
+        scripts: Scripts handed out to players in turn.
+        players: Concurrent virtual players.
+        sessions: Total sessions to play.
+        seed: Base seed; session ``i`` runs the game with ``--seed seed + i``
+            and think times are drawn from seeded generators.
+        timeout: Seconds to wait for any single prompt.
+
+    Returns:
+        The `LoadReport`.
+    """
+    lock = threading.Lock()
+    latencies: dict[str, list[float]] = {}
+    started = 0
+    completed = 0
+    errors = 0
+
+    def player(number: int) -> None:
+        nonlocal started, completed, errors
+        script = scripts[number % len(scripts)]
+        rng = random.Random(None if seed is None else seed * 1000 + number)
+        while True:
+            with lock:
+                if started >= sessions:
+                    return
+                session = started
+                started += 1
+            try:
+                result = play_session(script, rng,
+                                      None if seed is None else seed + session, timeout)
+            except (RuntimeError, TimeoutError, OSError):
+                with lock:
+                    errors += 1
+                continue
+            with lock:
+                completed += 1
+                for label, samples in result.items():
+                    latencies.setdefault(label, []).extend(samples)
+
+    began = time.perf_counter()
+    threads = [threading.Thread(target=player, args=(n,)) for n in range(players)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - began
+    return LoadReport(players, completed, errors, elapsed,
+                      {label: StepStats.of(samples) for label, samples in latencies.items()})
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Command-line entry point; prints or writes the JSON report."""
+    parser = argparse.ArgumentParser(description="Load test the interactive game")
+    parser.add_argument("--players", type=int, default=4, help="Concurrent virtual players")
+    parser.add_argument("--sessions", type=int, default=20, help="Total sessions to play")
+    parser.add_argument("--script", help="JSON file with a list of scripts")
+    parser.add_argument("--seed", type=int, help="Base seed for games and think times")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    scripts: Sequence[Script] = (DEFAULT_SCRIPT,)
+    if args.script:
+        with open(args.script, encoding="utf-8") as fh:
+            scripts = [Script.from_dict(data) for data in json.load(fh)]
+    report = run_load(scripts, players=args.players, sessions=args.sessions, seed=args.seed)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            fh.write(report.to_json() + "\n")
+    else:
+        print(report.to_json())
+
+
+if __name__ == "__main__":
+    main()
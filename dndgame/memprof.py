@@ -0,0 +1,335 @@
+"""Memory diagnostics for simulation workloads.
+
+Runs a configurable simulation `Workload` in two phases, first rolling
+every combatant and then fighting every combat, with `tracemalloc`
+tracing each phase separately and `gc` statistics taken around it. The
+objects a phase leaves behind are kept alive until it is measured, so
+the report shows what each entity and each combat (with its log) costs,
+while the peak also captures short-lived garbage such as the per-roll
+lists in `dice.roll`.
+
+Allocations are attributed to the innermost `dndgame` module on their
+traceback. The objects a phase left behind are also counted by type and
+by the attribute that holds them, so the event dicts in `Combat.log` and
+each entity's ``stats`` dict show up separately. Reports are plain JSON and
+`compare` lines up two of them, for tracking memory across releases.
+
+Run it with ``python -m dndgame.memprof --fights 500 --output mem.json``.
+
+Examples:
+    >>> from dndgame.memprof import Workload, profile
+    >>> report = profile(Workload(fights=20, seed=1))
+    >>> [phase.name for phase in report.phases]
+    ['entities', 'combats']
+    >>> report.phases[0].units, report.phases[0].per_unit > 0
+    (40, True)
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import sys
+import tracemalloc
+from typing import Any, Callable, NamedTuple, Optional, Sequence
+
+import dndgame
+from dndgame import dice
+from dndgame.character import Character
+from dndgame.combat import Combat
+from dndgame.enemy import Enemy
+
+# Directory whose files count as dndgame modules
+PACKAGE_DIR = os.path.dirname(os.path.abspath(dndgame.__file__))
+
+# Attribution for allocations with no dndgame frame on their traceback
+OTHER = "(other)"
+# Attribution for the profiling harness's own allocations
+WORKLOAD = "(workload)"
+
+
+class Workload(NamedTuple):
+    """A simulation to profile.
+
+    Attributes:
+        fights: Number of player-vs-goblin fights; each gets two fresh
+            combatants.
+        keep_log: Whether combats keep their per-round log.
+        max_rounds: Maximum rounds per fight.
+        seed: Dice seed, for repeatable reports.
+        frames: Traceback depth kept by tracemalloc.
+    """
+
+    fights: int = 500
+    keep_log: bool = True
+    max_rounds: int = 300
+    seed: int = 0
+    frames: int = 16
+
+
+class TypeUsage(NamedTuple):
+    """Objects of one type left behind by a phase.
+
+    Attributes:
+        objects: Number of objects.
+        size: Their shallow size in bytes, from `sys.getsizeof`.
+    """
+
+    objects: int
+    size: int
+
+
+class PhaseReport(NamedTuple):
+    """Memory used by one phase of a workload.
+
+    Attributes:
+        name: "entities" or "combats".
+        units: Entities created or combats fought.
+        retained: Traced bytes still allocated at the end of the phase.
+        peak: Highest traced bytes during the phase.
+        modules: Retained bytes per allocating module, largest first.
+        types: Containers and game objects the phase left behind, keyed by
+            type and owner as in ``"dict Character.stats"``, largest first.
+        collections: Garbage collections per generation during the phase.
+    """
+
+    name: str
+    units: int
+    retained: int
+    peak: int
+    modules: dict[str, int]
+    types: dict[str, TypeUsage]
+    collections: tuple[int, ...]
+
+    @property
+    def per_unit(self) -> float:
+        """Retained bytes per entity or per combat."""
+        return self.retained / self.units if self.units else 0.0
+
+
+class MemoryReport(NamedTuple):
+    """Result of `profile`.
+
+    Attributes:
+        workload: The profiled workload.
+        python: The Python version the report was taken with.
+        phases: One report per phase, in order.
+    """
+
+    workload: Workload
+    python: str
+    phases: tuple[PhaseReport, ...]
+
+    def to_dict(self) -> dict[str, Any]:
+        """Get the report as JSON-serializable data."""
+        return {
+            "workload": self.workload._asdict(),
+            "python": self.python,
+            "phases": {
+                phase.name: {
+                    "units": phase.units,
+                    "retained_bytes": phase.retained,
+                    "peak_bytes": phase.peak,
+                    "bytes_per_unit": round(phase.per_unit, 1),
+                    "collections": list(phase.collections),
+                    "modules": phase.modules,
+                    "types": {key: usage._asdict() for key, usage in phase.types.items()},
+                }
+                for phase in self.phases
+            },
+        }
+
+    def to_json(self) -> str:
+        """Serialize the report."""
+        return json.dumps(self.to_dict(), indent=2)
+
+
+def _module_of(filename: str) -> Optional[str]:
+    """Get the dotted dndgame module a source file belongs to, if any."""
+    if not filename.startswith(PACKAGE_DIR + os.sep):
+        return None
+    relative = os.path.relpath(filename, os.path.dirname(PACKAGE_DIR))
+    return os.path.splitext(relative)[0].replace(os.sep, ".")
+
+
+def _attribute(traceback: Optional[tracemalloc.Traceback]) -> str:
+    """Find the innermost dndgame module on an allocation traceback.
+
+    Frames of this module belong to the workload itself, such as the
+    lists holding its results, and are reported as ``"(workload)"``.
+    """
+    label = OTHER
+    if traceback is not None:
+        for frame in reversed(traceback):  # innermost frame first
+            module = _module_of(frame.filename)
+            if module == __name__:
+                label = WORKLOAD
+            elif module is not None:
+                return module
+    return label
+
+
+def _largest_first(totals: dict[str, Any], key: Callable[[Any], int]) -> dict[str, Any]:
+    return dict(sorted(totals.items(), key=lambda item: key(item[1]), reverse=True))
+
+
+def _census(roots: Any, seen: set[int]) -> dict[str, TypeUsage]:
+    """Count the containers and game objects reachable from a phase's roots.
+
+    Each object is labelled by its type and where it hangs: a game object
+    by its class, anything else by the attribute path it was reached
+    through, such as ``"dict Combat.log[]"`` for the events in a combat
+    log. Strings and numbers are skipped since they are mostly shared,
+    and objects already counted by an earlier phase are left out.
+    """
+    totals: dict[str, list[int]] = {}
+    stack: list[tuple[Any, str]] = [(roots, WORKLOAD)]
+    while stack:
+        obj, label = stack.pop()
+        if id(obj) in seen:
+            continue
+        cls = type(obj)
+        if cls.__module__.startswith("dndgame.") and hasattr(obj, "__dict__"):
+            key = cls.__name__
+            children = [(value, f"{key}.{attr}") for attr, value in vars(obj).items()]
+        elif isinstance(obj, dict):
+            key = f"dict {label}"
+            children = [(value, f"{label}[]") for value in obj.values()]
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            key = f"{cls.__name__} {label}"
+            children = [(value, f"{label}[]") for value in obj]
+        else:
+            continue
+        seen.add(id(obj))
+        usage = totals.setdefault(key, [0, 0])
+        usage[0] += 1
+        usage[1] += sys.getsizeof(obj)
+        stack.extend(children)
+    return _largest_first({key: TypeUsage(*usage) for key, usage in totals.items()},
+                          lambda usage: usage.size)
+
+
+def _measure(name: str, units: int, frames: int, run: Callable[[], Any],
+             seen: set[int]) -> PhaseReport:
+    """Run one phase under tracemalloc and summarize what it kept."""
+    gc.collect()
+    before_gc = [stats["collections"] for stats in gc.get_stats()]
+    tracemalloc.start(frames)
+    try:
+        roots = run()
+        retained, peak = tracemalloc.get_traced_memory()
+        after_gc = [stats["collections"] for stats in gc.get_stats()]
+        snapshot = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    modules: dict[str, int] = {}
+    for trace in snapshot.traces:
+        module = _attribute(trace.traceback)
+        modules[module] = modules.get(module, 0) + trace.size
+    return PhaseReport(
+        name, units, retained, peak,
+        _largest_first(modules, int),
+        _census(roots, seen),
+        tuple(after - before for before, after in zip(before_gc, after_gc)),
+    )
+
+
+def profile(workload: Workload = Workload()) -> MemoryReport:
+    """Profile a simulation workload.
+
+    Args:
+        workload: What to simulate.
+
+    Returns:
+        The `MemoryReport`.
+    """
+    verbose = dice.is_verbose()
+    rng_state = dice.getstate()
+    dice.set_verbose(False)
+    dice.seed(workload.seed)
+    pairs: list[tuple[Character, Enemy]] = []
+
+    def roll_entities() -> list[tuple[Character, Enemy]]:
+        for _ in range(workload.fights):
+            player = Character("Hero", "Human", 10)
+            player.roll_stats()
+            player.apply_racial_bonuses()
+            goblin = Enemy("Goblin", "Goblin", 7)
+            goblin.roll_stats()
+            goblin.apply_racial_bonuses()
+            pairs.append((player, goblin))
+        return pairs
+
+    def fight() -> list[Combat]:
+        combats = []
+        for player, goblin in pairs:
+            combat = Combat(player, goblin, max_rounds=workload.max_rounds,
+                            keep_log=workload.keep_log)
+            combat.run()
+            combats.append(combat)
+        return combats
+
+    seen: set[int] = set()
+    try:
+        phases = (
+            _measure("entities", 2 * workload.fights, workload.frames, roll_entities, seen),
+            _measure("combats", workload.fights, workload.frames, fight, seen),
+        )
+    finally:
+        dice.set_verbose(verbose)
+        dice.setstate(rng_state)
+    return MemoryReport(workload, sys.version.split()[0], phases)
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any]) -> dict[str, dict[str, float]]:
+    """Line up the headline numbers of two reports from `MemoryReport.to_dict`.
+
+    Args:
+        baseline: The older report.
+        current: The newer report.
+
+    Returns:
+        For every phase in both reports, the relative change (0.1 is 10%
+        more) of its retained bytes per unit and its peak.
+    """
+    changes: dict[str, dict[str, float]] = {}
+    for name, old in baseline["phases"].items():
+        new = current["phases"].get(name)
+        if new is None:
+            continue
+        changes[name] = {
+            key: (new[key] - old[key]) / old[key] if old[key] else 0.0
+            for key in ("bytes_per_unit", "peak_bytes")
+        }
+    return changes
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Command-line entry point; prints or writes the JSON report."""
+    parser = argparse.ArgumentParser(description="Profile memory of a simulation workload")
+    parser.add_argument("--fights", type=int, default=500, help="Fights to simulate")
+    parser.add_argument("--no-log", action="store_true", help="Run combats without per-round logs")
+    parser.add_argument("--seed", type=int, default=0, help="Dice seed")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    parser.add_argument("--baseline", help="Earlier JSON report to compare against")
+    args = parser.parse_args(argv)
+
+    report = profile(Workload(fights=args.fights, keep_log=not args.no_log, seed=args.seed))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            fh.write(report.to_json() + "\n")
+    else:
+        print(report.to_json())
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fh:
+            baseline = json.load(fh)
+        for name, change in compare(baseline, report.to_dict()).items():
+            print(f"{name}: " + ", ".join(f"{key} {value:+.1%}" for key, value in change.items()),
+                  file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
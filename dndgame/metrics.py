@@ -0,0 +1,381 @@
+"""Runtime metrics for running the game as a service.
+
+Provides counters, gauges and latency histograms in a `MetricsRegistry`,
+a local HTTP endpoint serving the registry in Prometheus text format, and
+a background thread that keeps periodic snapshots. Recording a value is
+a few attribute updates under a per-metric lock, well under a
+microsecond, so the default registry stays on in production.
+
+Examples:
+    >>> from dndgame.metrics import MetricsRegistry
+    >>> registry = MetricsRegistry()
+    >>> fights = registry.counter("fights_total", "Fights run.")
+    >>> fights.inc()
+    >>> print(registry.render().splitlines()[-1])
+    fights_total 1
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import TracebackType
+from typing import Any, Iterator, Optional, Sequence, Type, TypeVar, Union
+
+
+# Latency buckets in seconds, from 10 microseconds to 10 seconds
+DEFAULT_LATENCY_BUCKETS = (
+    1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 5e-3, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0,
+)
+
+
+class Counter:
+    """A monotonically increasing count.
+
+    Attributes:
+        name: Metric name.
+        help: One-line description.
+        value: Current count.
+    """
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str) -> None:
+        """Initialize a counter at zero.
+
+        Args:
+            name: Metric name.
+            help: One-line description.
+        """
+        self.name: str = name
+        self.help: str = help
+        self.value: float = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1) -> None:
+        """Increase the count.
+
+        Args:
+            amount: Non-negative amount to add.
+        """
+        with self._lock:
+            self.value += amount
+
+    def samples(self) -> list[tuple[str, float]]:
+        """Get the (sample name, value) pairs exposed for this metric."""
+        return [(self.name, self.value)]
+
+
+class Gauge:
+    """A value that can go up and down.
+
+    Attributes:
+        name: Metric name.
+        help: One-line description.
+        value: Current value.
+    """
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str) -> None:
+        """Initialize a gauge at zero.
+
+        Args:
+            name: Metric name.
+            help: One-line description.
+        """
+        self.name: str = name
+        self.help: str = help
+        self.value: float = 0
+        self._lock = threading.Lock()
+
+    def set(self, value: float) -> None:
+        """Set the gauge.
+
+        Args:
+            value: The new value.
+        """
+        with self._lock:
+            self.value = value
+
+    def inc(self, amount: float = 1) -> None:
+        """Increase the gauge.
+
+        Args:
+            amount: Amount to add.
+        """
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        """Decrease the gauge.
+
+        Args:
+            amount: Amount to subtract.
+        """
+        with self._lock:
+            self.value -= amount
+
+    def samples(self) -> list[tuple[str, float]]:
+        """Get the (sample name, value) pairs exposed for this metric."""
+        return [(self.name, self.value)]
+
+
+class Histogram:
+    """Counts observations into cumulative buckets.
+
+    Attributes:
+        name: Metric name.
+        help: One-line description.
+        buckets: Sorted upper bounds of the buckets, excluding +Inf.
+        count: Number of observations.
+        sum: Sum of all observations.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str,
+                 buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> None:
+        """Initialize an empty histogram.
+
+        Args:
+            name: Metric name.
+            help: One-line description.
+            buckets: Upper bounds of the buckets.
+        """
+        self.name: str = name
+        self.help: str = help
+        self.buckets: tuple[float, ...] = tuple(sorted(buckets))
+        self.count: int = 0
+        self.sum: float = 0.0
+        # One slot per bucket plus the +Inf overflow
+        self._counts: list[int] = [0] * (len(self.buckets) + 1)
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """Record one observation.
+
+        Args:
+            value: The observed value.
+        """
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self.count += 1
+            self.sum += value
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        """Observe the wall-clock duration of a block in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def samples(self) -> list[tuple[str, float]]:
+        """Get the (sample name, value) pairs exposed for this metric."""
+        with self._lock:
+            counts = list(self._counts)
+            total, count = self.sum, self.count
+        samples: list[tuple[str, float]] = []
+        cumulative = 0
+        for bound, n in zip(self.buckets, counts):
+            cumulative += n
+            samples.append((f'{self.name}_bucket{{le="{bound:g}"}}', cumulative))
+        samples.append((f'{self.name}_bucket{{le="+Inf"}}', count))
+        samples.append((f"{self.name}_sum", total))
+        samples.append((f"{self.name}_count", count))
+        return samples
+
+
+Metric = Union[Counter, Gauge, Histogram]
+M = TypeVar("M", Counter, Gauge, Histogram)
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value without losing precision."""
+    if isinstance(value, int):
+        return str(value)
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(value)
+
+
+class MetricsRegistry:
+    """A named collection of metrics.
+
+    Attributes:
+        metrics: Registered metrics keyed by name.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self.metrics: dict[str, Metric] = {}
+
+    def _register(self, metric: M) -> M:
+        if metric.name in self.metrics:
+            raise ValueError(f"Metric '{metric.name}' already registered")
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str) -> Counter:
+        """Register a counter.
+
+        Raises:
+            ValueError: If the name is already registered.
+        """
+        return self._register(Counter(name, help))
+
+    def gauge(self, name: str, help: str) -> Gauge:
+        """Register a gauge.
+
+        Raises:
+            ValueError: If the name is already registered.
+        """
+        return self._register(Gauge(name, help))
+
+    def histogram(self, name: str, help: str,
+                  buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> Histogram:
+        """Register a histogram.
+
+        Raises:
+            ValueError: If the name is already registered.
+        """
+        return self._register(Histogram(name, help, buckets))
+
+    def snapshot(self) -> dict[str, float]:
+        """Get the current value of every sample.
+
+        Returns:
+            Mapping of sample name to value.
+        """
+        return {name: value for metric in self.metrics.values()
+                for name, value in metric.samples()}
+
+    def render(self) -> str:
+        """Render the registry in the Prometheus text exposition format.
+
+        Returns:
+            The exposition text.
+        """
+        lines: list[str] = []
+        for metric in self.metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, value in metric.samples():
+                lines.append(f"{name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+# Default registry and the game's built-in metrics
+REGISTRY = MetricsRegistry()
+COMBATS_STARTED = REGISTRY.counter(
+    "dndgame_combats_started_total", "Combats started.")
+COMBATS_FINISHED = REGISTRY.counter(
+    "dndgame_combats_finished_total", "Combats finished.")
+COMBAT_DURATION = REGISTRY.histogram(
+    "dndgame_combat_run_seconds", "Duration of Combat.run.")
+COMBAT_ROUNDS = REGISTRY.histogram(
+    "dndgame_combat_rounds", "Rounds played per combat.",
+    buckets=(1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144, 300))
+CHARACTER_CREATION = REGISTRY.histogram(
+    "dndgame_character_creation_seconds", "Time to create a player character.")
+ACTIVE_SESSIONS = REGISTRY.gauge(
+    "dndgame_active_sessions", "Game sessions currently running.")
+SCHEDULER_QUEUE_DEPTH = REGISTRY.gauge(
+    "dndgame_scheduler_queue_depth", "Combats queued or running in the scheduler.")
+SCHEDULER_WAIT = REGISTRY.histogram(
+    "dndgame_scheduler_wait_seconds", "Time a runnable combat waited for its next round.")
+SCHEDULER_REJECTED = REGISTRY.counter(
+    "dndgame_scheduler_rejected_total", "Combats rejected because the scheduler was full.")
+OUTCOME_CACHE_HITS = REGISTRY.counter(
+    "dndgame_outcome_cache_hits_total", "Combats resolved from a cached outcome distribution.")
+OUTCOME_CACHE_MISSES = REGISTRY.counter(
+    "dndgame_outcome_cache_misses_total", "Outcome distributions computed for new matchups.")
+
+
+class MetricsServer:
+    """Serves a registry over HTTP and keeps periodic snapshots.
+
+    ``GET /metrics`` returns the Prometheus exposition text. A background
+    thread records a snapshot every ``snapshot_interval`` seconds.
+
+    Attributes:
+        registry: The served registry.
+        snapshots: Recent ``(timestamp, snapshot)`` pairs, oldest first.
+        port: The bound port.
+    """
+
+    def __init__(self, registry: MetricsRegistry = REGISTRY, host: str = "127.0.0.1",
+                 port: int = 0, snapshot_interval: float = 10.0,
+                 keep_snapshots: int = 360) -> None:
+        """Start serving.
+
+        Args:
+            registry: The registry to expose.
+            host: Interface to bind; local-only by default.
+            port: Port to bind; 0 picks a free port.
+            snapshot_interval: Seconds between snapshots.
+            keep_snapshots: Number of snapshots retained.
+        """
+        self.registry: MetricsRegistry = registry
+        self.snapshots: deque[tuple[float, dict[str, float]]] = deque(
+            maxlen=keep_snapshots)
+        self._stop = threading.Event()
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(handler) -> None:
+                if handler.path.split("?")[0] != "/metrics":
+                    handler.send_error(404)
+                    return
+                body = registry.render().encode()
+                handler.send_response(200)
+                handler.send_header("Content-Type", "text/plain; version=0.0.4")
+                handler.send_header("Content-Length", str(len(body)))
+                handler.end_headers()
+                handler.wfile.write(body)
+
+            def log_message(handler, format: str, *args: Any) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self.port: int = self._server.server_address[1]
+        self._threads = [
+            threading.Thread(target=self._server.serve_forever, daemon=True),
+            threading.Thread(target=self._snapshot_loop, args=(snapshot_interval,),
+                             daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def _snapshot_loop(self, interval: float) -> None:
+        while not self._stop.is_set():
+            self.snapshots.append((time.time(), self.registry.snapshot()))
+            self._stop.wait(interval)
+
+    def close(self) -> None:
+        """Stop the server and the snapshot thread."""
+        self._stop.set()
+        self._server.shutdown()
+        self._server.server_close()
+        for thread in self._threads:
+            thread.join()
+
+    def __enter__(self) -> MetricsServer:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
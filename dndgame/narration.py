@@ -0,0 +1,349 @@
+"""Asynchronous, cached combat narration.
+
+A `DungeonMaster` subscribes to a `Combat` and turns its events into
+prose without ever blocking the fight. Each event is first reduced to a
+normalized template key such as ``"attack/crit"`` or ``"attack/miss"``;
+names and numbers are filled in afterwards, so one narration serves every
+event with the same shape. Narrations are cached per key in an LRU cache.
+Cache hits are rendered straight away. Misses are queued for a
+background thread that sends batches of distinct keys to a pluggable
+`NarrationBackend`, such as a language-model service. `TemplateBackend`
+is a local stand-in with canned phrases.
+
+Examples:
+    >>> from dndgame.narration import DungeonMaster, TemplateBackend
+    >>> miss = {"attacker": "Hero", "defender": "Goblin", "roll": 9,
+    ...         "crit": False, "dmg": 0, "defender_hp": 7}
+    >>> with DungeonMaster(TemplateBackend()) as dm:
+    ...     dm.submit(miss)
+    ...     dm.submit({**miss, "attacker": "Goblin", "defender": "Hero"})
+    ...     _ = dm.flush()
+    ...     [n.text for n in dm.drain()], dm.hits, dm.misses
+    (['Hero swings at Goblin and misses.', 'Goblin swings at Hero and misses.'], 0, 2)
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from types import TracebackType
+from typing import Any, Callable, NamedTuple, Optional, Protocol, Sequence, Type, cast
+
+from dndgame.combat import Combat, LogEvent, MaxRoundsEvent
+
+
+# Damage at or above this is narrated as a heavy blow
+HEAVY_HIT = 6
+
+
+class NarrationBackend(Protocol):
+    """Something that writes narration templates in batches.
+
+    Templates may use the fields ``{attacker}``, ``{defender}``,
+    ``{dmg}``, ``{hp}`` and ``{rounds}``.
+    """
+
+    def narrate_batch(self, keys: Sequence[str]) -> list[str]:
+        """Write one narration template per event key, in order."""
+        ...
+
+
+class TemplateBackend:
+    """Local narration backend with canned phrases, for tests and offline play.
+
+    Attributes:
+        delay: Seconds each batch takes, to stand in for a remote service.
+        batches: Sizes of the batches received so far.
+    """
+
+    PHRASES: dict[str, str] = {
+        "attack/miss": "{attacker} swings at {defender} and misses.",
+        "attack/hit/light": "{attacker} grazes {defender} for {dmg} damage.",
+        "attack/hit/heavy": "{attacker} lands a heavy blow on {defender} for {dmg} damage!",
+        "attack/crit": "Critical hit! {attacker} strikes {defender} for {dmg} damage!",
+        "attack/kill": "{attacker} fells {defender} with a {dmg}-damage blow.",
+        "attack/crit-kill": "A devastating critical! {attacker} slays {defender}.",
+        "max_rounds": "The fight drags on for {rounds} rounds; both sides fall back.",
+    }
+
+    def __init__(self, delay: float = 0.0) -> None:
+        """Initialize the backend.
+
+        Args:
+            delay: Seconds to sleep per batch.
+        """
+        self.delay: float = delay
+        self.batches: list[int] = []
+
+    def narrate_batch(self, keys: Sequence[str]) -> list[str]:
+        """Look up a phrase for every key.
+
+        Args:
+            keys: Normalized event keys.
+
+        Returns:
+            One narration template per key.
+        """
+        if self.delay:
+            time.sleep(self.delay)
+        self.batches.append(len(keys))
+        return [self.PHRASES.get(key, "{attacker} and {defender} trade blows.")
+                for key in keys]
+
+
+class Narration(NamedTuple):
+    """A narrated combat event.
+
+    Attributes:
+        seq: Order in which the event was submitted, starting at 0.
+        text: The narration.
+    """
+
+    seq: int
+    text: str
+
+
+def event_key(event: LogEvent) -> str:
+    """Reduce a combat event to its normalized template key.
+
+    Args:
+        event: An event from a combat log.
+
+    Returns:
+        A key such as ``"attack/miss"`` or ``"max_rounds"``.
+    """
+    if "event" in event:
+        return "max_rounds"
+    if event["defender_hp"] == 0:
+        return "attack/crit-kill" if event["crit"] else "attack/kill"
+    if event["crit"]:
+        return "attack/crit"
+    if event["dmg"] == 0:
+        return "attack/miss"
+    return "attack/hit/heavy" if event["dmg"] >= HEAVY_HIT else "attack/hit/light"
+
+
+def render(template: str, event: LogEvent) -> str:
+    """Fill a narration template with an event's names and numbers.
+
+    Args:
+        template: Narration text with ``{field}`` placeholders.
+        event: The event being narrated.
+
+    Returns:
+        The narration; templates with unknown placeholders come back as is.
+    """
+    fields: dict[str, Any]
+    if "event" in event:
+        fields = {"rounds": cast(MaxRoundsEvent, event)["rounds"], "attacker": "", "defender": "",
+                  "dmg": 0, "hp": 0}
+    else:
+        fields = {"attacker": event["attacker"], "defender": event["defender"],
+                  "dmg": event["dmg"], "hp": event["defender_hp"], "rounds": 0}
+    try:
+        return template.format(**fields)
+    except (KeyError, IndexError, ValueError):
+        return template
+
+
+class DungeonMaster:
+    """Narrates combat events through a cached, batching background worker.
+
+    Attributes:
+        backend: The narration backend.
+        cache_size: Maximum number of cached narration templates.
+        batch_size: Maximum keys sent to the backend in one batch.
+        max_pending: Maximum events waiting for the backend; later misses
+            are dropped rather than blocking the caller.
+        hits: Events narrated from the cache.
+        misses: Events that had to wait for the backend.
+        dropped: Events dropped because too many were waiting.
+    """
+
+    def __init__(self, backend: Optional[NarrationBackend] = None,
+                 cache_size: int = 1024, batch_size: int = 16,
+                 flush_interval: float = 0.02, max_pending: int = 4096,
+                 on_narration: Optional[Callable[[Narration], None]] = None) -> None:
+        """Start the background worker.
+
+        Args:
+            backend: The narration backend; defaults to `TemplateBackend`.
+            cache_size: Maximum number of cached narration templates.
+            batch_size: Maximum keys per backend call.
+            flush_interval: Seconds the worker waits to fill a batch.
+            max_pending: Maximum events waiting for the backend.
+            on_narration: Called from the submitting or worker thread
+                with each narration, in addition to `drain`.
+        """
+        self.backend: NarrationBackend = backend or TemplateBackend()
+        self.cache_size: int = cache_size
+        self.batch_size: int = batch_size
+        self.max_pending: int = max_pending
+        self.hits: int = 0
+        self.misses: int = 0
+        self.dropped: int = 0
+        self._flush_interval = flush_interval
+        self._on_narration = on_narration
+        self._cache: OrderedDict[str, str] = OrderedDict()
+        # Keys requested from the backend, with the events waiting on them
+        self._waiting: dict[str, list[tuple[int, LogEvent]]] = {}
+        self._requested: list[str] = []
+        self._pending = 0
+        self._ready: list[Narration] = []
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._idle = threading.Condition(self._lock)
+        self._closed = False
+        self._thread = threading.Thread(target=self._work, daemon=True)
+        self._thread.start()
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of narrated events served from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def attach(self, combat: Combat) -> Callable[[], None]:
+        """Narrate every attack and round-cap event of a combat.
+
+        Args:
+            combat: The combat to narrate.
+
+        Returns:
+            A function that stops narrating the combat.
+        """
+        stops = [
+            combat.subscribe("on_attack", lambda _, event: self.submit(event)),
+            combat.subscribe("on_max_rounds", lambda c, _: self.submit(c.log[-1])),
+        ]
+
+        def detach() -> None:
+            for stop in stops:
+                stop()
+
+        return detach
+
+    def submit(self, event: LogEvent) -> None:
+        """Queue an event for narration without waiting for the backend.
+
+        Args:
+            event: An event from a combat log.
+        """
+        key = event_key(event)
+        with self._lock:
+            seq = self._seq
+            self._seq += 1
+            template = self._cache.get(key)
+            if template is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                narration = Narration(seq, render(template, event))
+                self._ready.append(narration)
+            else:
+                if self._pending >= self.max_pending:
+                    self.dropped += 1
+                    return
+                self.misses += 1
+                self._pending += 1
+                waiting = self._waiting.get(key)
+                if waiting is None:
+                    self._waiting[key] = [(seq, event)]
+                    self._requested.append(key)
+                    self._wake.notify()
+                else:
+                    waiting.append((seq, event))
+                return
+        if self._on_narration is not None:
+            self._on_narration(narration)
+
+    def _work(self) -> None:
+        while True:
+            with self._lock:
+                while not self._requested and not self._closed:
+                    self._wake.wait()
+                if not self._requested:
+                    return
+                # Give a batch a moment to fill up unless it already has
+                deadline = time.monotonic() + self._flush_interval
+                while len(self._requested) < self.batch_size and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._wake.wait(remaining)
+                keys = self._requested[:self.batch_size]
+                del self._requested[:self.batch_size]
+
+            failed = False
+            try:
+                templates = self.backend.narrate_batch(keys)
+            except Exception as exc:  # keep narrating later batches
+                templates = [f"(narration unavailable: {exc})"] * len(keys)
+                failed = True
+            if not failed and len(templates) != len(keys):
+                # A reply of the wrong length cannot be matched to the keys
+                templates = [f"(narration unavailable: expected {len(keys)} "
+                             f"templates, got {len(templates)})"] * len(keys)
+                failed = True
+
+            done: list[Narration] = []
+            with self._lock:
+                for key, template in zip(keys, templates):
+                    # A fallback only serves the events already waiting, so
+                    # later events with this key ask the backend again
+                    if not failed:
+                        self._cache[key] = template
+                        self._cache.move_to_end(key)
+                    for seq, event in self._waiting.pop(key, []):
+                        done.append(Narration(seq, render(template, event)))
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+                self._pending -= len(done)
+                self._ready.extend(done)
+                if not self._pending:
+                    self._idle.notify_all()
+            if self._on_narration is not None:
+                for narration in done:
+                    self._on_narration(narration)
+
+    def drain(self) -> list[Narration]:
+        """Take every narration produced so far, in event order.
+
+        Returns:
+            Ready narrations sorted by sequence number. Events still
+            waiting for the backend are returned by a later call.
+        """
+        with self._lock:
+            ready, self._ready = self._ready, []
+        return sorted(ready)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued event has been narrated.
+
+        Args:
+            timeout: Maximum seconds to wait; None waits indefinitely.
+
+        Returns:
+            True if nothing is left waiting for the backend.
+        """
+        with self._lock:
+            return self._idle.wait_for(lambda: not self._pending, timeout)
+
+    def close(self) -> None:
+        """Narrate what is queued and stop the worker."""
+        with self._lock:
+            self._closed = True
+            self._wake.notify()
+        self._thread.join()
+
+    def __enter__(self) -> DungeonMaster:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
@@ -0,0 +1,200 @@
+"""Cached outcome distributions for repeated matchups.
+
+The same matchups come up again and again, such as a character fighting
+freshly rolled goblins whose stats span a narrow range. `OutcomeCache`
+keys each matchup by its canonical combat parameters (hp, attack,
+defense and weapon of both sides, plus ``max_rounds``) and keeps the
+exact distribution of how the fight ends, from `solve_outcomes`, in a
+size-bounded LRU cache. Callers that only need the result of a fight
+sample an end state from it instead of playing the rounds out.
+
+Sampled fights produce no per-round log, so `resolve` plays the fight
+normally when the cache is disabled, the combat keeps a log, or an
+observer is subscribed. The distributions model `Character` against
+`Enemy`; fights involving subclasses are always played out too.
+
+Examples:
+    >>> from dndgame import dice
+    >>> from dndgame.character import Character
+    >>> from dndgame.combat import Combat
+    >>> from dndgame.enemy import Enemy
+    >>> from dndgame.outcomes import OutcomeCache
+    >>> hero, goblin = Character("Hero", "Human", 10), Enemy("Goblin", "Goblin", 7)
+    >>> hero.hp, hero.attack, hero.defense = 12, 2, 10
+    >>> goblin.hp, goblin.attack, goblin.defense = 7, 0, 15
+    >>> cache = OutcomeCache(maxsize=128)
+    >>> dice.seed(1)
+    >>> winner, log = cache.resolve(Combat(hero, goblin, keep_log=False))
+    >>> winner in ("Player", "Enemy"), cache.misses, cache.hits
+    (True, 1, 0)
+"""
+
+from __future__ import annotations
+
+import random
+from collections import OrderedDict
+from itertools import accumulate
+from typing import List, NamedTuple, Optional, Tuple
+
+from dndgame import metrics
+from dndgame.character import Character
+from dndgame.combat import Combat, LogEvent
+from dndgame.enemy import Enemy
+from dndgame.solver import player_wins, solve_outcomes
+from dndgame.weapons import Weapon
+
+
+# hp, attack, defense and weapon of the player, then of the enemy, then max_rounds
+MatchupKey = Tuple[int, int, int, Optional[Weapon], int, int, int, Optional[Weapon], int]
+
+
+def matchup_key(combat: Combat) -> MatchupKey:
+    """Get the canonical parameters of a prepared combat.
+
+    Args:
+        combat: The combat, before `Combat.run` changes any hit points.
+
+    Returns:
+        The key its outcome distribution is cached under.
+    """
+    player, enemy = combat.player, combat.enemy
+    return (player.hp, player.attack, player.defense, player.weapon,
+            enemy.hp, enemy.attack, enemy.defense, enemy.weapon,
+            combat.max_rounds)
+
+
+class Outcome(NamedTuple):
+    """How a fight ended.
+
+    Attributes:
+        rounds: Rounds played.
+        player_hp: The player's hit points at the end.
+        enemy_hp: The enemy's hit points at the end.
+    """
+
+    rounds: int
+    player_hp: int
+    enemy_hp: int
+
+
+class OutcomeDistribution:
+    """The exact distribution of a matchup's end states.
+
+    Attributes:
+        outcomes: Every reachable end state.
+        cum_weights: Cumulative probabilities matching outcomes.
+        player_win: Probability that the player wins.
+    """
+
+    def __init__(self, key: MatchupKey) -> None:
+        """Solve a matchup.
+
+        Args:
+            key: The matchup's canonical parameters, as from `matchup_key`.
+        """
+        (player_hp, player_attack, player_defense, player_weapon,
+         enemy_hp, enemy_attack, enemy_defense, enemy_weapon, max_rounds) = key
+        ends = solve_outcomes(player_hp, player_attack, player_defense,
+                              enemy_hp, enemy_attack, enemy_defense, max_rounds,
+                              player_weapon, enemy_weapon)
+        self.outcomes: list[Outcome] = [Outcome(*end) for end, _ in ends]
+        self.cum_weights: list[float] = list(accumulate(p for _, p in ends))
+        self.player_win: float = sum(
+            p for (rounds, p_hp, e_hp), p in ends
+            if player_wins(rounds, p_hp, e_hp, max_rounds))
+
+    def sample(self) -> Outcome:
+        """Draw an end state using the `random` module, as the dice do."""
+        return random.choices(self.outcomes, cum_weights=self.cum_weights)[0]
+
+    def sample_winner(self) -> str:
+        """Draw just the winner, "Player" or "Enemy"."""
+        return "Player" if random.random() < self.player_win else "Enemy"
+
+
+class OutcomeCache:
+    """LRU cache of outcome distributions keyed by matchup.
+
+    Attributes:
+        maxsize: Maximum number of cached matchups.
+        enabled: When False, `resolve` always plays fights round by round.
+        hits: Lookups answered from the cache.
+        misses: Lookups that had to solve a matchup.
+    """
+
+    def __init__(self, maxsize: int = 1024, enabled: bool = True) -> None:
+        """Create an empty cache.
+
+        Args:
+            maxsize: Maximum number of cached matchups.
+            enabled: Whether `resolve` may sample outcomes.
+        """
+        self.maxsize: int = maxsize
+        self.enabled: bool = enabled
+        self.hits: int = 0
+        self.misses: int = 0
+        self._entries: OrderedDict[MatchupKey, OutcomeDistribution] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def get(self, key: MatchupKey) -> OutcomeDistribution:
+        """Get a matchup's distribution, solving it on a miss.
+
+        Args:
+            key: The matchup's canonical parameters.
+
+        Returns:
+            The matchup's `OutcomeDistribution`.
+        """
+        distribution = self._entries.get(key)
+        if distribution is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            metrics.OUTCOME_CACHE_HITS.inc()
+            return distribution
+        self.misses += 1
+        metrics.OUTCOME_CACHE_MISSES.inc()
+        distribution = OutcomeDistribution(key)
+        self._entries[key] = distribution
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return distribution
+
+    def resolve(self, combat: Combat) -> Tuple[str, List[LogEvent]]:
+        """Settle a combat, sampling its end state when that is allowed.
+
+        Sampling applies the end state's hit points and round count to the
+        combat and its combatants and finishes it like `Combat.run`, so the
+        log holds only the ``max_rounds_reached`` event, if any. The fight
+        is played with `Combat.run` instead when the cache is disabled, the
+        combat keeps a log or has observers, or the combatants are not
+        exactly a `Character` and an `Enemy`.
+
+        Args:
+            combat: The combat to settle.
+
+        Returns:
+            ``(winner, log)`` as returned by `Combat.run`.
+        """
+        if (not self.enabled or combat.keep_log or combat.observed
+                or type(combat.player) is not Character
+                or type(combat.enemy) is not Enemy):
+            return combat.run()
+        outcome = self.get(matchup_key(combat)).sample()
+        combat.start()
+        combat.player.hp, combat.enemy.hp = outcome.player_hp, outcome.enemy_hp
+        combat.rounds = outcome.rounds
+        return combat.finish(), combat.log
+
+    def clear(self) -> None:
+        """Drop every cached distribution and reset the hit and miss counts."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
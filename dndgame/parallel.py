@@ -0,0 +1,216 @@
+"""Parallel combat simulation with shared-memory aggregation.
+
+Worker processes run `Combat` fights and add their results straight into
+a `multiprocessing.shared_memory` block instead of sending logs back to
+the parent. Each worker owns one shard of the block, so no locks are
+needed; the parent sums the shards in place to build progress snapshots
+while the job runs and the final result once every worker has finished.
+
+Shard layout (int64 counters):
+    [player_wins, enemy_wins,
+     rounds histogram (0..max_rounds),
+     damage histogram (0..max_damage, last bin collects anything higher)]
+
+Examples:
+    >>> from dndgame.character import Character
+    >>> from dndgame.enemy import Enemy
+    >>> from dndgame.parallel import simulate
+    >>> hero, goblin = Character("Hero", "Human", 10), Enemy("Goblin", "Goblin", 7)
+    >>> hero.roll_stats(); goblin.roll_stats(); goblin.apply_racial_bonuses()
+    >>> result = simulate(hero, goblin, fights=200, workers=2)
+    >>> result.fights
+    200
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import time
+from multiprocessing.shared_memory import SharedMemory
+from typing import Iterator, NamedTuple
+
+from dndgame import dice
+from dndgame.combat import Combat
+from dndgame.entity import Entity
+
+
+# Counters at the start of every shard
+_PLAYER_WINS, _ENEMY_WINS, _HEADER = 0, 1, 2
+_ITEM_SIZE = 8
+
+
+class SimulationSnapshot(NamedTuple):
+    """Aggregated results of a simulation, possibly still in progress.
+
+    Attributes:
+        fights: Fights completed so far.
+        total: Fights requested.
+        player_wins: Fights won by the player.
+        enemy_wins: Fights won by the enemy.
+        rounds_histogram: Number of fights lasting each number of rounds.
+        damage_histogram: Number of attacks dealing each amount of damage.
+        done: True once every worker has finished.
+    """
+
+    fights: int
+    total: int
+    player_wins: int
+    enemy_wins: int
+    rounds_histogram: list[int]
+    damage_histogram: list[int]
+    done: bool
+
+    @property
+    def win_rate(self) -> float:
+        """Fraction of completed fights won by the player."""
+        return self.player_wins / self.fights if self.fights else 0.0
+
+
+def _worker(
+    shm_name: str,
+    shard: int,
+    shard_len: int,
+    player: Entity,
+    enemy: Entity,
+    fights: int,
+    max_rounds: int,
+    max_damage: int,
+    seed: int,
+) -> None:
+    """Run fights and accumulate their results into one shard."""
+    dice.set_verbose(False)
+    dice.set_buffered(True)
+    dice.seed(seed)
+
+    shm = SharedMemory(name=shm_name)
+    view = shm.buf.cast("q")
+    base = shard * shard_len
+    rounds_base = base + _HEADER
+    damage_base = rounds_base + max_rounds + 1
+    player_hp, enemy_hp = player.hp, enemy.hp
+    combat = Combat(player, enemy, max_rounds, keep_log=False)
+    combat.damage_counts = damage = view[damage_base:damage_base + max_damage + 1]
+    try:
+        for _ in range(fights):
+            player.hp, enemy.hp = player_hp, enemy_hp
+            winner, _ = combat.run()
+            view[rounds_base + combat.rounds] += 1
+            # Snapshots count fights from the win counters, so record the win
+            # last; a fight in progress may already show rounds and damage
+            view[base + (_PLAYER_WINS if winner == "Player" else _ENEMY_WINS)] += 1
+    finally:
+        damage.release()
+        view.release()
+        shm.close()
+
+
+def _merge(view: memoryview, shards: int, shard_len: int) -> list[int]:
+    """Sum the shards column by column, reading the shared block in place."""
+    return [sum(column) for column in
+            zip(*(view[s * shard_len:(s + 1) * shard_len] for s in range(shards)))]
+
+
+def simulate_stream(
+    player: Entity,
+    enemy: Entity,
+    fights: int,
+    workers: int | None = None,
+    max_rounds: int = 300,
+    max_damage: int = 64,
+    seed: int = 0,
+    interval: float = 0.1,
+) -> Iterator[SimulationSnapshot]:
+    """Run fights in parallel and stream progress snapshots.
+
+    Every fight starts from the entities' current hit points.
+
+    Args:
+        player: The player entity; each worker fights with its own copy.
+        enemy: The enemy entity; each worker fights with its own copy.
+        fights: Total number of fights to run.
+        workers: Number of worker processes; None uses the CPU count.
+        max_rounds: Maximum rounds per fight.
+        max_damage: Largest damage value with its own histogram bin.
+        seed: Base seed; worker i seeds its dice with ``seed + i``.
+        interval: Seconds between progress snapshots.
+
+    Yields:
+        Snapshots while the workers run, ending with a final snapshot
+        whose ``done`` flag is set.
+    """
+    workers = max(1, min(workers or os.cpu_count() or 1, fights or 1))
+    shard_len = _HEADER + (max_rounds + 1) + (max_damage + 1)
+    size = workers * shard_len * _ITEM_SIZE
+    shm = SharedMemory(create=True, size=size)
+    shm.buf[:size] = bytes(size)
+    view = shm.buf.cast("q")
+
+    def snapshot(done: bool) -> SimulationSnapshot:
+        merged = _merge(view, workers, shard_len)
+        rounds_end = _HEADER + max_rounds + 1
+        player_wins, enemy_wins = merged[_PLAYER_WINS], merged[_ENEMY_WINS]
+        return SimulationSnapshot(
+            player_wins + enemy_wins, fights, player_wins, enemy_wins,
+            merged[_HEADER:rounds_end], merged[rounds_end:], done,
+        )
+
+    processes = []
+    try:
+        for shard in range(workers):
+            share = fights // workers + (1 if shard < fights % workers else 0)
+            process = multiprocessing.Process(
+                target=_worker,
+                args=(shm.name, shard, shard_len, player, enemy, share,
+                      max_rounds, max_damage, seed + shard),
+            )
+            process.start()
+            processes.append(process)
+
+        while any(p.is_alive() for p in processes):
+            yield snapshot(False)
+            time.sleep(interval)
+        for process in processes:
+            process.join()
+            if process.exitcode != 0:
+                raise RuntimeError(f"Simulation worker exited with code {process.exitcode}")
+        yield snapshot(True)
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        view.release()
+        shm.close()
+        shm.unlink()
+
+
+def simulate(
+    player: Entity,
+    enemy: Entity,
+    fights: int,
+    workers: int | None = None,
+    max_rounds: int = 300,
+    max_damage: int = 64,
+    seed: int = 0,
+) -> SimulationSnapshot:
+    """Run fights in parallel and return the final aggregated results.
+
+    Args:
+        player: The player entity; each worker fights with its own copy.
+        enemy: The enemy entity; each worker fights with its own copy.
+        fights: Total number of fights to run.
+        workers: Number of worker processes; None uses the CPU count.
+        max_rounds: Maximum rounds per fight.
+        max_damage: Largest damage value with its own histogram bin.
+        seed: Base seed; worker i seeds its dice with ``seed + i``.
+
+    Returns:
+        The final snapshot.
+    """
+    final = None
+    for final in simulate_stream(player, enemy, fights, workers, max_rounds,
+                                 max_damage, seed):
+        pass
+    assert final is not None
+    return final
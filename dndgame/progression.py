@@ -0,0 +1,127 @@
+"""Experience and level progression tables.
+
+Holds the ability modifier formula, the precomputed experience thresholds
+and per-level bonuses used by `Character.gain_experience`, plus a batch API that applies experience to
+many characters at once for progression simulations.
+
+Examples:
+    >>> from dndgame.progression import level_for_experience, max_hp_for_level
+    >>> level_for_experience(0), level_for_experience(300), level_for_experience(899)
+    (1, 2, 2)
+    >>> max_hp_for_level(10, 2, 3)
+    28
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from typing import TYPE_CHECKING, Sequence
+
+if TYPE_CHECKING:
+    from dndgame.character import Character
+
+
+# Total experience needed to reach each level, starting at level 1
+XP_THRESHOLDS: tuple[int, ...] = (
+    0, 300, 900, 2700, 6500, 14000, 23000, 34000, 48000, 64000,
+    85000, 100000, 120000, 140000, 165000, 195000, 225000, 265000, 305000, 355000,
+)
+MAX_LEVEL = len(XP_THRESHOLDS)
+
+# Hit points gained per level before the Constitution modifier
+HP_PER_LEVEL = 6
+
+# Attack bonus over level 1, growing every four levels
+ATTACK_BONUS: tuple[int, ...] = tuple((level - 1) // 4 for level in range(1, MAX_LEVEL + 1))
+
+
+def ability_modifier(score: int) -> int:
+    """Calculate the modifier of an ability score.
+
+    Args:
+        score: The ability score.
+
+    Returns:
+        The ability modifier (positive or negative integer).
+    """
+    return (score - 10) // 2
+
+
+def level_for_experience(experience: int) -> int:
+    """Get the level reached with a given amount of experience.
+
+    Args:
+        experience: Total experience points.
+
+    Returns:
+        The level, from 1 to MAX_LEVEL.
+    """
+    return max(1, bisect_right(XP_THRESHOLDS, experience))
+
+
+def max_hp_for_level(base_hp: int, con_modifier: int, level: int) -> int:
+    """Calculate maximum hit points at a level.
+
+    Every level after the first adds HP_PER_LEVEL plus the Constitution
+    modifier, but always at least 1.
+
+    Args:
+        base_hp: Base hit points before modifiers.
+        con_modifier: The Constitution modifier.
+        level: Character level.
+
+    Returns:
+        The maximum hit points.
+    """
+    return base_hp + con_modifier + (level - 1) * max(1, HP_PER_LEVEL + con_modifier)
+
+
+def attack_bonus_for_level(level: int) -> int:
+    """Get the attack bonus a level adds over level 1.
+
+    Args:
+        level: Character level.
+
+    Returns:
+        The extra attack bonus.
+    """
+    return ATTACK_BONUS[level - 1]
+
+
+def apply_experience(
+    characters: Sequence[Character], amounts: int | Sequence[int]
+) -> list[int]:
+    """Award experience to many characters at once.
+
+    Characters whose level does not change only get their experience
+    total updated; derived stats are recomputed for the rest.
+
+    Args:
+        characters: Characters to award experience to.
+        amounts: One amount for everyone, or one amount per character.
+
+    Returns:
+        Levels gained by each character.
+
+    Raises:
+        ValueError: If amounts has a different length than characters.
+    """
+    if isinstance(amounts, int):
+        amounts = [amounts] * len(characters)
+    elif len(amounts) != len(characters):
+        raise ValueError("amounts must match the number of characters")
+
+    thresholds = XP_THRESHOLDS
+    gained: list[int] = []
+    for character, amount in zip(characters, amounts):
+        experience = character.experience + amount
+        character.experience = experience
+        level = character.level
+        # Most awards stay within the current level
+        if level < MAX_LEVEL and experience >= thresholds[level]:
+            new_level = bisect_right(thresholds, experience)
+            character.level_up(new_level)
+            gained.append(new_level - level)
+        else:
+            gained.append(0)
+    return gained
@@ -0,0 +1,238 @@
+"""Deterministic combat replays with checkpointed seeking.
+
+Recording a `Combat` captures both entities as they were before the
+fight, the RNG state at the start, whether dice were buffered (see
+`dice.set_buffered`), and a checkpoint of both hit point
+totals plus the RNG state every few rounds. Any round can then be
+reached by restoring the nearest earlier checkpoint and stepping forward
+from there instead of replaying the fight from round 1.
+
+Examples:
+    >>> from dndgame.character import Character
+    >>> from dndgame.enemy import Enemy
+    >>> from dndgame.combat import Combat
+    >>> from dndgame.replay import record, replay, seek
+    >>> hero, goblin = Character("Hero", "Human", 10), Enemy("Goblin", "Goblin", 7)
+    >>> hero.roll_stats(); goblin.roll_stats()
+    >>> rec = record(Combat(hero, goblin), checkpoint_every=4)
+    >>> replay(rec) == (rec.winner, rec.log)
+    True
+    >>> len(seek(rec, 1).log)
+    1
+"""
+
+from __future__ import annotations
+
+import copy
+import importlib
+from typing import Any, List, NamedTuple, Optional, Tuple
+
+from dndgame import dice
+from dndgame.combat import Combat, LogEvent
+from dndgame.entity import Entity
+
+
+class EntitySnapshot(NamedTuple):
+    """The class and attributes of an entity at a point in time.
+
+    Attributes:
+        cls: Import path of the entity's class as ``module:qualname``.
+        attrs: Deep copy of the entity's instance attributes.
+    """
+
+    cls: str
+    attrs: dict[str, Any]
+
+    @classmethod
+    def capture(cls, entity: Entity) -> EntitySnapshot:
+        """Snapshot an entity.
+
+        Args:
+            entity: The entity to capture.
+
+        Returns:
+            A snapshot independent of later changes to the entity.
+        """
+        kind = type(entity)
+        return cls(f"{kind.__module__}:{kind.__qualname__}", copy.deepcopy(vars(entity)))
+
+    def restore(self) -> Entity:
+        """Rebuild a fresh entity from this snapshot.
+
+        Returns:
+            A new instance of the captured class with the captured attributes.
+        """
+        module_name, _, qualname = self.cls.partition(":")
+        kind: Any = importlib.import_module(module_name)
+        for part in qualname.split("."):
+            kind = getattr(kind, part)
+        entity: Entity = kind.__new__(kind)
+        entity.__dict__.update(copy.deepcopy(self.attrs))
+        return entity
+
+
+class Checkpoint(NamedTuple):
+    """Combat state at the start of a round.
+
+    Attributes:
+        round: Number of rounds already played.
+        player_hp: The player's hit points.
+        enemy_hp: The enemy's hit points.
+        rng_state: Dice RNG state from `dice.getstate`.
+    """
+
+    round: int
+    player_hp: int
+    enemy_hp: int
+    rng_state: Any
+
+
+class Replay(NamedTuple):
+    """A recorded combat.
+
+    Attributes:
+        player: The player before the fight.
+        enemy: The enemy before the fight.
+        max_rounds: The combat's round cap.
+        checkpoints: Checkpoints in round order, starting with round 0.
+        log: The full combat log.
+        winner: "Player" or "Enemy".
+        buffered: Whether buffered dice were on during the fight; seeking
+            and replaying switch to the same mode.
+    """
+
+    player: EntitySnapshot
+    enemy: EntitySnapshot
+    max_rounds: int
+    checkpoints: Tuple[Checkpoint, ...]
+    log: List[LogEvent]
+    winner: str
+    buffered: bool = False
+
+
+def _checkpoint(combat: Combat) -> Checkpoint:
+    return Checkpoint(combat.rounds, combat.player.hp, combat.enemy.hp, dice.getstate())
+
+
+def record(combat: Combat, checkpoint_every: int = 16) -> Replay:
+    """Run a combat while recording a replay of it.
+
+    Args:
+        combat: The combat to run; its entities are captured before it starts.
+        checkpoint_every: Rounds between checkpoints.
+
+    Returns:
+        The recorded replay.
+
+    Raises:
+        ValueError: If checkpoint_every is not positive.
+    """
+    if checkpoint_every < 1:
+        raise ValueError("checkpoint_every must be positive")
+    player = EntitySnapshot.capture(combat.player)
+    enemy = EntitySnapshot.capture(combat.enemy)
+    checkpoints: List[Checkpoint] = []
+
+    combat.start()
+    while not combat.finished():
+        if combat.rounds % checkpoint_every == 0:
+            checkpoints.append(_checkpoint(combat))
+        combat.step()
+    if not checkpoints:
+        checkpoints.append(_checkpoint(combat))
+    winner = combat.finish()
+    return Replay(player, enemy, combat.max_rounds, tuple(checkpoints),
+                  list(combat.log), winner, dice.is_buffered())
+
+
+def seek(rec: Replay, round_number: int, keep_rng: bool = False) -> Combat:
+    """Rebuild a recorded combat as it stood after a given round.
+
+    Restores the latest checkpoint at or before ``round_number`` and steps
+    forward from it.
+
+    Args:
+        rec: The replay to seek in.
+        round_number: Rounds to have played, from 0 to the fight's length.
+        keep_rng: Leave the RNG where the recorded fight had it after
+            ``round_number``, and the dice mode as recorded, so the
+            returned combat continues exactly as recorded. By default the
+            caller's RNG state and dice mode are restored.
+
+    Returns:
+        A combat holding fresh entities, with ``log`` covering the played
+        rounds, ready to be stepped further.
+
+    Raises:
+        ValueError: If round_number is outside the recorded fight.
+    """
+    length = sum(1 for event in rec.log if "defender_hp" in event)
+    if not 0 <= round_number <= length:
+        raise ValueError(f"Round {round_number} not in recorded fight (0-{length})")
+    checkpoint = max(
+        (cp for cp in rec.checkpoints if cp.round <= round_number),
+        key=lambda cp: cp.round,
+    )
+
+    combat = Combat(rec.player.restore(), rec.enemy.restore(), rec.max_rounds)
+    combat.player.hp = checkpoint.player_hp
+    combat.enemy.hp = checkpoint.enemy_hp
+    combat.rounds = checkpoint.round
+    combat.log = list(rec.log[:checkpoint.round])
+    # Turns alternate every round until someone dies
+    if checkpoint.round % 2:
+        combat.attacker, combat.defender = combat.enemy, combat.player
+
+    saved, buffered = dice.getstate(), dice.is_buffered()
+    dice.setstate(checkpoint.rng_state)
+    dice.set_buffered(rec.buffered)
+    try:
+        while combat.rounds < round_number:
+            combat.step()
+    finally:
+        if not keep_rng:
+            dice.setstate(saved)
+            dice.set_buffered(buffered)
+    return combat
+
+
+def replay(rec: Replay) -> Tuple[str, List[LogEvent]]:
+    """Replay a recorded combat from the start.
+
+    Args:
+        rec: The replay to run.
+
+    Returns:
+        The (winner, log) pair produced by the replayed fight.
+    """
+    saved, buffered = dice.getstate(), dice.is_buffered()
+    try:
+        combat = seek(rec, 0, keep_rng=True)
+        while not combat.finished():
+            combat.step()
+    finally:
+        dice.setstate(saved)
+        dice.set_buffered(buffered)
+    return combat.finish(record_metrics=False), combat.log
+
+
+def diff(
+    a: Replay, b: Replay
+) -> List[Tuple[int, Optional[LogEvent], Optional[LogEvent]]]:
+    """Compare the logs of two replays.
+
+    Args:
+        a: The first replay.
+        b: The second replay.
+
+    Returns:
+        ``(index, event_a, event_b)`` for every log position where the
+        events differ, with None for events missing from the shorter log.
+    """
+    differences: List[Tuple[int, Optional[LogEvent], Optional[LogEvent]]] = []
+    for i in range(max(len(a.log), len(b.log))):
+        event_a = a.log[i] if i < len(a.log) else None
+        event_b = b.log[i] if i < len(b.log) else None
+        if event_a != event_b:
+            differences.append((i, event_a, event_b))
+    return differences
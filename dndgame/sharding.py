@@ -0,0 +1,499 @@
+"""Game sessions sharded across worker processes.
+
+`ShardedSessions` runs player sessions (a `Character` and its
+`Adventure`) in worker processes and routes every session to a worker
+with a consistent-hash `HashRing`, so adding or draining a worker only
+moves the sessions whose ring position changes. A moving session is
+exported as a `SessionSnapshot` (the character with its stats and hp,
+the adventure progress and the session's own dice RNG state) and resumed
+on its new worker exactly where it left off: a migrated session rolls
+the same dice it would have rolled without the move.
+
+Each session keeps a private RNG state that its worker swaps in with
+`dice.setstate` while it plays the session's commands. `drive_load` is a
+local load driver measuring throughput for a given worker count.
+
+Examples:
+    >>> from dndgame.sharding import ShardedSessions
+    >>> with ShardedSessions(workers=2, seed=1) as cluster:
+    ...     cluster.open("alice")
+    ...     cluster.play("alice", "quest")
+    ...     _ = cluster.add_worker()
+    ...     cluster.play("alice", "status")["completed"]
+    'goblin_ambush'
+    1
+"""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+import multiprocessing
+import os
+import sys
+import time
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from types import TracebackType
+from typing import Any, Iterable, NamedTuple, Optional, Type
+
+from dndgame import dice
+from dndgame.adventure import Adventure
+from dndgame.character import Character
+from dndgame.combat import Combat
+from dndgame.enemy import Enemy
+from dndgame.replay import EntitySnapshot
+
+# Commands a session understands
+COMMANDS = ("fight", "quest", "status")
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Consistent hashing of keys onto nodes with virtual replicas.
+
+    Attributes:
+        replicas: Ring positions per node.
+    """
+
+    def __init__(self, nodes: Iterable[str] = (), replicas: int = 64) -> None:
+        """Build a ring.
+
+        Args:
+            nodes: Initial node names.
+            replicas: Ring positions per node; more gives a more even spread.
+        """
+        self.replicas: int = replicas
+        self._points: list[int] = []
+        self._owners: list[str] = []
+        for node in nodes:
+            self.add(node)
+
+    @property
+    def nodes(self) -> list[str]:
+        """The node names on the ring, sorted."""
+        return sorted(set(self._owners))
+
+    def add(self, node: str) -> None:
+        """Place a node on the ring.
+
+        Raises:
+            ValueError: If the node is already on the ring.
+        """
+        if node in self._owners:
+            raise ValueError(f"Node '{node}' already on the ring")
+        for replica in range(self.replicas):
+            point = _hash(f"{node}#{replica}")
+            index = bisect.bisect(self._points, point)
+            self._points.insert(index, point)
+            self._owners.insert(index, node)
+
+    def remove(self, node: str) -> None:
+        """Take a node off the ring.
+
+        Raises:
+            ValueError: If the node is not on the ring.
+        """
+        if node not in self._owners:
+            raise ValueError(f"Node '{node}' not on the ring")
+        kept = [(p, o) for p, o in zip(self._points, self._owners) if o != node]
+        self._points = [p for p, _ in kept]
+        self._owners = [o for _, o in kept]
+
+    def node_for(self, key: str) -> str:
+        """Get the node owning a key.
+
+        Raises:
+            LookupError: If the ring is empty.
+        """
+        if not self._points:
+            raise LookupError("The ring has no nodes")
+        index = bisect.bisect(self._points, _hash(key)) % len(self._points)
+        return self._owners[index]
+
+
+class SessionSnapshot(NamedTuple):
+    """Everything needed to resume a session on another worker.
+
+    Attributes:
+        session_id: The session's id.
+        player: The character, including stats, hp, level and weapon.
+        adventure: The adventure's state from `Adventure.export_state`.
+        rng_state: The session's dice RNG state from `dice.getstate`.
+    """
+
+    session_id: str
+    player: EntitySnapshot
+    adventure: dict[str, Any]
+    rng_state: Any
+
+
+class _Session:
+    """A session living in a worker process."""
+
+    def __init__(self, session_id: str, player: Character, adventure: Adventure,
+                 rng_state: Any) -> None:
+        self.session_id = session_id
+        self.player = player
+        self.adventure = adventure
+        self.rng_state = rng_state
+
+    @classmethod
+    def create(cls, session_id: str, name: str, race: str, seed: int) -> _Session:
+        dice.seed(_hash(f"{seed}:{session_id}"))
+        player = Character(name, race, 10)
+        player.roll_stats()
+        player.apply_racial_bonuses()
+        adventure = Adventure(f"{name}'s adventure", "A local campaign.", player)
+        return cls(session_id, player, adventure, dice.getstate())
+
+    @classmethod
+    def resume(cls, snapshot: SessionSnapshot) -> _Session:
+        player = snapshot.player.restore()
+        assert isinstance(player, Character)
+        adventure = Adventure.restore(snapshot.adventure, player)
+        return cls(snapshot.session_id, player, adventure, snapshot.rng_state)
+
+    def snapshot(self) -> SessionSnapshot:
+        return SessionSnapshot(
+            self.session_id, EntitySnapshot.capture(self.player),
+            self.adventure.export_state(), self.rng_state,
+        )
+
+    def play(self, command: str) -> Any:
+        dice.setstate(self.rng_state)
+        try:
+            if command == "fight":
+                player = self.player
+                if not player.alive():
+                    player.hp = player.max_hp
+                goblin = Enemy("Goblin", "Goblin", 7)
+                goblin.roll_stats()
+                goblin.apply_racial_bonuses()
+                winner, _ = Combat(player, goblin, keep_log=False).run()
+                if winner == "Player":
+                    player.gain_experience(25)
+                return winner
+            if command == "quest":
+                available = self.adventure.get_available_encounters_list()
+                if not available:
+                    return None
+                self.adventure.complete_encounter(available[0])
+                return available[0]
+            if command == "status":
+                player = self.player
+                return {"level": player.level, "hp": player.hp,
+                        "experience": player.experience,
+                        "completed": len(self.adventure.completed_encounters)}
+            raise ValueError(f"Unknown command '{command}'")
+        finally:
+            self.rng_state = dice.getstate()
+
+
+def _serve(conn: Connection, seed: int) -> None:
+    """Worker process main loop: answer coordinator requests until told to stop."""
+    sys.stdout = open(os.devnull, "w")
+    dice.set_verbose(False)
+    sessions: dict[str, _Session] = {}
+    while True:
+        request, payload = conn.recv()
+        try:
+            if request == "stop":
+                conn.send(("ok", None))
+                return
+            if request == "open":
+                session_id, name, race = payload
+                sessions[session_id] = _Session.create(session_id, name, race, seed)
+                result: Any = None
+            elif request == "play":
+                result = [(index, sessions[sid].play(command))
+                          for index, sid, command in payload]
+            elif request == "export":
+                result = []
+                for sid in payload:
+                    session = sessions.pop(sid)
+                    result.append(session.snapshot())
+                    session.adventure.close()
+            elif request == "import":
+                for snapshot in payload:
+                    sessions[snapshot.session_id] = _Session.resume(snapshot)
+                result = None
+            else:
+                raise ValueError(f"Unknown request '{request}'")
+            conn.send(("ok", result))
+        except Exception as exc:
+            conn.send(("error", f"{type(exc).__name__}: {exc}"))
+
+
+class ShardedSessions:
+    """Coordinates sessions across worker processes.
+
+    Attributes:
+        seed: Base seed for new sessions' RNGs.
+        migrations: Sessions moved between workers so far.
+    """
+
+    def __init__(self, workers: int = 2, replicas: int = 64, seed: int = 0) -> None:
+        """Start the worker processes.
+
+        Args:
+            workers: Number of workers to start with.
+            replicas: Ring positions per worker.
+            seed: Base seed for new sessions' RNGs.
+
+        Raises:
+            ValueError: If workers is less than 1.
+        """
+        if workers < 1:
+            raise ValueError("workers must be positive")
+        self.seed: int = seed
+        self.migrations: int = 0
+        self._ring = HashRing(replicas=replicas)
+        self._workers: dict[str, tuple[BaseProcess, Connection]] = {}
+        self._owner: dict[str, str] = {}
+        self._next_worker = 0
+        for _ in range(workers):
+            self._start_worker()
+
+    @property
+    def workers(self) -> list[str]:
+        """Names of the running workers."""
+        return list(self._workers)
+
+    def sessions_on(self, worker: str) -> list[str]:
+        """Get the ids of the sessions a worker hosts."""
+        return [sid for sid, owner in self._owner.items() if owner == worker]
+
+    def _start_worker(self) -> str:
+        name = f"worker-{self._next_worker}"
+        self._next_worker += 1
+        parent, child = multiprocessing.Pipe()
+        process = multiprocessing.Process(target=_serve, args=(child, self.seed),
+                                          daemon=True)
+        process.start()
+        child.close()
+        self._workers[name] = (process, parent)
+        self._ring.add(name)
+        return name
+
+    def _send(self, worker: str, request: str, payload: Any) -> None:
+        self._workers[worker][1].send((request, payload))
+
+    def _receive_all(self, workers: Iterable[str]) -> dict[str, Any]:
+        """Read one reply from each worker, then raise the first failure.
+
+        Every reply is read even when one fails, so no worker is left with
+        a stale reply in its pipe.
+        """
+        replies: dict[str, Any] = {}
+        failure: Optional[str] = None
+        for worker in workers:
+            status, result = self._workers[worker][1].recv()
+            if status != "ok":
+                failure = failure or f"{worker} failed: {result}"
+            else:
+                replies[worker] = result
+        if failure is not None:
+            raise RuntimeError(failure)
+        return replies
+
+    def _call(self, worker: str, request: str, payload: Any) -> Any:
+        self._send(worker, request, payload)
+        return self._receive_all([worker])[worker]
+
+    def open(self, session_id: str, name: str = "Hero", race: str = "Human") -> None:
+        """Create a session on the worker that owns its id.
+
+        Raises:
+            ValueError: If the session already exists.
+        """
+        if session_id in self._owner:
+            raise ValueError(f"Session '{session_id}' already open")
+        worker = self._ring.node_for(session_id)
+        self._call(worker, "open", (session_id, name, race))
+        self._owner[session_id] = worker
+
+    def play(self, session_id: str, command: str) -> Any:
+        """Run one command for a session.
+
+        Args:
+            session_id: The session.
+            command: One of `COMMANDS`.
+
+        Returns:
+            The command's result.
+        """
+        return self.play_many([(session_id, command)])[0]
+
+    def play_many(self, requests: Iterable[tuple[str, str]]) -> list[Any]:
+        """Run commands for many sessions, all workers in parallel.
+
+        Commands for the same session run in the given order.
+
+        Args:
+            requests: ``(session_id, command)`` pairs.
+
+        Returns:
+            The results, in request order.
+
+        Raises:
+            KeyError: If a session is not open.
+            ValueError: If a command is unknown.
+        """
+        batches: dict[str, list[tuple[int, str, str]]] = {}
+        count = 0
+        for index, (session_id, command) in enumerate(requests):
+            if command not in COMMANDS:
+                raise ValueError(f"Unknown command '{command}'")
+            batches.setdefault(self._owner[session_id], []).append(
+                (index, session_id, command))
+            count = index + 1
+        for worker, batch in batches.items():
+            self._send(worker, "play", batch)
+        results: list[Any] = [None] * count
+        for replies in self._receive_all(batches).values():
+            for index, result in replies:
+                results[index] = result
+        return results
+
+    def _migrate(self, moves: dict[str, list[str]]) -> None:
+        """Move sessions from their current worker to their ring owner."""
+        for source, session_ids in moves.items():
+            snapshots: list[SessionSnapshot] = self._call(source, "export", session_ids)
+            targets: dict[str, list[SessionSnapshot]] = {}
+            for snapshot in snapshots:
+                targets.setdefault(self._ring.node_for(snapshot.session_id),
+                                   []).append(snapshot)
+            for target, batch in targets.items():
+                self._call(target, "import", batch)
+                for snapshot in batch:
+                    self._owner[snapshot.session_id] = target
+            self.migrations += len(snapshots)
+
+    def add_worker(self) -> str:
+        """Start a worker and move over the sessions the ring now gives it.
+
+        Returns:
+            The new worker's name.
+        """
+        name = self._start_worker()
+        moves: dict[str, list[str]] = {}
+        for session_id, owner in self._owner.items():
+            if self._ring.node_for(session_id) == name:
+                moves.setdefault(owner, []).append(session_id)
+        self._migrate(moves)
+        return name
+
+    def drain_worker(self, name: str) -> int:
+        """Move every session off a worker and stop it.
+
+        Args:
+            name: The worker to drain.
+
+        Returns:
+            Number of sessions moved.
+
+        Raises:
+            ValueError: If it is the last worker.
+        """
+        if len(self._workers) == 1:
+            raise ValueError("Cannot drain the last worker")
+        self._ring.remove(name)
+        session_ids = self.sessions_on(name)
+        self._migrate({name: session_ids} if session_ids else {})
+        self._stop(name)
+        return len(session_ids)
+
+    def snapshot(self, session_id: str) -> SessionSnapshot:
+        """Export a session's current state without moving it.
+
+        Args:
+            session_id: The session.
+
+        Returns:
+            The session's snapshot.
+        """
+        worker = self._owner[session_id]
+        (snapshot,) = self._call(worker, "export", [session_id])
+        assert isinstance(snapshot, SessionSnapshot)
+        self._call(worker, "import", [snapshot])
+        return snapshot
+
+    def _stop(self, name: str) -> None:
+        try:
+            self._call(name, "stop", None)
+        finally:
+            process, conn = self._workers.pop(name)
+            conn.close()
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+
+    def close(self) -> None:
+        """Stop every worker; open sessions are discarded."""
+        for name in list(self._workers):
+            self._stop(name)
+        self._owner.clear()
+
+    def __enter__(self) -> ShardedSessions:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+
+class LoadResult(NamedTuple):
+    """Outcome of a `drive_load` run.
+
+    Attributes:
+        workers: Worker processes used.
+        sessions: Concurrent sessions.
+        requests: Commands played.
+        seconds: Wall-clock time spent playing.
+    """
+
+    workers: int
+    sessions: int
+    requests: int
+    seconds: float
+
+    @property
+    def throughput(self) -> float:
+        """Commands played per second."""
+        return self.requests / self.seconds if self.seconds else 0.0
+
+
+def drive_load(workers: int, sessions: int = 64, rounds: int = 20,
+               seed: int = 0) -> LoadResult:
+    """Measure session throughput for a worker count.
+
+    Opens the sessions, then plays ``rounds`` waves in which every session
+    fights once, timing only the waves.
+
+    Args:
+        workers: Worker processes to run.
+        sessions: Concurrent sessions.
+        rounds: Waves of commands.
+        seed: Base seed for the sessions.
+
+    Returns:
+        The measured `LoadResult`.
+    """
+    with ShardedSessions(workers, seed=seed) as cluster:
+        session_ids = [f"player-{n}" for n in range(sessions)]
+        for session_id in session_ids:
+            cluster.open(session_id)
+        wave = [(session_id, "fight") for session_id in session_ids]
+        started = time.perf_counter()
+        for _ in range(rounds):
+            cluster.play_many(wave)
+        elapsed = time.perf_counter() - started
+    return LoadResult(workers, sessions, sessions * rounds, elapsed)
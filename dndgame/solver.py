@@ -0,0 +1,252 @@
+"""Exact outcome analysis for one-vs-one combat.
+
+Models the rules of `Combat.run` as a Markov chain over the two
+combatants' hit points and computes the outcome distribution without
+sampling a single fight. Each round the current attacker rolls
+1d20 + attack, deals ``max(0, roll - defense)`` damage and hands the turn
+over; when ``max_rounds`` is reached the winner is decided by HP with
+ties going to the player.
+
+Examples:
+    >>> from dndgame.solver import solve
+    >>> odds = solve(12, 2, 10, 7, 0, 15, max_rounds=300)
+    >>> round(odds.player_win + odds.enemy_win, 9)
+    1.0
+    >>> solve(12, 2, 10, 7, 0, 15, max_rounds=300) is odds
+    True
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import NamedTuple
+
+from dndgame.combat import Combat
+from dndgame.weapons import Weapon, attack_distribution
+
+
+# Sides on the attack die used by `Character.roll_attack` and `Enemy.roll_attack`
+ATTACK_DIE = 20
+
+# Unresolved probability mass below this is dropped; it cannot move a result
+# by more than double-precision rounding already does
+NEGLIGIBLE_MASS = 1e-15
+
+
+class CombatOdds(NamedTuple):
+    """Outcome distribution of a single combat.
+
+    Attributes:
+        player_win: Probability that `Combat.run` returns "Player".
+        enemy_win: Probability that `Combat.run` returns "Enemy".
+        expected_rounds: Expected number of attacks made before the fight ends.
+        max_rounds_reached: Probability that the fight runs to ``max_rounds``
+            and logs a ``max_rounds_reached`` event.
+    """
+
+    player_win: float
+    enemy_win: float
+    expected_rounds: float
+    max_rounds_reached: float
+
+
+@lru_cache(maxsize=None)
+def damage_distribution(attack: int, defense: int) -> tuple[tuple[int, float], ...]:
+    """Get the damage distribution of a single attack.
+
+    Args:
+        attack: The attacker's attack bonus.
+        defense: The defender's defense value.
+
+    Returns:
+        Tuple of ``(damage, probability)`` pairs sorted by damage, with
+        every possible 1d20 outcome folded into its damage value.
+    """
+    counts: dict[int, int] = {}
+    for face in range(1, ATTACK_DIE + 1):
+        dmg = max(0, face + attack - defense)
+        counts[dmg] = counts.get(dmg, 0) + 1
+    return tuple((dmg, n / ATTACK_DIE) for dmg, n in sorted(counts.items()))
+
+
+def player_wins(rounds: int, player_hp: int, enemy_hp: int, max_rounds: int) -> bool:
+    """Decide the winner of an end state the way `Combat.finish` does.
+
+    Args:
+        rounds: Rounds played.
+        player_hp: The player's hit points at the end.
+        enemy_hp: The enemy's hit points at the end.
+        max_rounds: The combat's round cap.
+
+    Returns:
+        True if the player wins.
+    """
+    if rounds >= max_rounds:
+        return player_hp >= enemy_hp
+    return player_hp > 0
+
+
+def _end_states(
+    player_hp: int,
+    player_attack: int,
+    player_defense: int,
+    enemy_hp: int,
+    enemy_attack: int,
+    enemy_defense: int,
+    max_rounds: int,
+    player_weapon: Weapon | None,
+    enemy_weapon: Weapon | None,
+) -> dict[tuple[int, int, int], float]:
+    """Push probability mass through the rounds of a combat.
+
+    Mass moves forward round by round over the reachable
+    ``(player_hp, enemy_hp)`` states until the fight is resolved or the
+    unresolved mass drops below `NEGLIGIBLE_MASS`.
+
+    Returns:
+        Mapping of ``(rounds, player_hp, enemy_hp)`` end states, with the
+        hit points left when `Combat.run` returns, to their probability.
+    """
+    if player_hp <= 0 or enemy_hp <= 0 or max_rounds <= 0:
+        # Combat.run never enters its loop
+        return {(0, player_hp, enemy_hp): 1.0}
+
+    if player_weapon is None:
+        player_dmg = damage_distribution(player_attack, enemy_defense)
+    else:
+        player_dmg = attack_distribution(player_weapon, player_attack, enemy_defense, True)
+    if enemy_weapon is None:
+        enemy_dmg = damage_distribution(enemy_attack, player_defense)
+    else:
+        enemy_dmg = attack_distribution(enemy_weapon, enemy_attack, player_defense, False)
+
+    states: dict[tuple[int, int], float] = {(player_hp, enemy_hp): 1.0}
+    ends: dict[tuple[int, int, int], float] = {}
+
+    for rounds in range(1, max_rounds + 1):
+        player_turn = rounds % 2 == 1
+        next_states: dict[tuple[int, int], float] = {}
+        for (p_hp, e_hp), mass in states.items():
+            if player_turn:
+                for dmg, prob in player_dmg:
+                    if dmg >= e_hp:
+                        end = (rounds, p_hp, 0)
+                        ends[end] = ends.get(end, 0.0) + mass * prob
+                    else:
+                        key = (p_hp, e_hp - dmg)
+                        next_states[key] = next_states.get(key, 0.0) + mass * prob
+            else:
+                for dmg, prob in enemy_dmg:
+                    if dmg >= p_hp:
+                        end = (rounds, 0, e_hp)
+                        ends[end] = ends.get(end, 0.0) + mass * prob
+                    else:
+                        key = (p_hp - dmg, e_hp)
+                        next_states[key] = next_states.get(key, 0.0) + mass * prob
+        states = next_states
+        if sum(states.values()) < NEGLIGIBLE_MASS:
+            states = {}
+            break
+
+    # Survivors of the final round are resolved by HP in Combat.finish
+    for (p_hp, e_hp), mass in states.items():
+        end = (max_rounds, p_hp, e_hp)
+        ends[end] = ends.get(end, 0.0) + mass
+    return ends
+
+
+@lru_cache(maxsize=4096)
+def solve(
+    player_hp: int,
+    player_attack: int,
+    player_defense: int,
+    enemy_hp: int,
+    enemy_attack: int,
+    enemy_defense: int,
+    max_rounds: int = 300,
+    player_weapon: Weapon | None = None,
+    enemy_weapon: Weapon | None = None,
+) -> CombatOdds:
+    """Compute the exact outcome distribution of a combat.
+
+    Sums the end states of the combat's Markov chain into win
+    probabilities. Results are memoized, so repeated queries for the same
+    matchup return immediately.
+
+    Args:
+        player_hp: The player's hit points when combat starts.
+        player_attack: The player's attack bonus.
+        player_defense: The player's defense value.
+        enemy_hp: The enemy's hit points when combat starts.
+        enemy_attack: The enemy's attack bonus.
+        enemy_defense: The enemy's defense value.
+        max_rounds: Maximum rounds before combat is force-resolved.
+        player_weapon: The player's weapon; the player crits on a natural 20
+            like `Character`.
+        enemy_weapon: The enemy's weapon; the enemy never crits, like `Enemy`.
+
+    Returns:
+        The `CombatOdds` for this matchup.
+    """
+    player_win = 0.0
+    enemy_win = 0.0
+    expected_rounds = 0.0
+    capped = 0.0
+    for (rounds, p_hp, e_hp), mass in _end_states(
+            player_hp, player_attack, player_defense, enemy_hp, enemy_attack,
+            enemy_defense, max_rounds, player_weapon, enemy_weapon).items():
+        if player_wins(rounds, p_hp, e_hp, max_rounds):
+            player_win += mass
+        else:
+            enemy_win += mass
+        expected_rounds += mass * rounds
+        # Kills on the final round also log max_rounds_reached
+        if rounds >= max_rounds:
+            capped += mass
+    return CombatOdds(player_win, enemy_win, expected_rounds, capped)
+
+
+def solve_outcomes(
+    player_hp: int,
+    player_attack: int,
+    player_defense: int,
+    enemy_hp: int,
+    enemy_attack: int,
+    enemy_defense: int,
+    max_rounds: int = 300,
+    player_weapon: Weapon | None = None,
+    enemy_weapon: Weapon | None = None,
+) -> tuple[tuple[tuple[int, int, int], float], ...]:
+    """Compute the exact distribution of a combat's final state.
+
+    Returns the end states `solve` sums into win probabilities, one by
+    one. Arguments are as for `solve`.
+
+    Returns:
+        Tuple of ``((rounds, player_hp, enemy_hp), probability)`` pairs,
+        one per reachable end state, where the hit points are those left
+        when `Combat.run` returns.
+    """
+    return tuple(sorted(_end_states(
+        player_hp, player_attack, player_defense, enemy_hp, enemy_attack,
+        enemy_defense, max_rounds, player_weapon, enemy_weapon).items()))
+
+
+def solve_combat(combat: Combat) -> CombatOdds:
+    """Compute the exact outcome distribution of a prepared `Combat`.
+
+    Uses the current hp, attack and defense of both combatants, so it
+    should be called before `Combat.run` mutates their hit points.
+
+    Args:
+        combat: The combat to analyze.
+
+    Returns:
+        The `CombatOdds` for the combat's matchup.
+    """
+    player, enemy = combat.player, combat.enemy
+    return solve(
+        player.hp, player.attack, player.defense,
+        enemy.hp, enemy.attack, enemy.defense,
+        combat.max_rounds, player.weapon, enemy.weapon,
+    )
@@ -1,7 +1,8 @@
 """Simple spell and spellbook primitives.
 
 Defines `Spell` and `SpellBook` with minimal behavior so the system can
-be extended later with concrete spell effects.
+be extended later with concrete spell effects. Spell slots and cooldowns
+are tracked by `dndgame.casting`.
 
 Examples:
     >>> from dndgame.spells import Spell, SpellBook
@@ -26,9 +27,11 @@ class Spell:
         level: The spell level (0 for cantrips, 1-9 for leveled spells).
         school: The school of magic (e.g., "Evocation", "Abjuration").
         spell_power: The spell's power level for damage calculations.
+        cooldown: Turns before the same caster can cast it again.
     """
 
-    def __init__(self, name: str, level: int, school: str, spell_power: int) -> None:
+    def __init__(self, name: str, level: int, school: str, spell_power: int,
+                 cooldown: int = 0) -> None:
         """Initialize a new spell.
 
         Args:
@@ -36,11 +39,14 @@ class Spell:
             level: The spell level (0-9).
             school: The school of magic this spell belongs to.
             spell_power: The spell's power level for damage calculations.
+            cooldown: Turns before the same caster can cast it again; 0
+                for none.
         """
         self.name = name
         self.level = level
         self.school = school
         self.spell_power = spell_power
+        self.cooldown = cooldown
 
     def cast(self, caster: Character, target: Character) -> None:
         """Cast the spell on a target.
@@ -0,0 +1,331 @@
+"""Encounter balancing against a player profile.
+
+Searches enemy parameters (base HP, armor class and STR/CON racial
+bonuses) for configurations that give a `Character` a target win rate.
+Each candidate is evaluated by sampling the enemy's 3d6 ability rolls and
+scoring every sample with the exact solver in `dndgame.solver`. Sampling
+stops as soon as a Hoeffding bound clearly accepts or rejects the
+candidate, evaluated candidates are cached, and each search step is
+fanned out over a process pool.
+
+Examples:
+    >>> from dndgame.tuner import EncounterTuner, PlayerProfile
+    >>> tuner = EncounterTuner(PlayerProfile(12, 2, 10), target=0.6, workers=1)
+    >>> best = tuner.tune(armor_classes=[12], str_bonuses=[0], con_bonuses=[0])
+    >>> all(abs(e.win_rate - 0.6) <= tuner.tolerance for e in best)
+    True
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import math
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Iterable, Literal, NamedTuple, Sequence
+
+from dndgame.character import Character
+from dndgame.progression import ability_modifier
+from dndgame.solver import solve
+
+
+Verdict = Literal["accepted", "rejected", "inconclusive"]
+
+
+class PlayerProfile(NamedTuple):
+    """The combat-relevant numbers of a player character.
+
+    Attributes:
+        hp: Hit points at the start of each fight.
+        attack: Attack bonus.
+        defense: Defense value.
+    """
+
+    hp: int
+    attack: int
+    defense: int
+
+    @classmethod
+    def from_character(cls, character: Character) -> PlayerProfile:
+        """Build a profile from a rolled character at full health.
+
+        Args:
+            character: A character whose stats have been rolled.
+
+        Returns:
+            The character's profile.
+        """
+        return cls(character.max_hp, character.attack, character.defense)
+
+
+class EnemyProfile(NamedTuple):
+    """A tunable enemy configuration.
+
+    Attributes:
+        base_hp: Base hit points before the Constitution modifier.
+        armor_class: Armor class, used as the enemy's defense.
+        str_bonus: Racial bonus added to the rolled STR score.
+        con_bonus: Racial bonus added to the rolled CON score.
+    """
+
+    base_hp: int
+    armor_class: int
+    str_bonus: int = 0
+    con_bonus: int = 0
+
+
+class Evaluation(NamedTuple):
+    """The estimated player win rate against one enemy configuration.
+
+    Attributes:
+        enemy: The evaluated configuration.
+        win_rate: Mean player win probability over the sampled enemies.
+        samples: Number of enemy stat rolls sampled.
+        verdict: Whether the win rate is within tolerance of the target.
+    """
+
+    enemy: EnemyProfile
+    win_rate: float
+    samples: int
+    verdict: Verdict
+
+
+def _evaluate(
+    player: PlayerProfile,
+    enemy: EnemyProfile,
+    target: float,
+    tolerance: float,
+    confidence: float,
+    batch_size: int,
+    max_samples: int,
+    max_rounds: int,
+    seed: int,
+) -> Evaluation:
+    """Sample one enemy configuration until its verdict is clear.
+
+    Runs in worker processes, so it only takes picklable arguments and
+    derives its RNG from the seed and the configuration.
+    """
+    rng = random.Random(f"{seed}:{tuple(enemy)}")
+    delta = 1.0 - confidence
+    total = 0.0
+    n = 0
+    verdict: Verdict = "inconclusive"
+    while n < max_samples:
+        for _ in range(batch_size):
+            strength = sum(rng.randint(1, 6) for _ in range(3)) + enemy.str_bonus
+            con = sum(rng.randint(1, 6) for _ in range(3)) + enemy.con_bonus
+            odds = solve(
+                player.hp, player.attack, player.defense,
+                enemy.base_hp + ability_modifier(con), ability_modifier(strength), enemy.armor_class,
+                max_rounds,
+            )
+            total += odds.player_win
+        n += batch_size
+
+        # Hoeffding bound on the mean of samples in [0, 1]
+        margin = math.sqrt(math.log(2 / delta) / (2 * n))
+        error = abs(total / n - target)
+        if error + margin <= tolerance:
+            verdict = "accepted"
+            break
+        if error - margin > tolerance:
+            verdict = "rejected"
+            break
+    return Evaluation(enemy, total / n, n, verdict)
+
+
+class EncounterTuner:
+    """Searches enemy configurations for a target player win rate.
+
+    Attributes:
+        player: The player profile enemies are tuned against.
+        target: Desired player win rate in [0, 1].
+        tolerance: Accepted distance between the win rate and the target.
+        confidence: Confidence level of the early-stopping bound.
+        batch_size: Samples drawn between early-stopping checks.
+        max_samples: Upper bound on samples per configuration.
+        max_rounds: Round cap of the simulated combats.
+        seed: Seed for the per-configuration RNGs.
+        workers: Number of worker processes (1 evaluates in-process).
+        cache: Evaluations keyed by the configuration that produced them.
+    """
+
+    def __init__(
+        self,
+        player: PlayerProfile | Character,
+        target: float = 0.7,
+        tolerance: float = 0.05,
+        confidence: float = 0.95,
+        batch_size: int = 32,
+        max_samples: int = 1024,
+        max_rounds: int = 300,
+        seed: int = 0,
+        workers: int | None = None,
+    ) -> None:
+        """Initialize a tuner.
+
+        Args:
+            player: The player profile, or a rolled character to take it from.
+            target: Desired player win rate in [0, 1].
+            tolerance: Accepted distance between the win rate and the target.
+            confidence: Confidence level of the early-stopping bound.
+            batch_size: Samples drawn between early-stopping checks.
+            max_samples: Upper bound on samples per configuration.
+            max_rounds: Round cap of the simulated combats.
+            seed: Seed for the per-configuration RNGs.
+            workers: Number of worker processes; None uses the CPU count.
+
+        Raises:
+            ValueError: If target, tolerance or confidence is out of range.
+        """
+        if not 0.0 <= target <= 1.0:
+            raise ValueError("target must be between 0 and 1")
+        if tolerance <= 0.0:
+            raise ValueError("tolerance must be positive")
+        if not 0.0 < confidence < 1.0:
+            raise ValueError("confidence must be between 0 and 1")
+        if isinstance(player, Character):
+            player = PlayerProfile.from_character(player)
+        self.player: PlayerProfile = player
+        self.target: float = target
+        self.tolerance: float = tolerance
+        self.confidence: float = confidence
+        self.batch_size: int = batch_size
+        self.max_samples: int = max_samples
+        self.max_rounds: int = max_rounds
+        self.seed: int = seed
+        self.workers: int | None = workers
+        self.cache: dict[EnemyProfile, Evaluation] = {}
+        # Pool shared by the evaluations of one `tune` call
+        self._pool: ProcessPoolExecutor | None = None
+
+    def evaluate(self, enemies: Iterable[EnemyProfile]) -> list[Evaluation]:
+        """Evaluate enemy configurations, reusing cached results.
+
+        Args:
+            enemies: Configurations to evaluate.
+
+        Returns:
+            One evaluation per configuration, in input order.
+        """
+        enemies = list(enemies)
+        pending = list(dict.fromkeys(e for e in enemies if e not in self.cache))
+        if pending:
+            args = [
+                (self.player, e, self.target, self.tolerance, self.confidence,
+                 self.batch_size, self.max_samples, self.max_rounds, self.seed)
+                for e in pending
+            ]
+            if self.workers == 1 or len(pending) == 1:
+                results = [_evaluate(*a) for a in args]
+            elif self._pool is not None:
+                results = self._submit(self._pool, args)
+            else:
+                with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                    results = self._submit(pool, args)
+            for result in results:
+                self.cache[result.enemy] = result
+        return [self.cache[e] for e in enemies]
+
+    @staticmethod
+    def _submit(pool: ProcessPoolExecutor, args: list[tuple[Any, ...]]) -> list[Evaluation]:
+        futures = [pool.submit(_evaluate, *a) for a in args]
+        return [f.result() for f in futures]
+
+    def tune(
+        self,
+        base_hp: tuple[int, int] = (1, 40),
+        armor_classes: Sequence[int] = range(10, 17),
+        str_bonuses: Sequence[int] = (0, 1, 2),
+        con_bonuses: Sequence[int] = (0, 1, 2),
+    ) -> list[Evaluation]:
+        """Search for enemy configurations that hit the target win rate.
+
+        The player's win rate falls as enemy HP grows, so every combination
+        of armor class and bonuses gets a binary search over base HP. Each
+        search step evaluates the midpoints of all combinations together.
+
+        Args:
+            base_hp: Inclusive range of base HP to search.
+            armor_classes: Armor classes to try.
+            str_bonuses: STR racial bonuses to try.
+            con_bonuses: CON racial bonuses to try.
+
+        Returns:
+            Accepted evaluations, closest to the target first.
+        """
+        bounds = {
+            combo: base_hp
+            for combo in itertools.product(armor_classes, str_bonuses, con_bonuses)
+        }
+        accepted: dict[EnemyProfile, Evaluation] = {}
+        if self.workers != 1:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        try:
+            self._search(bounds, accepted)
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+        return sorted(accepted.values(), key=lambda e: abs(e.win_rate - self.target))
+
+    def _search(self, bounds: dict[tuple[int, int, int], tuple[int, int]],
+                accepted: dict[EnemyProfile, Evaluation]) -> None:
+        """Run the binary searches of `tune` until every combination is settled."""
+        while bounds:
+            probes = {
+                combo: EnemyProfile((lo + hi) // 2, *combo)
+                for combo, (lo, hi) in bounds.items()
+            }
+            results = self.evaluate(probes.values())
+            for (combo, (lo, hi)), result in zip(list(bounds.items()), results):
+                if result.verdict == "accepted":
+                    accepted[result.enemy] = result
+                    del bounds[combo]
+                    continue
+                mid = result.enemy.base_hp
+                if result.win_rate > self.target:
+                    lo = mid + 1
+                else:
+                    hi = mid - 1
+                if lo > hi:
+                    del bounds[combo]
+                else:
+                    bounds[combo] = (lo, hi)
+
+
+def bestiary_entry(evaluation: Evaluation, name: str, race: str) -> dict[str, object]:
+    """Convert an evaluation into a bestiary entry.
+
+    Args:
+        evaluation: A tuned evaluation.
+        name: Display name for the enemy.
+        race: Enemy type the entry belongs to.
+
+    Returns:
+        A JSON-serializable bestiary entry.
+    """
+    enemy = evaluation.enemy
+    return {
+        "name": name,
+        "race": race,
+        "base_hp": enemy.base_hp,
+        "armor_class": enemy.armor_class,
+        "bonuses": {"STR": enemy.str_bonus, "CON": enemy.con_bonus},
+        "win_rate": round(evaluation.win_rate, 4),
+        "samples": evaluation.samples,
+    }
+
+
+def write_bestiary(entries: Sequence[dict[str, object]], path: str) -> None:
+    """Write bestiary entries to a JSON file.
+
+    Args:
+        entries: Entries produced by `bestiary_entry`.
+        path: Destination file path.
+    """
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(list(entries), fh, indent=2)
+        fh.write("\n")
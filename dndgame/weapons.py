@@ -0,0 +1,213 @@
+"""Weapons with damage dice and cached damage tables.
+
+A weapon's damage is written in dice notation and compiled once through
+`dndgame.dice.compile_dice`. A hit deals the weapon's dice plus the
+attacker's attack modifier; a critical hit rolls the damage dice twice.
+Exact per-weapon damage and per-attack outcome distributions are cached,
+and `DamageTable` samples from them in bulk so analytics and batched
+simulations never roll damage one die at a time.
+
+Examples:
+    >>> from dndgame.weapons import get_weapon, attack_distribution
+    >>> sword = get_weapon("longsword")
+    >>> sword.damage, sword.two_handed
+    ('1d8', False)
+    >>> round(sum(p for _, p in attack_distribution(sword, 2, 15, True)), 9)
+    1.0
+"""
+
+from __future__ import annotations
+
+import random
+from functools import lru_cache
+from itertools import accumulate
+from typing import Dict, NamedTuple
+
+from dndgame.dice import compile_dice
+
+
+# Sides on the attack die
+ATTACK_DIE = 20
+
+
+class Weapon(NamedTuple):
+    """A weapon and its damage dice.
+
+    Attributes:
+        name: Display name.
+        damage: Damage dice in dice notation, e.g. "1d8" or "2d6".
+        two_handed: True if the weapon needs both hands.
+    """
+
+    name: str
+    damage: str
+    two_handed: bool = False
+
+    def roll_damage(self, modifier: int, is_crit: bool = False) -> int:
+        """Roll damage for a hit with this weapon.
+
+        Args:
+            modifier: The attacker's attack modifier, added once.
+            is_crit: Roll the damage dice twice on a critical hit.
+
+        Returns:
+            The damage dealt, never below 0.
+        """
+        dice = compile_dice(self.damage)
+        total = dice.roll() + modifier
+        if is_crit:
+            total += dice.roll() - dice.modifier
+        return max(0, total)
+
+
+# Built-in weapon registry (mutable so users can register custom weapons)
+WEAPONS: Dict[str, Weapon] = {
+    w.name: w for w in (
+        Weapon("Dagger", "1d4"),
+        Weapon("Shortsword", "1d6"),
+        Weapon("Handaxe", "1d6"),
+        Weapon("Longsword", "1d8"),
+        Weapon("Warhammer", "1d8"),
+        Weapon("Battleaxe", "1d10"),
+        Weapon("Greatsword", "2d6", two_handed=True),
+        Weapon("Greataxe", "1d12", two_handed=True),
+    )
+}
+
+
+def list_weapons() -> list[str]:
+    """Return a sorted list of available weapon names."""
+    return sorted(WEAPONS.keys())
+
+
+def get_weapon(name: str) -> Weapon | None:
+    """Get a weapon by name (case-insensitive)."""
+    for key, weapon in WEAPONS.items():
+        if key.lower() == name.lower():
+            return weapon
+    return None
+
+
+def register_weapon(weapon: Weapon) -> None:
+    """Register or overwrite a weapon.
+
+    Args:
+        weapon: The weapon to add.
+
+    Raises:
+        ValueError: If the damage is not valid dice notation.
+    """
+    compile_dice(weapon.damage)
+    WEAPONS[weapon.name] = weapon
+
+
+@lru_cache(maxsize=None)
+def damage_distribution(
+    damage: str, modifier: int, is_crit: bool = False
+) -> tuple[tuple[int, float], ...]:
+    """Get the exact damage distribution of a hit.
+
+    Args:
+        damage: Damage dice in dice notation.
+        modifier: Attack modifier added to the damage.
+        is_crit: Double the damage dice.
+
+    Returns:
+        Tuple of ``(damage, probability)`` pairs sorted by damage.
+    """
+    expression = f"{damage}+{damage}" if is_crit else damage
+    dist = compile_dice(expression).distribution()
+    if is_crit:
+        # The doubled expression counts any flat bonus twice
+        modifier -= compile_dice(damage).modifier
+    counts: dict[int, float] = {}
+    for total, p in dist.items():
+        dmg = max(0, total + modifier)
+        counts[dmg] = counts.get(dmg, 0.0) + float(p)
+    return tuple(sorted(counts.items()))
+
+
+@lru_cache(maxsize=None)
+def attack_distribution(
+    weapon: Weapon, attack: int, defense: int, can_crit: bool = True
+) -> tuple[tuple[int, float], ...]:
+    """Get the exact damage distribution of one weapon attack.
+
+    The attack hits when 1d20 + attack reaches the defense; a natural 20
+    is a critical hit that always lands when the attacker can crit.
+
+    Args:
+        weapon: The attacker's weapon.
+        attack: The attacker's attack modifier.
+        defense: The defender's defense value.
+        can_crit: Whether natural 20s are critical hits.
+
+    Returns:
+        Tuple of ``(damage, probability)`` pairs sorted by damage, with
+        misses counted as 0 damage.
+    """
+    counts: dict[int, float] = {}
+    for face in range(1, ATTACK_DIE + 1):
+        is_crit = can_crit and face == ATTACK_DIE
+        if is_crit or face + attack >= defense:
+            for dmg, p in damage_distribution(weapon.damage, attack, is_crit):
+                counts[dmg] = counts.get(dmg, 0.0) + p / ATTACK_DIE
+        else:
+            counts[0] = counts.get(0, 0.0) + 1 / ATTACK_DIE
+    return tuple(sorted(counts.items()))
+
+
+class DamageTable:
+    """Samples damage values from a precomputed distribution.
+
+    Attributes:
+        values: Possible damage values.
+        cum_weights: Cumulative probabilities matching values.
+    """
+
+    def __init__(self, distribution: tuple[tuple[int, float], ...]) -> None:
+        """Build a table from ``(damage, probability)`` pairs.
+
+        Args:
+            distribution: Output of `damage_distribution` or `attack_distribution`.
+        """
+        self.values: list[int] = [dmg for dmg, _ in distribution]
+        self.cum_weights: list[float] = list(accumulate(p for _, p in distribution))
+
+    def sample(self, k: int = 1) -> list[int]:
+        """Draw damage values.
+
+        Args:
+            k: Number of values to draw.
+
+        Returns:
+            A list of k damage values.
+        """
+        return random.choices(self.values, cum_weights=self.cum_weights, k=k)
+
+    def mean(self) -> float:
+        """Get the expected damage."""
+        previous = 0.0
+        total = 0.0
+        for value, cumulative in zip(self.values, self.cum_weights):
+            total += value * (cumulative - previous)
+            previous = cumulative
+        return total
+
+
+@lru_cache(maxsize=1024)
+def attack_table(
+    weapon: Weapon, attack: int, defense: int, can_crit: bool = True
+) -> DamageTable:
+    """Get a cached sampling table for one weapon attack.
+
+    Args:
+        weapon: The attacker's weapon.
+        attack: The attacker's attack modifier.
+        defense: The defender's defense value.
+        can_crit: Whether natural 20s are critical hits.
+
+    Returns:
+        The `DamageTable` of `attack_distribution` for these arguments.
+    """
+    return DamageTable(attack_distribution(weapon, attack, defense, can_crit))
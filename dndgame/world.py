@@ -0,0 +1,347 @@
+"""On-disk adventure worlds with lazily loaded scenes.
+
+A world file holds every scene and encounter of a campaign as JSON
+records, plus two key-sorted index tables (one for scenes, one for
+encounters) of fixed-width entries. `World` maps the file with `mmap`
+and finds a record by binary search over its table, so opening a world
+reads only the header, and memory grows with the scenes actually
+visited. Recently used scenes and encounters stay resident in small LRU
+caches.
+
+Each scene record lists its exits and the keys of its encounters, which
+is the scene-to-encounter index: an `Adventure` in world mode loads the
+current scene, then only the encounter definitions it asks for.
+
+File layout (little-endian):
+    header: magic, scene table offset and count, encounter table offset
+        and count, metadata length; metadata JSON (name, description,
+        start scene); records; key blob; scene table; encounter table
+    table entry: key offset, record offset, key length, record length
+
+Examples:
+    >>> from dndgame.world import World, WorldWriter
+    >>> with WorldWriter("tiny.dnw", "Tiny", "Two rooms.", start="gate") as writer:
+    ...     writer.add_scene("gate", "Gate", "A rusty gate.", exits=["hall"],
+    ...                      encounters=["rats"])
+    ...     writer.add_scene("hall", "Hall", "An empty hall.", exits=["gate"])
+    ...     writer.add_encounter("rats", "Rats", "Giant rats!", "Easy")
+    >>> with World("tiny.dnw") as world:
+    ...     world.scene(world.start).encounters, world.encounter("rats")["difficulty"]
+    (('rats',), 'Easy')
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+from collections import OrderedDict
+from types import TracebackType
+from typing import Any, Iterable, NamedTuple, Optional, Type
+
+
+MAGIC = b"DNDWRLD1"
+_HEADER = struct.Struct("<8sQQQQI")
+_ENTRY = struct.Struct("<QQII")
+
+
+class Scene(NamedTuple):
+    """A location in a world.
+
+    Attributes:
+        key: Unique scene key.
+        name: Display name.
+        description: Scene description.
+        exits: Keys of the scenes reachable from here.
+        encounters: Keys of the encounters found here.
+    """
+
+    key: str
+    name: str
+    description: str
+    exits: tuple[str, ...]
+    encounters: tuple[str, ...]
+
+
+class WorldWriter:
+    """Builds a world file.
+
+    Records are streamed to a temporary file as they are added; only the
+    keys and record positions are kept in memory until `close` writes
+    the index tables.
+
+    Attributes:
+        path: Destination file path.
+    """
+
+    def __init__(self, path: str, name: str, description: str, start: str) -> None:
+        """Start a new world.
+
+        Args:
+            path: Destination file path; an existing file is replaced on close.
+            name: The world's name.
+            description: The world's description.
+            start: Key of the starting scene.
+        """
+        self.path: str = path
+        self._meta = json.dumps({"name": name, "description": description,
+                                 "start": start}).encode()
+        self._tmp_path = path + ".tmp"
+        self._fh = open(self._tmp_path, "wb")
+        self._fh.write(bytes(_HEADER.size))
+        self._fh.write(self._meta)
+        self._scenes: dict[bytes, tuple[int, int]] = {}
+        self._encounters: dict[bytes, tuple[int, int]] = {}
+
+    def _add(self, table: dict[bytes, tuple[int, int]], key: str,
+             record: dict[str, Any]) -> None:
+        encoded = key.encode()
+        if encoded in table:
+            raise ValueError(f"Duplicate key '{key}'")
+        data = json.dumps(record).encode()
+        table[encoded] = (self._fh.tell(), len(data))
+        self._fh.write(data)
+
+    def add_scene(self, key: str, name: str, description: str,
+                  exits: Iterable[str] = (), encounters: Iterable[str] = ()) -> None:
+        """Add a scene.
+
+        Args:
+            key: Unique scene key.
+            name: Display name.
+            description: Scene description.
+            exits: Keys of the scenes reachable from this one.
+            encounters: Keys of the encounters in this scene.
+
+        Raises:
+            ValueError: If the key was already added.
+        """
+        self._add(self._scenes, key, {"name": name, "description": description,
+                                      "exits": list(exits),
+                                      "encounters": list(encounters)})
+
+    def add_encounter(self, key: str, name: str, description: str,
+                      difficulty: str, **extra: Any) -> None:
+        """Add an encounter definition.
+
+        Args:
+            key: Unique encounter key.
+            name: Display name.
+            description: Encounter description.
+            difficulty: "Easy", "Medium" or "Hard".
+            **extra: Further JSON-serializable fields kept with the encounter.
+
+        Raises:
+            ValueError: If the key was already added.
+        """
+        self._add(self._encounters, key, {"name": name, "description": description,
+                                          "difficulty": difficulty, **extra})
+
+    def close(self) -> None:
+        """Write the index tables and move the file into place."""
+        fh = self._fh
+        tables = []
+        for table in (self._scenes, self._encounters):
+            keys = sorted(table)
+            key_offsets = []
+            for key in keys:
+                key_offsets.append(fh.tell())
+                fh.write(key)
+            tables.append((keys, key_offsets, table))
+        offsets = []
+        for keys, key_offsets, table in tables:
+            offsets.append(fh.tell())
+            for key, key_offset in zip(keys, key_offsets):
+                record_offset, record_length = table[key]
+                fh.write(_ENTRY.pack(key_offset, record_offset, len(key), record_length))
+        fh.seek(0)
+        fh.write(_HEADER.pack(MAGIC, offsets[0], len(self._scenes),
+                              offsets[1], len(self._encounters), len(self._meta)))
+        fh.close()
+        os.replace(self._tmp_path, self.path)
+
+    def __enter__(self) -> WorldWriter:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self._fh.close()
+            os.remove(self._tmp_path)
+
+
+class World:
+    """A memory-mapped world file with LRU caches of resident records.
+
+    Attributes:
+        path: The world file path.
+        name: The world's name.
+        description: The world's description.
+        start: Key of the starting scene.
+        scene_count: Number of scenes in the world.
+        encounter_count: Number of encounters in the world.
+        cache_size: Maximum number of resident scenes (and encounters).
+        loads: Records read from the file so far.
+    """
+
+    def __init__(self, path: str, cache_size: int = 64) -> None:
+        """Open a world file.
+
+        Args:
+            path: The world file path.
+            cache_size: Maximum number of resident scenes and encounters.
+
+        Raises:
+            ValueError: If the file is not a world file.
+        """
+        self.path: str = path
+        self.cache_size: int = cache_size
+        self.loads: int = 0
+        with open(path, "rb") as fh:
+            self._mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, scene_table, scene_count, encounter_table, encounter_count, meta_len = \
+            _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self._mm.close()
+            raise ValueError(f"{path} is not a world file")
+        meta = json.loads(self._mm[_HEADER.size:_HEADER.size + meta_len])
+        self.name: str = meta["name"]
+        self.description: str = meta["description"]
+        self.start: str = meta["start"]
+        self.scene_count: int = scene_count
+        self.encounter_count: int = encounter_count
+        self._tables: dict[str, tuple[int, int]] = {
+            "scene": (scene_table, scene_count),
+            "encounter": (encounter_table, encounter_count),
+        }
+        self._scenes: OrderedDict[str, Scene] = OrderedDict()
+        self._encounters: OrderedDict[str, dict[str, Any]] = OrderedDict()
+
+    def _find(self, kind: str, key: str) -> Optional[int]:
+        """Binary-search a table and return the matching entry's position."""
+        table, count = self._tables[kind]
+        target = key.encode()
+        mm = self._mm
+        lo, hi = 0, count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            key_offset, _, key_length, _ = _ENTRY.unpack_from(mm, table + mid * _ENTRY.size)
+            found = mm[key_offset:key_offset + key_length]
+            if found < target:
+                lo = mid + 1
+            elif found > target:
+                hi = mid
+            else:
+                return mid
+        return None
+
+    def _read(self, kind: str, key: str) -> Optional[dict[str, Any]]:
+        """Find a record by key and decode it."""
+        position = self._find(kind, key)
+        if position is None:
+            return None
+        table, _ = self._tables[kind]
+        _, record_offset, _, record_length = \
+            _ENTRY.unpack_from(self._mm, table + position * _ENTRY.size)
+        self.loads += 1
+        record: dict[str, Any] = json.loads(
+            self._mm[record_offset:record_offset + record_length])
+        return record
+
+    def _remember(self, cache: OrderedDict[str, Any], key: str, value: Any) -> None:
+        cache[key] = value
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+
+    def scene(self, key: str) -> Scene:
+        """Get a scene, loading it from disk if it is not resident.
+
+        Args:
+            key: The scene key.
+
+        Returns:
+            The scene.
+
+        Raises:
+            KeyError: If the world has no such scene.
+        """
+        scene = self._scenes.get(key)
+        if scene is not None:
+            self._scenes.move_to_end(key)
+            return scene
+        record = self._read("scene", key)
+        if record is None:
+            raise KeyError(f"Scene '{key}' not found")
+        scene = Scene(key, record["name"], record["description"],
+                      tuple(record["exits"]), tuple(record["encounters"]))
+        self._remember(self._scenes, key, scene)
+        return scene
+
+    def encounter(self, key: str) -> dict[str, Any]:
+        """Get an encounter definition, loading it from disk if needed.
+
+        Args:
+            key: The encounter key.
+
+        Returns:
+            The encounter's fields, including name, description and difficulty.
+
+        Raises:
+            KeyError: If the world has no such encounter.
+        """
+        encounter = self._encounters.get(key)
+        if encounter is not None:
+            self._encounters.move_to_end(key)
+            return encounter
+        encounter = self._read("encounter", key)
+        if encounter is None:
+            raise KeyError(f"Encounter '{key}' not found")
+        self._remember(self._encounters, key, encounter)
+        return encounter
+
+    def encounter_index(self, key: str) -> int:
+        """Get an encounter's position in the key-sorted encounter table.
+
+        Positions run from 0 to ``encounter_count - 1`` and are found
+        without loading the record, so callers can keep per-encounter
+        flags in a fixed-size bitmap.
+
+        Args:
+            key: The encounter key.
+
+        Returns:
+            The encounter's position.
+
+        Raises:
+            KeyError: If the world has no such encounter.
+        """
+        position = self._find("encounter", key)
+        if position is None:
+            raise KeyError(f"Encounter '{key}' not found")
+        return position
+
+    def resident_scenes(self) -> list[str]:
+        """Get the keys of the scenes currently cached, least recent first."""
+        return list(self._scenes)
+
+    def close(self) -> None:
+        """Unmap the world file."""
+        self._mm.close()
+
+    def __enter__(self) -> World:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
@@ -1,6 +1,6 @@
 import argparse
-import random
 
+from dndgame import dice, metrics
 from dndgame.character import Character
 from dndgame.combat import Combat
 from dndgame.dice import roll
@@ -122,6 +122,26 @@ def display_character(character):
 
 
 
+def import_file(path, seed=None):
+    """Bulk-import characters from a file and print a summary report.
+
+    Args:
+        path: A JSON Lines or CSV file of character records.
+        seed: Optional seed for stats that have to be rolled.
+    """
+    from dndgame.importer import CharacterImporter
+
+    importer = CharacterImporter(seed=seed)
+    for _ in importer.iter_chunks(path):
+        pass
+    report = importer.report
+    print(f"Imported {report.imported} of {report.records} characters from {path}")
+    if report.races_registered:
+        print(f"Registered races: {', '.join(report.races_registered)}")
+    for error in report.errors:
+        print(f"  line {error.line}: {error.message}")
+
+
 def main():
     """Entry point for the D&D Adventure game CLI.
 
@@ -129,83 +149,130 @@ def main():
     menu loop. Key options:
     - --seed <int>: Seed RNG for reproducible runs
     - --auto: Non-interactive mode using sensible defaults
+    - --metrics-port <int>: Serve Prometheus metrics on localhost
+    - --import <path>: Bulk-import characters from JSONL/CSV, report, and exit
+    - --narrate: Have a DungeonMaster narrate each combat
+    - --quick-combat: Settle fights from cached outcome distributions
     """
     parser = argparse.ArgumentParser(description="D&D Adventure Game")
     parser.add_argument("--seed", type=int, help="Set random seed for reproducible gameplay")
     parser.add_argument("--auto", action="store_true", help="Run in auto mode (skip inputs, use default name 'Hero')")
+    parser.add_argument("--metrics-port", type=int, help="Serve Prometheus metrics at http://127.0.0.1:<port>/metrics")
+    parser.add_argument("--import", dest="import_path", metavar="PATH", help="Bulk-import characters from a .jsonl or .csv file, print a report, and exit")
+    parser.add_argument("--narrate", action="store_true", help="Narrate combat with the DungeonMaster")
+    parser.add_argument("--quick-combat", action="store_true", help="Settle fights from cached outcome distributions instead of playing every round")
     args = parser.parse_args()
 
-    # Set random seed if provided
-    if args.seed is not None:
-        random.seed(args.seed)
-        print(f"Random seed set to: {args.seed}")
-
-    # Create character with auto mode support
-    player = create_character(auto_mode=args.auto)
-
-    # Auto mode settings
-    auto_combat_limit = 10 if args.auto else None  # Limit auto mode to 10 combats
-    auto_combat_count = 0
-
-    while True:
-        print("\nWhat would you like to do?")
-        print("1. Fight a goblin")
-        print("2. View character")
-        print("3. Quit")
-
-        if args.auto:
-            auto_combat_count += 1
-            if auto_combat_count > auto_combat_limit:
-                print(f"Auto mode: Completed {auto_combat_limit} combats, ending auto mode.")
-                print("Goodbye!")
-                break  # Exit the program
+    if args.import_path is not None:
+        import_file(args.import_path, seed=args.seed)
+        return
+
+    server = None
+    if args.metrics_port is not None:
+        server = metrics.MetricsServer(port=args.metrics_port)
+        print(f"Serving metrics on http://127.0.0.1:{server.port}/metrics")
+    metrics.ACTIVE_SESSIONS.inc()
+    dungeon_master = None
+    try:
+        if args.narrate:
+            from dndgame.narration import DungeonMaster
+            dungeon_master = DungeonMaster()
+
+        outcome_cache = None
+        if args.quick_combat:
+            from dndgame.outcomes import OutcomeCache
+            # Narration needs every round, so the cache stays off while narrating
+            outcome_cache = OutcomeCache(enabled=not args.narrate)
+
+        # Set random seed if provided
+        if args.seed is not None:
+            dice.seed(args.seed)
+            print(f"Random seed set to: {args.seed}")
+
+        # Create character with auto mode support
+        with metrics.CHARACTER_CREATION.time():
+            player = create_character(auto_mode=args.auto)
+
+        # Auto mode settings
+        auto_combat_limit = 10 if args.auto else None  # Limit auto mode to 10 combats
+        auto_combat_count = 0
+
+        while True:
+            print("\nWhat would you like to do?")
+            print("1. Fight a goblin")
+            print("2. View character")
+            print("3. Quit")
+
+            if args.auto:
+                auto_combat_count += 1
+                if auto_combat_count > auto_combat_limit:
+                    print(f"Auto mode: Completed {auto_combat_limit} combats, ending auto mode.")
+                    print("Goodbye!")
+                    break  # Exit the program
+                else:
+                    choice = "1"  # Default to fighting in auto mode
+                    print(f"Auto mode: Choosing to fight goblin (combat {auto_combat_count}/{auto_combat_limit})")
             else:
-                choice = "1"  # Default to fighting in auto mode
-                print(f"Auto mode: Choosing to fight goblin (combat {auto_combat_count}/{auto_combat_limit})")
-        else:
-            choice = input("Enter choice (1-3): ").strip()
-            if choice not in {"1", "2", "3"}:
-                choice = input("Invalid choice. Please enter 1, 2, or 3: ").strip()
+                choice = input("Enter choice (1-3): ").strip()
                 if choice not in {"1", "2", "3"}:
-                    choice = "2"
-                    print("Invalid input again. Showing character info.")
-
-        if choice == "1":
-            # Ensure the player isn't starting combat at 0 HP
-            if player.hp <= 0:
-                if args.auto:
-                    print("Auto mode: Restoring HP to full before combat.")
-                    player.hp = getattr(player, "max_hp", player.hp)
-                else:
-                    resp = input("You are at 0 HP. Rest to recover to full HP before fighting? (y/n): ").strip().lower()
-                    if resp.startswith("y"):
+                    choice = input("Invalid choice. Please enter 1, 2, or 3: ").strip()
+                    if choice not in {"1", "2", "3"}:
+                        choice = "2"
+                        print("Invalid input again. Showing character info.")
+
+            if choice == "1":
+                # Ensure the player isn't starting combat at 0 HP
+                if player.hp <= 0:
+                    if args.auto:
+                        print("Auto mode: Restoring HP to full before combat.")
                         player.hp = getattr(player, "max_hp", player.hp)
-                        print(f"{player.name} rests and recovers to {player.hp} HP.")
                     else:
-                        print("You decide not to fight while at 0 HP.")
-                        continue
-            # Create enemy for combat
-            from dndgame.enemy import Enemy
-            enemy = Enemy("Goblin", "Goblin", 7)
-            enemy.roll_stats()
-            enemy.apply_racial_bonuses()
-
-            # Use the new Combat class
-            combat = Combat(player, enemy, max_rounds=300)
-            winner, log = combat.run()
-
-            # Check if max_rounds was reached
-            if log and isinstance(log[-1], dict) and log[-1].get("event") == "max_rounds_reached":
-                print(f"Combat ended due to reaching maximum rounds ({log[-1]['rounds']})")
-                print(f"Winner determined by HP comparison: {winner}")
-            elif winner == "Player":
-                print("You defeated the goblin!")
-            else:
-                print("You were defeated by the goblin!")
-        elif choice == "2":
-            display_character(player)
-        elif choice == "3":
-            break
+                        resp = input("You are at 0 HP. Rest to recover to full HP before fighting? (y/n): ").strip().lower()
+                        if resp.startswith("y"):
+                            player.hp = getattr(player, "max_hp", player.hp)
+                            print(f"{player.name} rests and recovers to {player.hp} HP.")
+                        else:
+                            print("You decide not to fight while at 0 HP.")
+                            continue
+                # Create enemy for combat
+                from dndgame.enemy import Enemy
+                enemy = Enemy("Goblin", "Goblin", 7)
+                enemy.roll_stats()
+                enemy.apply_racial_bonuses()
+
+                # Use the new Combat class
+                combat = Combat(player, enemy, max_rounds=300,
+                                keep_log=outcome_cache is None or not outcome_cache.enabled)
+                if dungeon_master is not None:
+                    dungeon_master.attach(combat)
+                if outcome_cache is not None:
+                    winner, log = outcome_cache.resolve(combat)
+                else:
+                    winner, log = combat.run()
+                if dungeon_master is not None:
+                    # Narrations are produced in the background; wait briefly for stragglers
+                    dungeon_master.flush(timeout=1.0)
+                    for narration in dungeon_master.drain():
+                        print(narration.text)
+
+                # Check if max_rounds was reached
+                if log and isinstance(log[-1], dict) and log[-1].get("event") == "max_rounds_reached":
+                    print(f"Combat ended due to reaching maximum rounds ({log[-1]['rounds']})")
+                    print(f"Winner determined by HP comparison: {winner}")
+                elif winner == "Player":
+                    print("You defeated the goblin!")
+                else:
+                    print("You were defeated by the goblin!")
+            elif choice == "2":
+                display_character(player)
+            elif choice == "3":
+                break
+    finally:
+        metrics.ACTIVE_SESSIONS.dec()
+        if dungeon_master is not None:
+            dungeon_master.close()
+        if server is not None:
+            server.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,147 @@
+import pytest
+
+from dndgame import dice
+from dndgame.adventure import Adventure, Change
+from dndgame.character import Character
+from dndgame.world import World, WorldWriter
+
+
+@pytest.fixture
+def adventure():
+    dice.set_verbose(False)
+    player = Character("Hero", "Human", 10)
+    player.roll_stats()
+    yield Adventure("Intro", "A small quest.", player, journal_size=2)
+    dice.set_verbose(True)
+
+
+def apply(status, delta):
+    """Bring a client's copy of the status up to date."""
+    if delta.snapshot is not None:
+        return {**delta.snapshot,
+                "completed_encounters": list(delta.snapshot["completed_encounters"]),
+                "available_encounters": list(delta.snapshot["available_encounters"])}
+    for change in delta.changes:
+        if change.kind == "scene":
+            status["current_scene"] = change.key
+            status["available_encounters"] = list(change.available)
+        else:
+            status["completed_encounters"].append(change.key)
+            status["completed_count"] += 1
+            status["available_encounters"].remove(change.key)
+    status["version"] = delta.version
+    return status
+
+
+def test_deltas_bring_clients_up_to_date(adventure):
+    status = apply({}, adventure.changes_since(-1))
+    assert status["version"] == 0
+    unchanged = adventure.changes_since(0)
+    assert (unchanged.changes, unchanged.snapshot) == ((), None)
+
+    adventure.complete_encounter("goblin_ambush")
+    delta = adventure.changes_since(status["version"])
+    assert delta.changes == (Change(1, "completed", "goblin_ambush"),)
+    status = apply(status, delta)
+    adventure.current_scene = "Cave"
+    status = apply(status, adventure.changes_since(status["version"]))
+    assert status == {**adventure.get_adventure_status(),
+                      "completed_encounters": ["goblin_ambush"]}
+
+
+def test_stale_clients_get_a_snapshot(adventure):
+    for key in ("goblin_ambush", "treasure_room", "dragon_lair"):
+        adventure.complete_encounter(key)
+    adventure.current_scene = "Town"
+    assert adventure.version == 4
+    assert [c.version for c in adventure.changes_since(2).changes] == [3, 4]
+    stale = adventure.changes_since(0)
+    assert stale.changes == () and stale.snapshot["available_encounters"] == ()
+    assert adventure.changes_since(99).snapshot is not None
+
+
+def test_snapshots_are_immutable_copies(adventure):
+    adventure.complete_encounter("goblin_ambush")
+    snapshot = adventure.changes_since(99).snapshot
+    adventure.complete_encounter("treasure_room")
+    assert snapshot["completed_encounters"] == ("goblin_ambush",)
+    assert snapshot["version"] == 1
+    with pytest.raises(TypeError):
+        snapshot["version"] = 2
+
+
+def test_subscribers_get_pushed_changes(adventure):
+    seen = []
+    stop = adventure.subscribe(seen.append)
+    adventure.complete_encounter("goblin_ambush")
+    adventure.current_scene = adventure.current_scene  # no change, no push
+    stop()
+    adventure.complete_encounter("treasure_room")
+    assert seen == [Change(1, "completed", "goblin_ambush")]
+
+
+def test_subscribers_see_the_reward_already_applied(adventure):
+    seen = []
+    adventure.subscribe(lambda change: seen.append(adventure.player.experience))
+    adventure.complete_encounter("goblin_ambush")
+    assert seen == [100]
+
+
+def test_moving_between_world_scenes_is_journaled(tmp_path):
+    path = str(tmp_path / "two.dnw")
+    with WorldWriter(path, "Two", "", start="a") as writer:
+        writer.add_scene("a", "A", "", exits=["b"], encounters=["x"])
+        writer.add_scene("b", "B", "", exits=["a"], encounters=["y", "z"])
+        for key in "xyz":
+            writer.add_encounter(key, key, "", "Easy")
+    with World(path) as world:
+        adventure = Adventure("Two", "", Character("Hero", "Human", 10), world=world)
+        adventure.move_to("b")
+        assert adventure.changes_since(0).changes == (Change(1, "scene", "b", ("y", "z")),)
+
+
+def test_export_and_restore_round_trip(tmp_path):
+    path = str(tmp_path / "two.dnw")
+    with WorldWriter(path, "Two", "", start="a") as writer:
+        writer.add_scene("a", "A", "", exits=["b"], encounters=["x"])
+        writer.add_scene("b", "B", "", exits=["a"], encounters=["y", "z"])
+        for key in "xyz":
+            writer.add_encounter(key, key, "", "Easy")
+    player = Character("Hero", "Human", 10)
+    with World(path) as world:
+        adventure = Adventure("Two", "", player, history_capacity=2, world=world)
+        adventure.complete_encounter("x")
+        adventure.move_to("b")
+        adventure.complete_encounter("y")
+        for n in range(3):
+            adventure.record_combat("Player", [{"event": "max_rounds_reached", "rounds": n}])
+        state = adventure.export_state()
+
+    restored = Adventure.restore(state, player)
+    assert restored.export_state() == state
+    assert restored.version == 3 and restored.current_scene == "b"
+    assert restored.world is not None and restored.world.path == path
+    assert restored.get_available_encounters_list() == ["z"]
+    assert restored.changes_since(1).changes == (Change(2, "scene", "b", ("y", "z")),
+                                                 Change(3, "completed", "y"))
+    restored.complete_encounter("z")
+    assert restored.changes_since(3).changes == (Change(4, "completed", "z"),)
+    restored.close()
+    with pytest.raises(ValueError):
+        restored.world.scene("a")
+
+
+def test_world_completions_are_kept_in_a_fixed_bitmap(tmp_path):
+    path = str(tmp_path / "wide.dnw")
+    keys = [f"e{n}" for n in range(20)]
+    with WorldWriter(path, "Wide", "", start="a") as writer:
+        writer.add_scene("a", "A", "", encounters=keys)
+        for key in keys:
+            writer.add_encounter(key, key, "", "Easy")
+    with World(path) as world, \
+            Adventure("Wide", "", Character("Hero", "Human", 10), world=world) as adventure:
+        for key in keys[::3]:
+            adventure.complete_encounter(key)
+        assert adventure.get_available_encounters_list() == [
+            key for n, key in enumerate(keys) if n % 3]
+        assert len(adventure._completed._bits) == 3
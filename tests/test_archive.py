@@ -0,0 +1,84 @@
+import random
+
+import pytest
+
+from dndgame.archive import ArchiveWriter, CombatArchive
+from dndgame.character import Character
+from dndgame.combat import Combat
+from dndgame.enemy import Enemy
+
+
+def run_fights(n, max_rounds=6):
+    random.seed(3)
+    fights = []
+    for i in range(n):
+        player = Character("Hero", "Human", 10)
+        player.hp, player.attack, player.defense = 12, 2, 10
+        # Names deliberately differ from races
+        enemy = Enemy("Grub" if i % 2 else "Snik", "Goblin" if i % 4 < 2 else "Orc", 7)
+        enemy.hp, enemy.attack, enemy.defense = 7, 0, 12
+        winner, log = Combat(player, enemy, max_rounds=max_rounds).run()
+        fights.append((winner, log, {player.name: player.race, enemy.name: enemy.race}))
+    return fights
+
+
+@pytest.fixture
+def archive(tmp_path):
+    fights = run_fights(40)
+    path = str(tmp_path / "fights.dca")
+    with ArchiveWriter(path) as writer:
+        for winner, log, types in fights:
+            writer.add(winner, log, types)
+    with CombatArchive(path) as opened:
+        yield opened, fights
+
+
+def test_archive_round_trip(archive):
+    opened, fights = archive
+    assert opened.combats == 40
+    assert opened.names == ["Hero", "Snik", "Grub"]
+    assert opened.types == ["Human", "Goblin", "Orc"]
+    for i, (winner, log, _) in enumerate(fights):
+        assert opened.winner(i) == winner
+        assert opened.combat(i) == log
+
+
+def test_columns_are_zero_copy_views(archive):
+    opened, fights = archive
+    dmg = opened.column("dmg")
+    assert isinstance(dmg, memoryview)
+    assert len(dmg) == opened.events
+    assert list(opened.column("offsets"))[-1] == opened.events
+
+
+def test_crits_by(archive):
+    opened, fights = archive
+    expected = [e for _, log, _ in fights for e in log
+                if e.get("crit") and e["attacker"] == "Hero"]
+    crits = opened.crits_by("Hero")
+    assert len(crits) == len(expected)
+    for event in crits:
+        combat = opened.combat(opened.combat_of(event))
+        assert any(e.get("crit") for e in combat)
+    assert opened.crits_by("Dragon") == []
+
+
+def test_damage_histogram_by_enemy_type(archive):
+    opened, fights = archive
+    expected = {}
+    for _, log, types in fights:
+        for e in log:
+            if types.get(e.get("defender")) == "Goblin":
+                expected[e["dmg"]] = expected.get(e["dmg"], 0) + 1
+    assert opened.damage_histogram(enemy_type="Goblin") == dict(sorted(expected.items()))
+    assert opened.damage_histogram(defender="Goblin") == {}
+    assert sum(opened.damage_histogram().values()) == opened.events
+    assert opened.damage_histogram(attacker="Hero", defender="Snik", enemy_type="Orc")
+    assert opened.damage_histogram(enemy_type="Dragon") == {}
+
+
+def test_rejects_non_archive(tmp_path):
+    path = tmp_path / "junk.bin"
+    path.write_bytes(b"not an archive" * 4)
+    with pytest.raises(ValueError):
+        CombatArchive(str(path))
@@ -0,0 +1,92 @@
+import math
+from fractions import Fraction
+
+import pytest
+
+from dndgame import dice
+from dndgame.balance import RaceReport, balance_report, duel, race_report
+from dndgame.character import Character
+from dndgame.combat import Combat
+from dndgame.races import RACES, register_race
+from dndgame.solver import solve
+
+
+@pytest.fixture
+def registry():
+    saved = dict(RACES)
+    yield
+    RACES.clear()
+    RACES.update(saved)
+
+
+def point(hp, attack):
+    return RaceReport("fixed", {}, {}, {hp: Fraction(1)}, {attack: Fraction(1)}, {})
+
+
+def test_bonuses_shift_modifiers_hp_and_attack():
+    human, elf, dwarf = race_report("Human"), race_report("Elf"), race_report("Dwarf")
+    for report in (human, elf, dwarf):
+        for distribution in (*report.modifiers.values(), report.max_hp, report.attack):
+            assert sum(distribution.values()) == 1
+    assert elf.mean_modifiers["DEX"] == 1 and elf.mean_modifiers["STR"] == 0
+    assert dwarf.max_hp == {hp + 1: p for hp, p in elf.max_hp.items()}
+    assert human.mean_attack > elf.mean_attack
+    assert min(human.modifiers["STR"]) == -3  # 3 + 1 -> (4 - 10) // 2
+
+
+@pytest.mark.parametrize("a,b", [((10, 0), (10, 0)), ((12, 2), (7, -1)), ((4, -3), (15, 3))])
+def test_duel_matches_solver(a, b):
+    result = duel(point(*a), point(*b))
+    first = solve(a[0], a[1], 10, b[0], b[1], 10).player_win
+    second = solve(b[0], b[1], 10, a[0], a[1], 10).enemy_win
+    assert math.isclose(result.win, (first + second) / 2, abs_tol=1e-9)
+    assert math.isclose(result.win + result.loss + result.undecided, 1.0)
+
+
+def test_duel_matrix_is_consistent():
+    reports = balance_report()
+    for name, report in reports.items():
+        assert math.isclose(report.duels[name].win, 0.5, abs_tol=1e-9)
+        for other in reports:
+            assert math.isclose(report.duels[other].win, reports[other].duels[name].loss)
+
+
+def test_duel_matches_sampled_fights():
+    dice.set_verbose(False)
+    dice.seed(11)
+    fights, wins = 4000, 0
+    for n in range(fights):
+        elf, dwarf = Character("E", "Elf", 10), Character("D", "Dwarf", 10)
+        for character in (elf, dwarf):
+            character.roll_stats()
+            character.apply_racial_bonuses()
+            character.set_stats(character.stats)  # derive hp and attack from bonused scores
+        combat = Combat(elf, dwarf) if n % 2 else Combat(dwarf, elf)
+        winner, _ = combat.run()
+        wins += (winner == "Player") == (n % 2 == 1)
+    dice.set_verbose(True)
+    p = race_report("Elf").duels["Dwarf"].win
+    assert abs(wins / fights - p) < 3.3 * math.sqrt(p * (1 - p) / fights)
+
+
+def test_cache_follows_registry(registry):
+    first = balance_report()
+    assert balance_report() is first
+    register_race("Orc", {"STR": 2, "INT": -2})
+    reports = balance_report()
+    assert reports is not first and "Orc" in reports["Human"].duels
+    assert reports["Orc"].duels["Elf"].win > 0.5
+    RACES["Orc"]["STR"] = -2
+    assert race_report("Orc").duels["Elf"].win < 0.5
+    with pytest.raises(KeyError):
+        race_report("Gnome")
+
+
+def test_cached_reports_are_read_only(registry):
+    reports = balance_report()
+    human = reports["Human"]
+    for mapping in (reports, human.duels, human.bonuses, human.modifiers,
+                    human.modifiers["STR"], human.max_hp, human.attack):
+        with pytest.raises(TypeError):
+            mapping["x"] = None
+    assert balance_report()["Human"].duels == human.duels
@@ -0,0 +1,145 @@
+import random
+
+import pytest
+
+from dndgame.casting import CasterPool, ReadyChange, TimingWheel
+from dndgame.spells import Spell, SpellBook
+
+
+def make_book():
+    book = SpellBook()
+    book.add_spell(Spell("Fire Bolt", 0, "Evocation", 2, cooldown=1))
+    book.add_spell(Spell("Magic Missile", 1, "Evocation", 3))
+    book.add_spell(Spell("Shield", 1, "Abjuration", 0, cooldown=3))
+    book.add_spell(Spell("Fireball", 3, "Evocation", 8, cooldown=2))
+    return book
+
+
+def test_wheel_fires_items_on_their_turn_across_levels():
+    wheel = TimingWheel(slots=4, levels=2)
+    delays = [1, 3, 4, 5, 15, 16, 17, 40, 100]
+    for delay in delays:
+        assert wheel.schedule(delay, delay) == delay
+    fired = {}
+    for _ in range(100):
+        for item in wheel.advance():
+            fired[item] = wheel.now
+    assert fired == {delay: delay for delay in delays}
+    assert len(wheel) == 0
+
+
+def test_wheel_rejects_non_positive_delays():
+    with pytest.raises(ValueError):
+        TimingWheel().schedule(0, "now")
+
+
+def test_wheel_matches_a_sorted_schedule():
+    rng = random.Random(3)
+    wheel = TimingWheel(slots=8, levels=2)
+    expected = {}
+    for _ in range(300):
+        for _ in range(rng.randrange(3)):
+            due = wheel.schedule(rng.randint(1, 150), object())
+            expected.setdefault(due, 0)
+            expected[due] += 1
+        fired = wheel.advance()
+        assert len(fired) == expected.pop(wheel.now, 0)
+
+
+def test_cast_spends_slots_and_rest_restores_them():
+    pool = CasterPool()
+    pool.add_caster("mage", make_book(), slots={1: 1, 3: 1})
+    changes = pool.cast("mage", "Magic Missile")
+    assert set(changes) == {ReadyChange("mage", "Magic Missile", False),
+                            ReadyChange("mage", "Shield", False)}
+    assert pool.slots_left("mage", 1) == 0
+    with pytest.raises(ValueError):
+        pool.cast("mage", "Shield")
+    assert all(pool.advance() == [] for _ in range(10))
+    assert set(pool.rest("mage")) == {ReadyChange("mage", "Magic Missile", True),
+                                      ReadyChange("mage", "Shield", True)}
+
+
+def test_cooldown_outlasts_a_rest():
+    pool = CasterPool()
+    pool.add_caster("mage", make_book(), slots={1: 2})
+    pool.cast("mage", "Shield")
+    assert pool.rest("mage") == []
+    assert not pool.can_cast("mage", "Shield")
+    assert pool.can_cast("mage", "Magic Missile")
+    pool.advance()
+    pool.advance()
+    assert pool.advance() == [ReadyChange("mage", "Shield", True)]
+
+
+def test_rest_voids_pending_recharges():
+    pool = CasterPool(slot_recharge=3)
+    pool.add_caster("mage", make_book(), slots={1: 2})
+    pool.cast("mage", "Magic Missile")
+    pool.rest("mage")
+    for _ in range(5):
+        pool.advance()
+    assert pool.slots_left("mage", 1) == 2
+
+
+def test_casters_ready_indexes_by_spell_and_forgets_removed_casters():
+    pool = CasterPool(slot_recharge=2)
+    for name in ("a", "b", "c"):
+        pool.add_caster(name, make_book(), slots={3: 1})
+    pool.cast("b", "Fireball")
+    assert pool.casters_ready("Fireball") == {"a", "c"}
+    pool.remove_caster("b")
+    assert pool.advance() == [] and pool.advance() == []
+    assert pool.casters_ready("Fireball") == {"a", "c"}
+    assert len(pool) == 2
+    with pytest.raises(ValueError):
+        pool.add_caster("a", make_book(), slots={})
+
+
+def naive_ready(state, book, turn):
+    """Readiness recomputed from scratch, for comparison."""
+    slots, cooling_until, recharges = state
+    left = {level: count + sum(1 for due in recharges[level] if due <= turn)
+            for level, count in slots.items()}
+    return {spell.name for spell in book.spells
+            if cooling_until.get(spell.name, 0) <= turn
+            and (spell.level == 0 or left.get(spell.level, 0) > 0)}
+
+
+def test_pool_agrees_with_a_per_turn_scan():
+    rng = random.Random(7)
+    book = make_book()
+    maximum = {1: 2, 3: 1}
+    pool = CasterPool(slot_recharge=6, wheel_slots=4, wheel_levels=2)
+    states = {}
+    for caster in range(20):
+        pool.add_caster(caster, book, maximum)
+        states[caster] = (dict(maximum), {}, {1: [], 3: []})
+    for _ in range(200):
+        turn = pool.turn
+        for caster, (slots, cooling, recharges) in states.items():
+            ready = naive_ready(states[caster], book, turn)
+            assert pool.ready(caster) == ready
+            roll = rng.random()
+            if roll < 0.3 and ready:
+                name = rng.choice(sorted(ready))
+                spell = next(s for s in book.spells if s.name == name)
+                pool.cast(caster, spell.name)
+                if spell.cooldown:
+                    cooling[spell.name] = turn + spell.cooldown
+                if spell.level:
+                    for level in recharges:
+                        slots[level] += sum(1 for due in recharges[level] if due <= turn)
+                        recharges[level] = [due for due in recharges[level] if due > turn]
+                    slots[spell.level] -= 1
+                    recharges[spell.level].append(turn + 6)
+            elif roll < 0.33:
+                pool.rest(caster)
+                slots.update(maximum)
+                for pending in recharges.values():
+                    pending.clear()
+        pool.advance()
+    for spell in book.spells:
+        assert pool.casters_ready(spell.name) == {
+            caster for caster in states
+            if spell.name in naive_ready(states[caster], book, pool.turn)}
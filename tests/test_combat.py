@@ -68,3 +68,143 @@ def test_combat_stops_on_death_no_overflow():
         # Ensure combat ended due to death rather than max rounds
         assert not (log and isinstance(log[-1], dict) and log[-1].get("event") == "max_rounds_reached")
 
+
+
+class ScriptedHero(Character):
+    """A Character subclass, so Combat.run takes the generic path."""
+
+
+def _armed_pair(player_cls, weapons):
+    player = player_cls("Hero", "Human", 10)
+    player.hp, player.attack, player.defense = 18, 2, 12
+    enemy = Enemy("Goblin", "Goblin", 7)
+    enemy.hp, enemy.attack, enemy.defense = 16, 1, 13
+    if weapons:
+        player.equip("Longsword")
+        enemy.equip("Handaxe")
+    return player, enemy
+
+
+def test_fast_path_matches_generic_path():
+    from dndgame import dice
+
+    verbose = dice.is_verbose()
+    try:
+        for quiet, buffered, weapons, max_rounds in [
+            (True, False, False, 300), (True, True, True, 300),
+            (True, False, True, 3), (False, False, False, 300),
+        ]:
+            dice.set_verbose(not quiet)
+            dice.set_buffered(buffered)
+            for seed in range(20):
+                results = []
+                for cls in (Character, ScriptedHero):
+                    combat = Combat(*_armed_pair(cls, weapons), max_rounds=max_rounds)
+                    dice.seed(seed)
+                    winner, log = combat.run()
+                    results.append((winner, log, combat.rounds, combat.player.hp,
+                                    combat.enemy.hp, combat.attacker.name, dice.getstate()))
+                assert results[0] == results[1]
+    finally:
+        dice.set_verbose(verbose)
+        dice.set_buffered(False)
+
+
+def test_fast_path_matches_generic_path_when_no_round_is_played():
+    for max_rounds, player_hp, enemy_hp in [(0, 18, 16), (300, 0, 16), (300, 18, 0),
+                                             (300, 0, 0), (0, 0, 16)]:
+        results = []
+        for cls in (Character, ScriptedHero):
+            player, enemy = _armed_pair(cls, weapons=False)
+            player.hp, enemy.hp = player_hp, enemy_hp
+            combat = Combat(player, enemy, max_rounds=max_rounds)
+            winner, log = combat.run()
+            results.append((winner, log, combat.rounds, player.hp, enemy.hp,
+                            combat.attacker.name, combat.defender.name))
+        assert results[0] == results[1]
+        assert results[0][2] == 0 and results[0][5] == "Hero"
+
+
+def test_run_without_log():
+    player, enemy = _armed_pair(Character, weapons=False)
+    combat = Combat(player, enemy, max_rounds=4, keep_log=False)
+    player.defense = enemy.defense = 100
+    winner, log = combat.run()
+    assert winner == "Player"
+    assert log == [{"event": "max_rounds_reached", "rounds": 4}]
+
+    generic = Combat(*_armed_pair(ScriptedHero, weapons=False), keep_log=False)
+    generic.run()
+    assert all("event" in entry for entry in generic.log)
+
+
+def test_damage_counts_match_the_log_on_both_paths():
+    from dndgame import dice
+
+    verbose = dice.is_verbose()
+    dice.set_verbose(False)
+    try:
+        for cls in (Character, ScriptedHero):
+            counts = [0] * 6
+            expected = [0] * 6
+            for seed in range(10):
+                combat = Combat(*_armed_pair(cls, weapons=True))
+                combat.damage_counts = counts
+                dice.seed(seed)
+                _, log = combat.run()
+                for event in log:
+                    if "event" in event:
+                        continue
+                    expected[min(event["dmg"], 5)] += 1
+            assert counts == expected and sum(counts) > 0
+    finally:
+        dice.set_verbose(verbose)
+
+
+def test_observer_hooks():
+    import pytest
+
+    player, enemy = _armed_pair(Character, weapons=False)
+    player.attack = 8  # hits hard, so the fight ends quickly
+    combat = Combat(player, enemy)
+    seen = {hook: [] for hook in ("round", "attack", "crit", "death", "cap")}
+    combat.subscribe("on_round_start", lambda c, n: seen["round"].append(n))
+    combat.subscribe("on_attack", lambda c, e: seen["attack"].append(e))
+    combat.subscribe("on_crit", lambda c, e: seen["crit"].append(e))
+    combat.subscribe("on_death", lambda c, who: seen["death"].append(who))
+    combat.subscribe("on_max_rounds", lambda c, n: seen["cap"].append(n))
+
+    with patch("dndgame.dice.roll", side_effect=[20, 1, 20, 1, 20]):
+        winner, log = combat.run()
+    assert winner == "Player"
+    assert seen["round"] == [1, 2, 3]
+    assert seen["attack"] == log
+    assert seen["crit"] == [log[0], log[2]]
+    assert seen["death"] == [enemy]
+    assert seen["cap"] == []
+
+    with pytest.raises(ValueError):
+        combat.subscribe("on_teatime", print)
+
+
+def test_observers_fire_at_round_cap_and_detach():
+    player, enemy = _armed_pair(Character, weapons=False)
+    player.defense = enemy.defense = 100
+    combat = Combat(player, enemy, max_rounds=5, keep_log=False)
+    attacks = []
+    caps = []
+    stop_attacks = combat.subscribe("on_attack", lambda c, e: attacks.append(e["dmg"]))
+    stop_caps = combat.subscribe("on_max_rounds", lambda c, n: caps.append(n))
+    combat.run()
+    assert attacks == [0] * 5 and caps == [5]
+    # The log stays empty apart from the cap marker; observers saw every attack
+    assert len(combat.log) == 1
+
+    # Without subscribers the class step and the fast path are back
+    stop_attacks()
+    stop_caps()
+    stop_caps()
+    assert "step" not in vars(combat)
+    player.hp = enemy.hp = 10
+    combat.run()
+    assert attacks == [0] * 5 and caps == [5]
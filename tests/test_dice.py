@@ -1,5 +1,20 @@
+from fractions import Fraction
 from unittest.mock import patch
-from dndgame.dice import roll, roll_with_advantage, roll_with_disadvantage
+
+import pytest
+
+from dndgame import dice
+from dndgame.dice import (
+    BUFFERED_SIDES,
+    DiceTerm,
+    DieBuffer,
+    compile_dice,
+    parse_dice,
+    roll,
+    roll_expression,
+    roll_with_advantage,
+    roll_with_disadvantage,
+)
 
 
 def test_roll():
@@ -54,3 +69,122 @@ def test_roll_with_disadvantage():
     ):  # random.randint will first return 6, then 2 when called in this context
         result = roll_with_disadvantage(6)
         assert result == 2  # 2 is the lowest of the two rolls
+
+
+def test_parse_dice():
+    """Test parsing dice notation into terms and a modifier."""
+    assert parse_dice("2d6+3") == ((DiceTerm(2, 6, 2),), 3)
+    assert parse_dice("4d6kh3") == ((DiceTerm(4, 6, 3),), 0)
+    assert parse_dice("1d20adv+5") == ((DiceTerm(2, 20, 1),), 5)
+    assert parse_dice("D20 dis") == ((DiceTerm(2, 20, 1, highest=False),), 0)
+    assert parse_dice("2d6kl1 - 1d4 - 2") == (
+        (DiceTerm(2, 6, 1, highest=False), DiceTerm(1, 4, 1, sign=-1)),
+        -2,
+    )
+
+
+@pytest.mark.parametrize("expression", ["", "2d", "d0", "2d20adv", "4d6kh5", "2d6++"])
+def test_parse_dice_rejects_malformed(expression):
+    """Test that malformed expressions raise ValueError."""
+    with pytest.raises(ValueError):
+        parse_dice(expression)
+
+
+def test_compile_dice_is_cached():
+    """Test that compiled expressions are reused from the LRU cache."""
+    assert compile_dice("3d8+1") is compile_dice("3d8+1")
+
+
+def test_expression_roll():
+    """Test compiled evaluation with mocked random values."""
+    with patch("random.randint", side_effect=[2, 5, 6, 1]):
+        assert roll_expression("2d6+3") == 10  # 2 + 5 + 3
+        assert compile_dice("1d20dis").roll() == 1  # lowest of 6 and 1
+
+    with patch("random.randint", side_effect=[1, 6, 4, 3]):
+        assert compile_dice("4d6kh3").roll() == 13  # drops the 1
+
+    rolls = compile_dice("1d20adv+5").roll_many(200)
+    assert len(rolls) == 200
+    assert all(6 <= r <= 25 for r in rolls)
+
+
+def test_expression_distribution():
+    """Test exact distributions of dice expressions."""
+    dist = compile_dice("2d6").distribution()
+    assert sum(dist.values()) == 1
+    assert dist[7] == Fraction(1, 6)
+    assert min(dist) == 2 and max(dist) == 12
+
+    assert compile_dice("2d6+3").mean() == 10
+    # Advantage on a d20 averages 13.825
+    assert compile_dice("1d20adv").mean() == Fraction(553, 40)
+    assert compile_dice("1d20adv").at_least(20) == Fraction(39, 400)
+    # 4d6 drop lowest averages 15869/1296 (about 12.24)
+    assert compile_dice("4d6kh3").mean() == Fraction(15869, 1296)
+    assert compile_dice("1d4-1d4").mean() == 0
+
+
+@pytest.fixture
+def buffered():
+    """Enable buffered rolling for one test."""
+    dice.set_buffered(True)
+    yield
+    dice.set_buffered(False)
+    dice.seed()
+
+
+@pytest.mark.parametrize("sides", BUFFERED_SIDES)
+def test_die_buffer_is_exactly_uniform(sides):
+    """Test that every face maps from the same number of byte values."""
+    buffer = DieBuffer(sides, size=256)
+    with patch("random.randbytes", return_value=bytes(range(256))):
+        faces = buffer.draw_many(256 - 256 % sides)
+    assert sorted(set(faces)) == list(range(1, sides + 1))
+    assert all(faces.count(f) == faces.count(1) for f in range(1, sides + 1))
+
+
+def test_die_buffer_refills_lazily():
+    """Test draws spanning several refills."""
+    buffer = DieBuffer(6, size=16)
+    rolls = buffer.draw_many(100) + [buffer.draw() for _ in range(50)]
+    assert len(rolls) == 150
+    assert all(1 <= r <= 6 for r in rolls)
+
+
+def test_buffered_rolls_are_reproducible(buffered):
+    """Test that seeding resets the buffers."""
+    dice.seed(42)
+    first = [roll(20, 1) for _ in range(10)] + [roll(6, 3) for _ in range(10)]
+    dice.seed(42)
+    second = [roll(20, 1) for _ in range(10)] + [roll(6, 3) for _ in range(10)]
+    assert first == second
+    assert all(3 <= r <= 18 for r in first[10:])
+
+
+def test_buffered_state_round_trip(buffered):
+    """Test capturing and restoring buffered dice state."""
+    dice.seed(7)
+    roll(20, 1)
+    state = dice.getstate()
+    expected = [roll(20, 1) for _ in range(5)]
+    dice.setstate(state)
+    assert [roll(20, 1) for _ in range(5)] == expected
+
+
+def test_unbuffered_sides_fall_back_to_randint(buffered):
+    """Test that unusual dice still use random.randint."""
+    with patch("random.randint", return_value=77):
+        assert roll(100, 1) == 77
+
+
+def test_set_verbose(capsys):
+    """Test silencing the roll printout."""
+    dice.set_verbose(False)
+    try:
+        roll(6, 2)
+    finally:
+        dice.set_verbose(True)
+    assert capsys.readouterr().out == ""
+    roll(6, 2)
+    assert "Rolling 2d6" in capsys.readouterr().out
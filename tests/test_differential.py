@@ -0,0 +1,241 @@
+"""Differential tests: accelerated paths against the reference rules.
+
+The reference implementations are `Combat.run` driven by per-die
+`random.randint` calls through `dice.roll`. Every faster path is checked
+against them: exactly with matched seeds where both consume the same
+random stream, and with chi-squared or two-sample Kolmogorov-Smirnov
+tests at a 0.1% significance level where they do not. Matchups are drawn
+from a seeded generator, so failures are reproducible.
+"""
+
+import math
+import random
+
+import pytest
+
+from dndgame import dice
+from dndgame.character import Character
+from dndgame.combat import Combat
+from dndgame.enemy import Enemy
+from dndgame.parallel import simulate
+from dndgame.scheduler import CombatScheduler
+from dndgame.solver import solve_combat
+from dndgame.weapons import WEAPONS, attack_table
+
+# Standard normal quantile for a one-sided 0.1% tail
+Z_CRITICAL = 3.09
+# Kolmogorov distribution quantile for a 0.1% significance level
+KS_CRITICAL = 1.95
+
+
+@pytest.fixture(autouse=True)
+def quiet_dice():
+    verbose = dice.is_verbose()
+    dice.set_verbose(False)
+    yield
+    dice.set_verbose(verbose)
+    dice.set_buffered(False)
+
+
+def chi_squared_critical(df):
+    """Wilson-Hilferty approximation of the chi-squared 99.9% quantile."""
+    h = 2 / (9 * df)
+    return df * (1 - h + Z_CRITICAL * math.sqrt(h)) ** 3
+
+
+def assert_fits(counts, probabilities):
+    """Chi-squared goodness of fit of observed counts to exact probabilities.
+
+    Bins with an expected count under 5 are pooled into their neighbours.
+    """
+    n = sum(counts.values())
+    statistic = 0.0
+    bins = 0
+    observed = expected = 0.0
+    for key in sorted(set(counts) | set(probabilities)):
+        observed += counts.get(key, 0)
+        expected += probabilities.get(key, 0.0) * n
+        if expected >= 5:
+            statistic += (observed - expected) ** 2 / expected
+            bins += 1
+            observed = expected = 0.0
+    if expected > 0:
+        statistic += (observed - expected) ** 2 / expected
+        bins += 1
+    df = max(1, bins - 1)
+    assert statistic < chi_squared_critical(df), (statistic, df)
+
+
+def assert_same_distribution(a, b):
+    """Two-sample Kolmogorov-Smirnov test on two histograms over 0..len-1."""
+    n, m = sum(a), sum(b)
+    cdf_a = cdf_b = 0
+    largest = 0.0
+    for count_a, count_b in zip(a, b):
+        cdf_a += count_a
+        cdf_b += count_b
+        largest = max(largest, abs(cdf_a / n - cdf_b / m))
+    assert largest < KS_CRITICAL * math.sqrt((n + m) / (n * m)), largest
+
+
+def random_matchup(rng, armed=False, max_rounds=60):
+    player = Character("Hero", "Human", 10)
+    player.hp, player.attack, player.defense = rng.randint(4, 24), rng.randint(-1, 5), rng.randint(8, 16)
+    enemy = Enemy("Foe", "Goblin", 7)
+    enemy.hp, enemy.attack, enemy.defense = rng.randint(4, 24), rng.randint(-1, 5), rng.randint(8, 16)
+    if armed:
+        player.equip(rng.choice(list(WEAPONS)))
+        enemy.equip(rng.choice(list(WEAPONS)))
+    return Combat(player, enemy, max_rounds=max_rounds)
+
+
+def run_reference(combat, fights, max_damage=64):
+    """Run fights with Combat.run and build parallel-style histograms."""
+    player_hp, enemy_hp = combat.player.hp, combat.enemy.hp
+    wins = 0
+    rounds = [0] * (combat.max_rounds + 1)
+    damage = [0] * (max_damage + 1)
+    for _ in range(fights):
+        combat.player.hp, combat.enemy.hp = player_hp, enemy_hp
+        winner, log = combat.run()
+        wins += winner == "Player"
+        rounds[combat.rounds] += 1
+        for event in log:
+            if "dmg" in event:
+                damage[min(event["dmg"], max_damage)] += 1
+    combat.player.hp, combat.enemy.hp = player_hp, enemy_hp
+    return wins, rounds, damage
+
+
+@pytest.mark.parametrize("sides", dice.BUFFERED_SIDES)
+def test_buffered_faces_are_uniform(sides):
+    dice.seed(sides)
+    dice.set_buffered(True)
+    counts = {}
+    for face in (dice.roll(sides, 1) for _ in range(20000)):
+        counts[face] = counts.get(face, 0) + 1
+    assert set(counts) == set(range(1, sides + 1))
+    assert_fits(counts, {face: 1 / sides for face in range(1, sides + 1)})
+
+
+@pytest.mark.parametrize("expression", ["3d6", "4d6kh3", "1d20adv+5", "2d8+1d4-1"])
+def test_compiled_dice_match_exact_distribution(expression):
+    compiled = dice.compile_dice(expression)
+    probabilities = {k: float(p) for k, p in compiled.distribution().items()}
+    for buffered in (False, True):
+        dice.seed(1)
+        dice.set_buffered(buffered)
+        counts = {}
+        for total in compiled.roll_many(20000):
+            counts[total] = counts.get(total, 0) + 1
+        assert_fits(counts, probabilities)
+
+
+def test_compiled_dice_match_roll_with_matched_seed():
+    compiled = dice.compile_dice("3d6")
+    dice.seed(42)
+    fast = [compiled.roll() for _ in range(500)]
+    dice.seed(42)
+    reference = [dice.roll(6, 3) for _ in range(500)]
+    assert fast == reference
+
+
+def test_solver_matches_reference_combat():
+    rng = random.Random(2024)
+    for trial in range(6):
+        combat = random_matchup(rng, armed=trial % 2 == 1)
+        odds = solve_combat(combat)
+        dice.seed(trial)
+        fights = 2000
+        wins, rounds, _ = run_reference(combat, fights)
+        assert_fits({"player": wins, "enemy": fights - wins},
+                    {"player": odds.player_win, "enemy": odds.enemy_win})
+        mean = sum(r * n for r, n in enumerate(rounds)) / fights
+        variance = sum(n * (r - mean) ** 2 for r, n in enumerate(rounds)) / (fights - 1)
+        assert abs(mean - odds.expected_rounds) < Z_CRITICAL * math.sqrt(variance / fights) + 1e-9
+
+
+def test_weapon_tables_match_combat_damage():
+    rng = random.Random(7)
+    for _ in range(4):
+        combat = random_matchup(rng, armed=True)
+        player, enemy = combat.player, combat.enemy
+        enemy.hp = 10 ** 6  # the player attacks every other round
+        table = attack_table(player.weapon, player.attack, enemy.defense, True)
+        dice.seed(3)
+        combat.start()
+        counts = {}
+        while combat.rounds < 8000:
+            event = combat.step()
+            if event["attacker"] == player.name:
+                counts[event["dmg"]] = counts.get(event["dmg"], 0) + 1
+            player.hp = 10 ** 6
+        probabilities = dict(zip(table.values, (
+            b - a for a, b in zip([0.0] + table.cum_weights, table.cum_weights))))
+        assert_fits(counts, probabilities)
+
+
+def test_parallel_worker_matches_buffered_reference_with_matched_seed():
+    combat = random_matchup(random.Random(11))
+    fights = 300
+    result = simulate(combat.player, combat.enemy, fights, workers=1,
+                      max_rounds=combat.max_rounds, seed=5)
+    dice.set_buffered(True)
+    dice.seed(5)
+    wins, rounds, damage = run_reference(combat, fights)
+    assert result.player_wins == wins
+    assert result.rounds_histogram == rounds
+    assert result.damage_histogram == damage
+
+
+def test_parallel_and_buffered_match_reference_distribution():
+    rng = random.Random(99)
+    for trial in range(3):
+        combat = random_matchup(rng, armed=trial == 1)
+        fights = 3000
+        dice.seed(trial)
+        wins, rounds, damage = run_reference(combat, fights)
+        result = simulate(combat.player, combat.enemy, fights, workers=2,
+                          max_rounds=combat.max_rounds, seed=100 + trial)
+        assert_same_distribution(rounds, result.rounds_histogram)
+        assert_same_distribution(damage, result.damage_histogram)
+        pooled = (wins + result.player_wins) / (2 * fights)
+        spread = math.sqrt(2 * pooled * (1 - pooled) / fights) or 1.0
+        assert abs(wins - result.player_wins) / fights < Z_CRITICAL * spread
+
+
+def test_scheduler_matches_run_with_matched_seed():
+    rng = random.Random(5)
+    for _ in range(5):
+        combat = random_matchup(rng, armed=True)
+        player_hp, enemy_hp = combat.player.hp, combat.enemy.hp
+        dice.seed(8)
+        winner, log = combat.run()
+        expected = (winner, list(log))
+
+        combat.player.hp, combat.enemy.hp = player_hp, enemy_hp
+        dice.seed(8)
+        scheduler = CombatScheduler()
+        scheduler.submit("only", combat)
+        (done,) = scheduler.run_until_idle()
+        assert (done.winner, combat.log) == expected
+
+
+def test_scheduler_matches_run_for_an_already_finished_combat():
+    for max_rounds, enemy_hp in [(300, 0), (0, 5), (0, 0)]:
+        results = []
+        for play in ("run", "scheduler"):
+            combat = random_matchup(random.Random(3), armed=True)
+            combat.max_rounds = max_rounds
+            combat.enemy.hp = enemy_hp
+            dice.seed(8)
+            if play == "run":
+                winner, _ = combat.run()
+            else:
+                scheduler = CombatScheduler(max_active=1)
+                scheduler.submit("only", combat)
+                (done,) = scheduler.run_until_idle()
+                winner = done.winner
+            results.append((winner, list(combat.log), combat.rounds,
+                            combat.player.hp, combat.enemy.hp, dice.getstate()))
+        assert results[0] == results[1]
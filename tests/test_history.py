@@ -0,0 +1,82 @@
+import pytest
+
+from dndgame.adventure import Adventure
+from dndgame.character import Character
+from dndgame.combat import Combat
+from dndgame.enemy import Enemy
+from dndgame.history import History
+
+
+def test_history_spills_and_reads_back(tmp_path):
+    path = tmp_path / "spill.jsonl"
+    with History(capacity=8, path=str(path)) as history:
+        for n in range(100):
+            history.append({"n": n})
+        assert len(history) == 100
+        assert len(history.recent()) <= 8
+        assert history.spilled == 100 - len(history.recent())
+        assert path.stat().st_size > 0
+
+        assert history[0] == {"n": 0}
+        assert history[57] == {"n": 57}
+        assert history[-1] == {"n": 99}
+        assert history[10:13] == [{"n": 10}, {"n": 11}, {"n": 12}]
+        assert [entry["n"] for entry in history] == list(range(100))
+        assert {"n": 3} in history
+        assert history.recent(2) == [{"n": 98}, {"n": 99}]
+        with pytest.raises(IndexError):
+            history[100]
+
+
+def test_history_memory_stays_bounded():
+    history = History(capacity=16)
+    for n in range(10000):
+        history.append(n)
+        assert len(history._buffer) <= 16
+    assert history[1234] == 1234
+    history.close()
+
+    with pytest.raises(ValueError):
+        History(capacity=1)
+
+
+def test_adventure_history(tmp_path):
+    player = Character("Hero", "Human", 10)
+    adventure = Adventure("Intro", "A small quest.", player, history_capacity=2,
+                          history_dir=str(tmp_path))
+    for key in ("goblin_ambush", "treasure_room", "dragon_lair"):
+        adventure.complete_encounter(key)
+    assert list(adventure.completed_encounters) == [
+        "goblin_ambush", "treasure_room", "dragon_lair"]
+    assert adventure.completed_encounters.spilled > 0
+    assert adventure.get_available_encounters_list() == []
+    assert not adventure.choose_encounter("goblin_ambush")
+    with pytest.raises(ValueError):
+        adventure.complete_encounter("goblin_ambush")
+
+    # The status lists a plain copy of the in-memory tail, plus the total
+    status = adventure.get_adventure_status()
+    assert status["completed_encounters"] == adventure.completed_encounters.recent()
+    assert status["completed_count"] == 3
+    status["completed_encounters"].clear()
+    assert len(adventure.completed_encounters) == 3
+
+    for n in range(5):
+        adventure.record_combat("Player", [{"event": "max_rounds_reached", "rounds": n}])
+    assert len(adventure.combat_history) == 5
+    assert adventure.combat_history[0]["log"][0]["rounds"] == 0
+    assert adventure.combat_history[0]["rounds"] == 0
+    assert (tmp_path / "combats.jsonl").exists()
+    adventure.close()
+    assert adventure.completed_encounters._file is None
+    assert adventure.combat_history._file is None
+
+
+def test_recorded_rounds_exclude_the_max_rounds_event():
+    player = Character("Hero", "Human", 10)
+    player.hp, player.attack, player.defense = 50, 0, 30
+    enemy = Enemy("Orc", "Orc", 10)
+    enemy.hp, enemy.attack, enemy.defense = 50, 0, 30
+    adventure = Adventure("Intro", "A small quest.", player)
+    adventure.record_combat(*Combat(player, enemy, max_rounds=3).run())
+    assert adventure.combat_history[0]["rounds"] == 3
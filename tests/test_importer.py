@@ -0,0 +1,113 @@
+import io
+import json
+from unittest.mock import patch
+
+import pytest
+
+from dndgame import dice
+from dndgame.importer import CharacterImporter, import_characters
+from dndgame.races import RACES
+
+STATS = {"STR": 14, "DEX": 12, "CON": 13, "INT": 10, "WIS": 8, "CHA": 15}
+
+
+@pytest.fixture
+def clean_races():
+    saved = dict(RACES)
+    yield
+    RACES.clear()
+    RACES.update(saved)
+
+
+def jsonl(*records):
+    return io.StringIO("".join(
+        (r if isinstance(r, str) else json.dumps(r)) + "\n" for r in records))
+
+
+def test_import_jsonl_with_errors(clean_races):
+    source = jsonl(
+        {"name": "Ada", "race": "dwarf", "stats": STATS, "weapon": "longsword"},
+        {"name": "Mira", "race": "Tiefling", "stats": STATS,
+         "race_bonuses": {"CHA": 2, "INT": 1}, "experience": 900},
+        {"name": "Ash", "race": "Tiefling", "stats": STATS},
+        {"name": "Odd", "race": "Tiefling", "race_bonuses": {"STR": 5}},
+        "not json",
+        {"race": "Human"},
+        {"name": "Lost", "race": "Orcish"},
+        {"name": "Weak", "race": "Elf", "stats": {"STR": 10}},
+        {"name": "Spoon", "race": "Elf", "weapon": "Spoon"},
+    )
+    characters, report = import_characters(source, "jsonl", chunk_size=3)
+
+    assert [c.name for c in characters] == ["Ada", "Mira", "Ash"]
+    ada, mira, ash = characters
+    assert ada.race == "Dwarf" and ada.stats["CON"] == 15 and ada.weapon.name == "Longsword"
+    assert mira.stats["CHA"] == 17 and mira.level == 3
+    assert ash.stats == mira.stats and ash.level == 1
+    assert RACES["Tiefling"] == {"CHA": 2, "INT": 1}
+    assert report.races_registered == ["Tiefling"]
+    assert (report.records, report.imported) == (9, 3)
+    assert [e.line for e in report.errors] == [4, 5, 6, 7, 8, 9]
+    assert "Conflicting" in report.errors[0].message
+    assert report.errors[1].message.startswith("Invalid JSON")
+
+
+def test_custom_race_registered_once(clean_races):
+    records = [{"name": f"Gob{n}", "race": "Hobgoblin", "race_bonuses": {"CON": 1}}
+               for n in range(50)]
+    with patch("dndgame.importer.register_race") as register:
+        importer = CharacterImporter(chunk_size=1000)
+        chunks = list(importer.iter_chunks(jsonl(*records), "jsonl"))
+    assert register.call_count == 1
+    assert sum(len(chunk) for chunk in chunks) == 50
+
+
+def test_invalid_record_does_not_register_its_race(clean_races):
+    source = jsonl(
+        {"name": "Vex", "race": "Genasi", "race_bonuses": {"CON": 2}, "base_hp": 0},
+        {"name": "Zul", "race": "Genasi", "race_bonuses": {"STR": 1}},
+    )
+    characters, report = import_characters(source, "jsonl")
+    assert [c.name for c in characters] == ["Zul"]
+    assert RACES["Genasi"] == {"STR": 1}
+    assert report.races_registered == ["Genasi"]
+    assert [e.line for e in report.errors] == [1]
+
+
+def test_import_csv_from_path(tmp_path, clean_races):
+    path = tmp_path / "party.csv"
+    path.write_text(
+        "name,race,base_hp,STR,DEX,CON,INT,WIS,CHA,bonus_WIS,experience\n"
+        "Kell,Firbolg,12,15,10,14,8,13,10,2,300\n"
+        "Rook,Human,,,,,,,,,\n"
+        "Bad,Human,lots,,,,,,,,\n"
+    )
+    characters, report = import_characters(str(path), seed=5)
+    assert [c.name for c in characters] == ["Kell", "Rook"]
+    kell, rook = characters
+    assert kell.stats["WIS"] == 15 and kell.level == 2
+    assert kell.max_hp == 12 + 2 + 6 + 2
+    assert len(rook.stats) == 6  # rolled
+    assert report.errors[0].line == 4
+
+    # Rolled stats are reproducible with a seed, which leaves the caller's RNG alone
+    dice.seed(11)
+    state = dice.getstate()
+    again, _ = import_characters(str(path), seed=5)
+    assert again[1].stats == rook.stats
+    assert dice.getstate() == state
+
+
+def test_parallel_import_matches_serial(clean_races):
+    records = [{"name": f"Hero{n}", "race": "Aasimar" if n % 2 else "Elf",
+                "race_bonuses": {"CHA": 2} if n % 2 else None}
+               for n in range(40)]
+    for record in records:
+        if record["race_bonuses"] is None:
+            del record["race_bonuses"]
+    serial, _ = import_characters(jsonl(*records), "jsonl", chunk_size=7, seed=3)
+    parallel, report = import_characters(jsonl(*records), "jsonl", chunk_size=7,
+                                         seed=3, workers=2)
+    assert report.imported == 40
+    assert [(c.name, c.race, c.stats) for c in parallel] == \
+        [(c.name, c.race, c.stats) for c in serial]
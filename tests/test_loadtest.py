@@ -0,0 +1,38 @@
+import json
+
+from dndgame.loadtest import Script, StepStats, main, run_load
+
+
+def test_step_stats_percentiles():
+    stats = StepStats.of([i / 100 for i in range(1, 101)])
+    assert (stats.samples, stats.p50, stats.p95, stats.p99) == (100, 0.51, 0.96, 1.0)
+    assert StepStats.of([]) == (0, 0.0, 0.0, 0.0)
+
+
+def test_scripted_players_drive_the_game():
+    fighter = Script.from_dict({
+        "name": "fighter",
+        "steps": [["name", "Ann"], ["race", "2"]] + [["fight", "1"]] * 12 + [["quit", "3"]],
+        "replies": {"0 HP": ["rest", "y"]},
+        "think": [0.0, 0.002],
+    })
+    leaver = Script("leaver", tuple(fighter.steps[:3]))  # hangs up mid-game
+    report = run_load([fighter, leaver], players=2, sessions=2, seed=7)
+    assert (report.sessions, report.errors) == (2, 0)
+    assert report.steps["start"].samples == 2
+    assert report.steps["fight"].samples == 12 + 1
+    assert "rest" in report.steps  # seed 7 loses a fight and rests
+    assert report.sessions_per_second > 0
+
+
+def test_json_report(tmp_path, capsys):
+    script = tmp_path / "scripts.json"
+    script.write_text(json.dumps([{"name": "quick", "steps": [
+        ["name", "Bo"], ["race", "1"], ["view", "2"], ["quit", "3"]]}]))
+    output = tmp_path / "report.json"
+    main(["--players", "1", "--sessions", "1", "--seed", "1",
+          "--script", str(script), "--output", str(output)])
+    report = json.loads(output.read_text())
+    assert report["sessions"] == 1
+    assert set(report["steps"]) == {"start", "name", "race", "view", "quit"}
+    assert set(report["steps"]["view"]) == {"samples", "p50_ms", "p95_ms", "p99_ms"}
@@ -0,0 +1,48 @@
+import json
+
+from dndgame import dice
+from dndgame.memprof import Workload, compare, main, profile
+
+
+def test_report_attributes_entities_and_logs():
+    report = profile(Workload(fights=50, seed=2))
+    entities, combats = report.phases
+    assert (entities.units, combats.units) == (100, 50)
+    assert entities.types["dict Character.stats"].objects == 50
+    assert entities.types["Enemy"].objects == 50
+    assert {"dndgame.character", "dndgame.enemy"} <= set(entities.modules)
+    # Combatants were counted by the first phase, not again through Combat.player
+    assert "Character" not in combats.types
+    assert combats.types["list Combat.log"].objects == 50
+    assert combats.types["dict Combat.log[]"].objects > 50
+    assert next(iter(combats.modules)) == "dndgame.combat"
+    assert combats.peak >= combats.retained > 0
+
+
+def test_profile_leaves_the_dice_rng_alone():
+    dice.seed(5)
+    state = dice.getstate()
+    profile(Workload(fights=5, seed=2))
+    assert dice.getstate() == state
+
+
+def test_logless_combats_are_cheaper():
+    logged = profile(Workload(fights=50, seed=2)).phases[1]
+    logless = profile(Workload(fights=50, keep_log=False, seed=2)).phases[1]
+    assert "dict Combat.log[]" not in logless.types
+    assert logless.per_unit < logged.per_unit / 2
+
+
+def test_json_report_and_comparison(tmp_path, capsys):
+    baseline = tmp_path / "old.json"
+    main(["--fights", "20", "--output", str(baseline)])
+    old = json.loads(baseline.read_text())
+    assert old["workload"]["fights"] == 20
+    assert old["phases"]["combats"]["types"]["list Combat.log"]["objects"] == 20
+
+    new = profile(Workload(fights=20, keep_log=False)).to_dict()
+    assert compare(old, new)["combats"]["bytes_per_unit"] < 0
+    assert compare(old, old)["entities"] == {"bytes_per_unit": 0.0, "peak_bytes": 0.0}
+
+    main(["--fights", "20", "--no-log", "--baseline", str(baseline)])
+    assert "combats: bytes_per_unit -" in capsys.readouterr().err
@@ -0,0 +1,105 @@
+import os
+import time
+import timeit
+import urllib.request
+
+import pytest
+
+from dndgame import metrics
+from dndgame.character import Character
+from dndgame.combat import Combat
+from dndgame.enemy import Enemy
+from dndgame.metrics import MetricsRegistry, MetricsServer
+
+
+def test_render_prometheus_text():
+    registry = MetricsRegistry()
+    counter = registry.counter("fights_total", "Fights run.")
+    gauge = registry.gauge("sessions", "Open sessions.")
+    histogram = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+    counter.inc(3)
+    gauge.inc()
+    gauge.inc()
+    gauge.dec()
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(value)
+
+    text = registry.render()
+    assert "# TYPE fights_total counter\nfights_total 3\n" in text
+    assert "# TYPE sessions gauge\nsessions 1\n" in text
+    assert 'latency_seconds_bucket{le="0.1"} 1\n' in text
+    assert 'latency_seconds_bucket{le="1"} 2\n' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 3\n' in text
+    assert "latency_seconds_count 3\n" in text
+    assert registry.snapshot()["latency_seconds_sum"] == pytest.approx(5.55)
+
+
+def test_render_keeps_full_precision():
+    registry = MetricsRegistry()
+    registry.counter("big_total", "Big.").inc(123456789)
+    registry.gauge("ratio", "Ratio.").set(0.1234567891)
+    registry.gauge("limit", "Limit.").set(float("inf"))
+
+    text = registry.render()
+    assert "big_total 123456789\n" in text
+    assert "ratio 0.1234567891\n" in text
+    assert "limit +Inf\n" in text
+
+
+def test_duplicate_metric_rejected():
+    registry = MetricsRegistry()
+    registry.counter("x", "X.")
+    with pytest.raises(ValueError):
+        registry.gauge("x", "X again.")
+
+
+def test_histogram_timer():
+    histogram = MetricsRegistry().histogram("t", "T.")
+    with histogram.time():
+        pass
+    assert histogram.count == 1
+    assert 0 <= histogram.sum < 1
+
+
+def test_combat_is_instrumented():
+    started = metrics.COMBATS_STARTED.value
+    finished = metrics.COMBATS_FINISHED.value
+    runs = metrics.COMBAT_DURATION.count
+
+    player = Character("Hero", "Human", 10)
+    player.hp, player.attack, player.defense = 12, 2, 10
+    enemy = Enemy("Goblin", "Goblin", 7)
+    enemy.hp, enemy.attack, enemy.defense = 7, 0, 15
+    Combat(player, enemy).run()
+
+    assert metrics.COMBATS_STARTED.value == started + 1
+    assert metrics.COMBATS_FINISHED.value == finished + 1
+    assert metrics.COMBAT_DURATION.count == runs + 1
+
+
+@pytest.mark.skipif(not os.environ.get("DNDGAME_BENCHMARK"),
+                    reason="wall-clock benchmark; set DNDGAME_BENCHMARK=1 to run")
+def test_recording_overhead_is_sub_microsecond():
+    registry = MetricsRegistry()
+    counter = registry.counter("c", "C.")
+    histogram = registry.histogram("h", "H.")
+    n = 2000
+    # Best of many short runs, so a busy machine does not fail the test
+    assert min(timeit.repeat(counter.inc, number=n, repeat=50)) / n < 1e-6
+    assert min(timeit.repeat(lambda: histogram.observe(0.002), number=n, repeat=50)) / n < 1e-6
+
+
+def test_metrics_server_endpoint_and_snapshots():
+    registry = MetricsRegistry()
+    registry.counter("served_total", "Served.").inc(2)
+    with MetricsServer(registry, port=0, snapshot_interval=0.01) as server:
+        url = f"http://127.0.0.1:{server.port}/metrics"
+        with urllib.request.urlopen(url) as response:
+            body = response.read().decode()
+            assert response.headers["Content-Type"].startswith("text/plain")
+        assert "served_total 2" in body
+
+        deadline = time.time() + 2
+        while len(server.snapshots) < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        assert server.snapshots[-1][1]["served_total"] == 2
@@ -0,0 +1,81 @@
+import math
+
+import pytest
+
+from dndgame import dice, metrics
+from dndgame.character import Character
+from dndgame.combat import Combat
+from dndgame.enemy import Enemy
+from dndgame.outcomes import OutcomeCache, matchup_key
+from dndgame.solver import solve, solve_outcomes
+
+
+@pytest.fixture(autouse=True)
+def quiet_dice():
+    dice.set_verbose(False)
+    yield
+    dice.set_verbose(True)
+
+
+def make_combat(enemy_hp=7, keep_log=False, max_rounds=300):
+    player = Character("Hero", "Human", 10)
+    player.hp, player.attack, player.defense = 12, 2, 10
+    enemy = Enemy("Goblin", "Goblin", 7)
+    enemy.hp, enemy.attack, enemy.defense = enemy_hp, 0, 15
+    return Combat(player, enemy, max_rounds=max_rounds, keep_log=keep_log)
+
+
+@pytest.mark.parametrize("max_rounds", [3, 300])
+def test_end_states_agree_with_solver(max_rounds):
+    ends = solve_outcomes(12, 2, 10, 7, 0, 15, max_rounds)
+    odds = solve(12, 2, 10, 7, 0, 15, max_rounds)
+    assert math.isclose(sum(p for _, p in ends), 1.0)
+    assert math.isclose(sum(r * p for (r, _, _), p in ends), odds.expected_rounds)
+    cache = OutcomeCache()
+    assert math.isclose(cache.get(matchup_key(make_combat(max_rounds=max_rounds))).player_win,
+                        odds.player_win)
+
+
+def test_sampled_fights_match_exact_odds():
+    cache = OutcomeCache()
+    dice.seed(3)
+    fights = 4000
+    wins = 0
+    for _ in range(fights):
+        combat = make_combat()
+        winner, log = cache.resolve(combat)
+        wins += winner == "Player"
+        assert (combat.player.hp > 0) == (winner == "Player") or combat.rounds == 300
+        assert log == []
+    assert (cache.misses, cache.hits) == (1, fights - 1)
+    p = solve(12, 2, 10, 7, 0, 15).player_win
+    assert abs(wins / fights - p) < 3.3 * math.sqrt(p * (1 - p) / fights)
+
+
+def test_lru_eviction_and_metrics():
+    hits, misses = metrics.OUTCOME_CACHE_HITS.value, metrics.OUTCOME_CACHE_MISSES.value
+    cache = OutcomeCache(maxsize=2)
+    for enemy_hp in (5, 6, 5, 7, 6):  # 6 is evicted by 7
+        cache.resolve(make_combat(enemy_hp))
+    assert (cache.hits, cache.misses, len(cache)) == (1, 4, 2)
+    assert metrics.OUTCOME_CACHE_HITS.value - hits == 1
+    assert metrics.OUTCOME_CACHE_MISSES.value - misses == 4
+    cache.clear()
+    assert (len(cache), cache.hit_rate) == (0, 0.0)
+
+
+def test_fights_needing_logs_are_played_out():
+    cache = OutcomeCache()
+    winner, log = cache.resolve(make_combat(keep_log=True))
+    assert log and "attacker" in log[0]
+
+    combat = make_combat()
+    seen = []
+    combat.subscribe("on_attack", lambda _, event: seen.append(event))
+    cache.resolve(combat)
+    assert seen
+
+    cache.enabled = False
+    combat = make_combat()
+    cache.resolve(combat)
+    assert combat.rounds > 0 and cache.misses == 0
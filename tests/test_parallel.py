@@ -0,0 +1,50 @@
+import pytest
+
+from dndgame.character import Character
+from dndgame.enemy import Enemy
+from dndgame.parallel import simulate, simulate_stream
+from dndgame.solver import solve
+
+
+def make_entities():
+    player = Character("Hero", "Human", 10)
+    player.hp, player.attack, player.defense = 12, 2, 10
+    enemy = Enemy("Goblin", "Goblin", 7)
+    enemy.hp, enemy.attack, enemy.defense = 7, 0, 15
+    return player, enemy
+
+
+def test_simulate_aggregates_all_shards():
+    player, enemy = make_entities()
+    result = simulate(player, enemy, fights=2001, workers=2, max_rounds=50)
+
+    assert result.done
+    assert result.fights == result.total == 2001
+    assert result.player_wins + result.enemy_wins == 2001
+    assert sum(result.rounds_histogram) == 2001
+    assert len(result.rounds_histogram) == 51
+    rounds = sum(r * n for r, n in enumerate(result.rounds_histogram))
+    assert sum(result.damage_histogram) == rounds
+
+    odds = solve(12, 2, 10, 7, 0, 15, max_rounds=50)
+    assert result.win_rate == pytest.approx(odds.player_win, abs=0.05)
+
+
+def test_simulate_is_reproducible():
+    player, enemy = make_entities()
+    first = simulate(player, enemy, fights=300, workers=2, seed=5)
+    second = simulate(player, enemy, fights=300, workers=2, seed=5)
+    assert first == second
+    # The parent's entities are never touched
+    assert (player.hp, enemy.hp) == (12, 7)
+
+
+def test_simulate_stream_reports_progress():
+    player, enemy = make_entities()
+    snapshots = list(simulate_stream(player, enemy, fights=3000, workers=2,
+                                     interval=0.01))
+    assert snapshots[-1].done
+    assert not any(s.done for s in snapshots[:-1])
+    counts = [s.fights for s in snapshots]
+    assert counts == sorted(counts)
+    assert counts[-1] == 3000
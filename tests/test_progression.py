@@ -0,0 +1,82 @@
+import pytest
+
+from dndgame.adventure import Adventure
+from dndgame.character import Character
+from dndgame.progression import (
+    MAX_LEVEL,
+    XP_THRESHOLDS,
+    apply_experience,
+    attack_bonus_for_level,
+    level_for_experience,
+    max_hp_for_level,
+)
+
+
+def make_character(con=14, strength=12):
+    c = Character("Hero", "Human", 10)
+    c.stats = {"STR": strength, "DEX": 10, "CON": con, "INT": 10, "WIS": 10, "CHA": 10}
+    c.max_hp = c.hp = max_hp_for_level(10, c.get_modifier("CON"), 1)
+    c.attack = c.get_modifier("STR")
+    return c
+
+
+def test_level_for_experience():
+    assert level_for_experience(0) == 1
+    assert level_for_experience(299) == 1
+    assert level_for_experience(300) == 2
+    assert level_for_experience(6500) == 5
+    assert level_for_experience(10 ** 9) == MAX_LEVEL
+    for level, threshold in enumerate(XP_THRESHOLDS, start=1):
+        assert level_for_experience(threshold) == level
+
+
+def test_level_tables():
+    # Level 1 matches the original roll_stats formulas
+    assert max_hp_for_level(10, 2, 1) == 12
+    assert attack_bonus_for_level(1) == 0
+    # CON +2: each level adds 6 + 2
+    assert max_hp_for_level(10, 2, 4) == 12 + 3 * 8
+    # Very low CON still gains at least 1 HP per level
+    assert max_hp_for_level(10, -8, 3) == 2 + 2
+    assert attack_bonus_for_level(5) == 1
+    assert attack_bonus_for_level(20) == 4
+
+
+def test_gain_experience_levels_up():
+    c = make_character()
+    assert c.gain_experience(100) == 0
+    assert c.level == 1 and c.experience == 100
+
+    c.take(5)  # 12 -> 7 HP
+    assert c.gain_experience(800) == 2  # 900 XP -> level 3
+    assert c.level == 3
+    assert c.max_hp == 12 + 2 * 8
+    assert c.hp == 7 + 2 * 8
+
+    c.gain_experience(14000 - 900)  # level 6
+    assert c.level == 6
+    assert c.attack == 1 + 1
+
+
+def test_gain_experience_before_stats_rolled():
+    c = Character("Hero", "Human", 10)
+    assert c.gain_experience(900) == 2
+    assert c.level == 3
+
+
+def test_apply_experience_batch():
+    party = [make_character() for _ in range(4)]
+    assert apply_experience(party, [0, 299, 300, 100000]) == [0, 0, 1, 11]
+    assert [c.level for c in party] == [1, 1, 2, 12]
+    assert apply_experience(party, 1) == [0, 1, 0, 0]
+
+    with pytest.raises(ValueError):
+        apply_experience(party, [1, 2])
+
+
+def test_complete_encounter_awards_experience():
+    c = make_character()
+    adventure = Adventure("Intro", "A small quest.", c)
+    adventure.complete_encounter("dragon_lair")
+    assert c.experience == 500
+    assert c.level == 2
@@ -0,0 +1,112 @@
+import random
+from unittest.mock import patch
+
+import pytest
+
+from dndgame import dice, metrics
+from dndgame.character import Character
+from dndgame.combat import Combat
+from dndgame.enemy import Enemy
+from dndgame.replay import diff, record, replay, seek
+
+
+def make_combat():
+    """Build a long-ish fight between two evenly matched, tough entities."""
+    player = Character("Hero", "Human", 10)
+    player.hp, player.attack, player.defense = 20, 1, 14
+    enemy = Enemy("Orc", "Orc", 10)
+    enemy.hp, enemy.attack, enemy.defense = 20, 1, 14
+    return Combat(player, enemy, max_rounds=300)
+
+
+def record_with_seed(seed, checkpoint_every=4):
+    random.seed(seed)
+    return record(make_combat(), checkpoint_every=checkpoint_every)
+
+
+def test_replay_reproduces_recorded_fight():
+    rec = record_with_seed(11)
+    assert rec.checkpoints[0].round == 0
+    assert all(cp.round % 4 == 0 for cp in rec.checkpoints)
+    assert replay(rec) == (rec.winner, rec.log)
+
+
+def test_replay_uses_the_recorded_dice_mode():
+    dice.set_buffered(True)
+    try:
+        rec = record_with_seed(13)
+    finally:
+        dice.set_buffered(False)
+    assert rec.buffered
+    assert replay(rec) == (rec.winner, rec.log)
+    assert not dice.is_buffered()
+    rounds = len([e for e in rec.log if "defender_hp" in e])
+    assert seek(rec, rounds).log == rec.log[:rounds]
+
+
+def test_replays_are_not_counted_as_new_fights():
+    rec = record_with_seed(11)
+    finished, rounds = metrics.COMBATS_FINISHED.value, metrics.COMBAT_ROUNDS.count
+    replay(rec)
+    seek(rec, 3)
+    assert (metrics.COMBATS_FINISHED.value, metrics.COMBAT_ROUNDS.count) == (finished, rounds)
+
+
+def test_seek_matches_recorded_state():
+    rec = record_with_seed(12)
+    rounds = len([e for e in rec.log if "defender_hp" in e])
+    assert rounds > 8
+
+    for n in (0, 1, 5, 8, rounds):
+        combat = seek(rec, n)
+        assert combat.rounds == n
+        assert combat.log == rec.log[:n]
+        if n:
+            last = rec.log[n - 1]
+            defender = combat.player if last["defender"] == "Hero" else combat.enemy
+            assert defender.hp == last["defender_hp"]
+
+
+def test_seek_can_continue_the_fight():
+    rec = record_with_seed(13)
+    combat = seek(rec, 6, keep_rng=True)
+    while not combat.finished():
+        combat.step()
+    assert combat.finish() == rec.winner
+    assert combat.log == rec.log
+
+
+def test_seek_restores_nearest_checkpoint():
+    rec = record_with_seed(14, checkpoint_every=4)
+    with patch.object(Combat, "step", autospec=True, side_effect=Combat.step) as step:
+        seek(rec, 9)
+    # Round 8 is checkpointed, so only one round is replayed
+    assert step.call_count == 1
+
+
+def test_seek_leaves_caller_rng_untouched():
+    rec = record_with_seed(15)
+    random.seed(99)
+    expected = random.random()
+    random.seed(99)
+    seek(rec, 5)
+    replay(rec)
+    assert random.random() == expected
+
+
+def test_seek_out_of_range():
+    rec = record_with_seed(16)
+    with pytest.raises(ValueError):
+        seek(rec, len(rec.log) + 1)
+
+
+def test_diff_replays():
+    a = record_with_seed(17)
+    assert diff(a, a) == []
+
+    b = record_with_seed(18)
+    differences = diff(a, b)
+    assert differences
+    index, event_a, event_b = differences[0]
+    assert event_a != event_b
+    assert a.log[:index] == b.log[:index]
@@ -0,0 +1,95 @@
+import random
+
+import pytest
+
+from dndgame import metrics
+from dndgame.character import Character
+from dndgame.combat import Combat
+from dndgame.enemy import Enemy
+from dndgame.scheduler import CombatScheduler, SchedulerFull
+
+
+def make_combat(max_rounds=300, stalemate=False):
+    player = Character("Hero", "Human", 10)
+    player.hp, player.attack, player.defense = 20, 3, 12
+    enemy = Enemy("Goblin", "Goblin", 7)
+    enemy.hp, enemy.attack, enemy.defense = 7, 0, 12
+    if stalemate:
+        # Nobody can deal damage, so the fight lasts max_rounds
+        player.defense = enemy.defense = 100
+    return Combat(player, enemy, max_rounds=max_rounds)
+
+
+def test_runs_all_combats_to_completion():
+    random.seed(3)
+    scheduler = CombatScheduler(max_active=4, max_pending=16)
+    for n in range(10):
+        scheduler.submit(f"s{n}", make_combat())
+    done = scheduler.run_until_idle()
+    assert sorted(c.session_id for c in done) == sorted(f"s{n}" for n in range(10))
+    assert all(c.winner in {"Player", "Enemy"} for c in done)
+    stats = scheduler.stats()
+    assert (stats.active, stats.pending, stats.completed) == (0, 0, 10)
+    assert 0 <= stats.wait_p50 <= stats.wait_p99
+
+
+def test_short_fights_are_not_starved():
+    scheduler = CombatScheduler()
+    for n in range(20):
+        scheduler.submit(f"long{n}", make_combat(stalemate=True))
+    scheduler.submit("short", make_combat(max_rounds=5, stalemate=True))
+
+    rounds = 0
+    finished = []
+    while not finished:
+        finished = [c for c in scheduler.tick(budget=0) if c.session_id == "short"]
+        rounds += 1
+    # Round-robin among 21 sessions: the short fight ends within its 5 turns
+    assert rounds <= 5 * 21
+    assert finished[0].rounds == 5
+
+
+def test_weights_share_rounds():
+    scheduler = CombatScheduler()
+    light = make_combat(stalemate=True)
+    heavy = make_combat(stalemate=True)
+    scheduler.submit("light", light, weight=1)
+    scheduler.submit("heavy", heavy, weight=3)
+    for _ in range(200):
+        scheduler.tick(budget=0)
+    assert heavy.rounds == pytest.approx(3 * light.rounds, abs=3)
+
+
+def test_backpressure():
+    rejected = metrics.SCHEDULER_REJECTED.value
+    scheduler = CombatScheduler(max_active=2, max_pending=1)
+    for n in range(3):
+        scheduler.submit(f"s{n}", make_combat(stalemate=True))
+    assert not scheduler.accepting()
+    assert scheduler.pressure == 1.0
+    with pytest.raises(SchedulerFull):
+        scheduler.submit("late", make_combat())
+    assert scheduler.rejected == 1
+    assert metrics.SCHEDULER_REJECTED.value == rejected + 1
+
+    with pytest.raises(ValueError):
+        scheduler.submit("s0", make_combat())
+
+    # Cancelling an active combat promotes the pending one
+    assert scheduler.cancel("s0")
+    assert not scheduler.cancel("s0")
+    stats = scheduler.stats()
+    assert (stats.active, stats.pending) == (2, 0)
+    assert metrics.SCHEDULER_QUEUE_DEPTH.value == 2
+    scheduler.submit("late", make_combat())
+
+
+def test_tick_respects_time_budget():
+    scheduler = CombatScheduler()
+    combats = [make_combat(stalemate=True) for _ in range(50)]
+    for n, combat in enumerate(combats):
+        scheduler.submit(f"s{n}", combat)
+    scheduler.tick(budget=0)
+    assert sum(c.rounds for c in combats) == 1
+    scheduler.tick(budget=0.01)
+    assert sum(c.rounds for c in combats) > 1
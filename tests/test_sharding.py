@@ -0,0 +1,104 @@
+from collections import Counter
+
+import pytest
+
+from dndgame.sharding import HashRing, ShardedSessions, drive_load
+
+
+def test_ring_moves_only_keys_of_the_changed_node():
+    keys = [f"player-{n}" for n in range(2000)]
+    ring = HashRing(["a", "b", "c"])
+    before = {key: ring.node_for(key) for key in keys}
+    spread = Counter(before.values())
+    assert min(spread.values()) > 2000 / 3 * 0.6
+
+    ring.add("d")
+    moved = [key for key in keys if ring.node_for(key) != before[key]]
+    assert all(ring.node_for(key) == "d" for key in moved)
+    assert 0.1 < len(moved) / len(keys) < 0.45
+
+    ring.remove("d")
+    assert {key: ring.node_for(key) for key in keys} == before
+    with pytest.raises(ValueError):
+        ring.remove("d")
+    with pytest.raises(LookupError):
+        HashRing().node_for("x")
+
+
+def play_script(cluster, session_ids, waves, on_wave=None):
+    results = []
+    for wave in range(waves):
+        if on_wave is not None:
+            on_wave(wave)
+        command = "quest" if wave % 4 == 0 else "fight"
+        results.append(cluster.play_many([(sid, command) for sid in session_ids]))
+    results.append(cluster.play_many([(sid, "status") for sid in session_ids]))
+    return results
+
+
+def test_migrated_sessions_resume_exactly():
+    session_ids = [f"player-{n}" for n in range(12)]
+    with ShardedSessions(workers=1, seed=3) as cluster:
+        for sid in session_ids:
+            cluster.open(sid)
+        expected = play_script(cluster, session_ids, 8)
+
+    with ShardedSessions(workers=2, seed=3) as cluster:
+        for sid in session_ids:
+            cluster.open(sid)
+
+        def reshard(wave):
+            if wave == 2:
+                cluster.add_worker()
+            elif wave == 5:
+                cluster.drain_worker("worker-0")
+
+        assert play_script(cluster, session_ids, 8, reshard) == expected
+        assert cluster.migrations > 0
+        assert cluster.workers == ["worker-1", "worker-2"]
+        assert sum(len(cluster.sessions_on(w)) for w in cluster.workers) == 12
+
+
+def test_snapshot_carries_session_state():
+    with ShardedSessions(workers=2, seed=1) as cluster:
+        cluster.open("alice", name="Alice", race="Elf")
+        cluster.play("alice", "quest")
+        snapshot = cluster.snapshot("alice")
+        assert snapshot.player.attrs["name"] == "Alice"
+        assert snapshot.adventure["completed_encounters"] == ["goblin_ambush"]
+        assert snapshot.adventure["version"] == 1
+        assert snapshot.rng_state is not None
+        assert cluster.play("alice", "status")["completed"] == 1
+        with pytest.raises(KeyError):
+            cluster.play("bob", "fight")
+        with pytest.raises(ValueError):
+            cluster.play("alice", "dance")
+        with pytest.raises(ValueError):
+            cluster.open("alice")
+
+
+def test_failed_batch_leaves_other_workers_in_sync():
+    with ShardedSessions(workers=2, seed=1) as cluster:
+        for n in range(8):
+            cluster.open(f"s{n}")
+        first, second = cluster.workers
+        broken, healthy, *_ = cluster.sessions_on(second)
+        # Route a session to a worker that does not host it
+        cluster._owner[broken] = first
+        with pytest.raises(RuntimeError):
+            cluster.play_many([(broken, "quest"), (healthy, "quest")])
+        cluster._owner[broken] = second
+        assert cluster.play(healthy, "status")["completed"] == 1
+        assert cluster.play(broken, "status")["completed"] == 0
+
+
+def test_cannot_drain_last_worker():
+    with ShardedSessions(workers=1) as cluster:
+        with pytest.raises(ValueError):
+            cluster.drain_worker("worker-0")
+
+
+def test_load_driver_reports_throughput():
+    result = drive_load(workers=2, sessions=8, rounds=3)
+    assert result.requests == 24
+    assert result.throughput > 0
@@ -0,0 +1,70 @@
+import random
+
+import pytest
+
+from dndgame.character import Character
+from dndgame.combat import Combat
+from dndgame.enemy import Enemy
+from dndgame.solver import damage_distribution, solve, solve_combat
+
+
+def make_combat(max_rounds=300):
+    """Build a Character vs Enemy combat with fixed, non-rolled stats."""
+    player = Character("Hero", "Human", 10)
+    player.hp, player.attack, player.defense = 12, 2, 10
+    enemy = Enemy("Goblin", "Goblin", 7)
+    enemy.hp, enemy.attack, enemy.defense = 7, 0, 15
+    return Combat(player, enemy, max_rounds=max_rounds)
+
+
+def test_damage_distribution_sums_to_one():
+    dist = damage_distribution(2, 15)
+    assert sum(p for _, p in dist) == pytest.approx(1.0)
+    # 1d20 + 2 - 15 is positive only on faces 14..20
+    assert dist[0] == (0, pytest.approx(13 / 20))
+    assert [d for d, _ in dist] == [0, 1, 2, 3, 4, 5, 6, 7]
+
+
+def test_solve_certain_outcomes():
+    # Player always deals at least 21 damage, kills on round 1
+    odds = solve(5, 30, 10, 20, 0, 10)
+    assert odds.player_win == pytest.approx(1.0)
+    assert odds.expected_rounds == pytest.approx(1.0)
+
+    # Nobody can ever hit: HP tiebreak at the cap, ties go to the player
+    odds = solve(5, 0, 30, 5, 0, 30, max_rounds=10)
+    assert odds.player_win == 1.0
+    assert odds.expected_rounds == 10
+    assert odds.max_rounds_reached == 1.0
+
+    # Player starts at 0 HP: the loop never runs
+    odds = solve(0, 5, 10, 5, 0, 10)
+    assert odds.enemy_win == 1.0
+    assert odds.expected_rounds == 0
+
+
+def test_solve_is_memoized():
+    solve.cache_clear()
+    first = solve(12, 2, 10, 7, 0, 15)
+    second = solve(12, 2, 10, 7, 0, 15)
+    assert first is second
+    assert solve.cache_info().hits == 1
+
+
+def test_solve_agrees_with_simulation():
+    random.seed(2024)
+    combat = make_combat(max_rounds=20)
+    odds = solve_combat(combat)
+
+    fights = 3000
+    wins = rounds = capped = 0
+    for _ in range(fights):
+        combat.player.hp, combat.enemy.hp = 12, 7
+        winner, log = combat.run()
+        wins += winner == "Player"
+        rounds += sum(1 for e in log if "defender_hp" in e)
+        capped += log[-1].get("event") == "max_rounds_reached"
+
+    assert wins / fights == pytest.approx(odds.player_win, abs=0.03)
+    assert rounds / fights == pytest.approx(odds.expected_rounds, abs=0.3)
+    assert capped / fights == pytest.approx(odds.max_rounds_reached, abs=0.03)
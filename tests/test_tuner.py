@@ -0,0 +1,89 @@
+import json
+
+import pytest
+
+from dndgame import tuner as tuner_module
+from dndgame.character import Character
+from dndgame.tuner import (
+    EncounterTuner,
+    EnemyProfile,
+    PlayerProfile,
+    bestiary_entry,
+    write_bestiary,
+)
+
+
+PLAYER = PlayerProfile(hp=12, attack=2, defense=10)
+
+
+def test_player_profile_from_character():
+    c = Character("Hero", "Human", 10)
+    c.max_hp, c.hp, c.attack, c.defense = 14, 3, 1, 10
+    assert PlayerProfile.from_character(c) == PlayerProfile(14, 1, 10)
+
+
+def test_invalid_target_rejected():
+    with pytest.raises(ValueError):
+        EncounterTuner(PLAYER, target=1.5)
+
+
+def test_evaluate_stops_early_on_clear_rejection():
+    tuner = EncounterTuner(PLAYER, target=0.5, workers=1, batch_size=32)
+    # A 1 HP enemy is hopeless, so the first batch settles the verdict
+    (result,) = tuner.evaluate([EnemyProfile(base_hp=1, armor_class=8)])
+    assert result.verdict == "rejected"
+    assert result.samples == 32
+    assert result.win_rate > 0.9
+
+
+def test_evaluate_uses_cache():
+    tuner = EncounterTuner(PLAYER, target=0.5, workers=1)
+    enemy = EnemyProfile(base_hp=10, armor_class=12)
+    first = tuner.evaluate([enemy, enemy])
+    assert len(tuner.cache) == 1
+    assert tuner.evaluate([enemy])[0] is first[0]
+
+
+def test_parallel_evaluation_matches_serial():
+    enemies = [EnemyProfile(hp, 12) for hp in (6, 10, 14)]
+    serial = EncounterTuner(PLAYER, target=0.6, workers=1, seed=7).evaluate(enemies)
+    parallel = EncounterTuner(PLAYER, target=0.6, workers=2, seed=7).evaluate(enemies)
+    assert serial == parallel
+
+
+def test_tune_finds_configurations_near_target():
+    tuner = EncounterTuner(PLAYER, target=0.6, workers=1)
+    accepted = tuner.tune(base_hp=(1, 30), armor_classes=[11, 13], str_bonuses=[0],
+                          con_bonuses=[0])
+    assert accepted
+    assert all(e.verdict == "accepted" for e in accepted)
+    assert all(abs(e.win_rate - 0.6) <= tuner.tolerance for e in accepted)
+
+
+def test_parallel_tune_reuses_one_pool(monkeypatch):
+    pools = []
+
+    class CountingPool(tuner_module.ProcessPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            pools.append(self)
+
+    monkeypatch.setattr(tuner_module, "ProcessPoolExecutor", CountingPool)
+    kwargs = dict(base_hp=(1, 30), armor_classes=[11, 13], str_bonuses=[0], con_bonuses=[0])
+    serial = EncounterTuner(PLAYER, target=0.6, workers=1).tune(**kwargs)
+    parallel = EncounterTuner(PLAYER, target=0.6, workers=2).tune(**kwargs)
+    assert parallel == serial
+    assert len(pools) == 1
+
+
+def test_write_bestiary(tmp_path):
+    tuner = EncounterTuner(PLAYER, target=0.6, workers=1)
+    (result,) = tuner.evaluate([EnemyProfile(11, 12)])
+    path = tmp_path / "bestiary.json"
+    write_bestiary([bestiary_entry(result, "Goblin Scout", "Goblin")], str(path))
+
+    (entry,) = json.loads(path.read_text())
+    assert entry["name"] == "Goblin Scout"
+    assert entry["base_hp"] == 11
+    assert entry["armor_class"] == 12
+    assert entry["bonuses"] == {"STR": 0, "CON": 0}
@@ -0,0 +1,107 @@
+import random
+from unittest.mock import patch
+
+import pytest
+
+from dndgame.character import Character
+from dndgame.combat import Combat
+from dndgame.enemy import Enemy
+from dndgame.solver import solve_combat
+from dndgame.weapons import (
+    WEAPONS,
+    Weapon,
+    attack_distribution,
+    attack_table,
+    damage_distribution,
+    get_weapon,
+    list_weapons,
+    register_weapon,
+)
+
+
+def test_weapon_registry():
+    assert "Longsword" in list_weapons()
+    assert get_weapon("GREATAXE") == Weapon("Greataxe", "1d12", two_handed=True)
+    assert get_weapon("Spoon") is None
+
+    register_weapon(Weapon("Club", "1d4"))
+    try:
+        assert get_weapon("club").damage == "1d4"
+    finally:
+        del WEAPONS["Club"]
+
+    with pytest.raises(ValueError):
+        register_weapon(Weapon("Broken", "1x4"))
+
+
+def test_equip():
+    c = Character("Hero", "Human", 10)
+    assert c.weapon is None
+    c.equip("dagger")
+    assert c.weapon.name == "Dagger"
+    with pytest.raises(KeyError):
+        c.equip("Spoon")
+
+
+def test_roll_damage_doubles_dice_on_crit():
+    sword = get_weapon("Longsword")
+    with patch("random.randint", side_effect=[5, 5, 7]):
+        assert sword.roll_damage(2) == 7
+        assert sword.roll_damage(2, is_crit=True) == 14  # 5 + 7 + 2
+    # Damage never goes below zero
+    with patch("random.randint", return_value=1):
+        assert sword.roll_damage(-5) == 0
+
+
+def test_damage_distribution():
+    dist = dict(damage_distribution("1d8", 2))
+    assert sum(dist.values()) == pytest.approx(1.0)
+    assert min(dist) == 3 and max(dist) == 10
+
+    crit = dict(damage_distribution("1d8", 2, is_crit=True))
+    assert min(crit) == 4 and max(crit) == 18
+    assert sum(d * p for d, p in crit.items()) == pytest.approx(2 * 4.5 + 2)
+
+
+def test_attack_distribution_counts_misses():
+    sword = get_weapon("Longsword")
+    dist = dict(attack_distribution(sword, 0, 16, can_crit=False))
+    # Faces 1-15 miss
+    assert dist[0] == pytest.approx(15 / 20)
+    assert sum(dist.values()) == pytest.approx(1.0)
+
+    # Against impossible defense only a natural 20 lands, as a crit
+    crit_only = dict(attack_distribution(sword, 0, 99, can_crit=True))
+    assert crit_only[0] == pytest.approx(19 / 20)
+    assert max(crit_only) == 16
+
+
+def test_attack_table_sampling():
+    table = attack_table(get_weapon("Greatsword"), 3, 13)
+    assert attack_table(get_weapon("Greatsword"), 3, 13) is table
+    random.seed(1)
+    samples = table.sample(20000)
+    assert sum(samples) / len(samples) == pytest.approx(table.mean(), rel=0.05)
+
+
+def test_armed_combat_matches_solver():
+    random.seed(8)
+    player = Character("Hero", "Human", 10)
+    player.hp, player.attack, player.defense = 14, 2, 12
+    player.equip("Longsword")
+    enemy = Enemy("Orc", "Orc", 10)
+    enemy.hp, enemy.attack, enemy.defense = 15, 1, 13
+    enemy.equip("Greataxe")
+    combat = Combat(player, enemy, max_rounds=40)
+    odds = solve_combat(combat)
+
+    fights = 3000
+    wins = 0
+    for _ in range(fights):
+        player.hp, enemy.hp = 14, 15
+        winner, log = combat.run()
+        wins += winner == "Player"
+        for event in log:
+            if event.get("crit"):
+                assert event["dmg"] >= 2 + 2
+    assert wins / fights == pytest.approx(odds.player_win, abs=0.03)
@@ -0,0 +1,77 @@
+import pytest
+
+from dndgame.adventure import Adventure
+from dndgame.character import Character
+from dndgame.world import Scene, World, WorldWriter
+
+
+def build_world(path, size=2000):
+    """A long corridor of scenes, each with one encounter."""
+    with WorldWriter(str(path), "Corridor", "A very long corridor.", start="s0") as writer:
+        for n in range(size):
+            exits = [f"s{m}" for m in (n - 1, n + 1) if 0 <= m < size]
+            writer.add_scene(f"s{n}", f"Room {n}", f"Room number {n}.",
+                             exits=exits, encounters=[f"e{n}"])
+            writer.add_encounter(f"e{n}", f"Foe {n}", "Something stirs.",
+                                 ("Easy", "Medium", "Hard")[n % 3], enemy="Goblin")
+    return str(path)
+
+
+def test_world_lookup(tmp_path):
+    path = build_world(tmp_path / "corridor.dnw")
+    with World(path, cache_size=4) as world:
+        assert (world.name, world.start) == ("Corridor", "s0")
+        assert (world.scene_count, world.encounter_count) == (2000, 2000)
+        assert world.loads == 0  # opening reads only the header
+
+        assert world.scene("s1234") == Scene("s1234", "Room 1234", "Room number 1234.",
+                                             ("s1233", "s1235"), ("e1234",))
+        assert world.encounter("e7")["enemy"] == "Goblin"
+        world.scene("s1234")
+        assert world.loads == 2
+
+        for n in range(10):
+            world.scene(f"s{n}")
+        assert world.resident_scenes() == ["s6", "s7", "s8", "s9"]
+        with pytest.raises(KeyError):
+            world.scene("nowhere")
+        with pytest.raises(KeyError):
+            world.encounter("s1")
+
+
+def test_world_writer_rejects_duplicates(tmp_path):
+    with pytest.raises(ValueError):
+        with WorldWriter(str(tmp_path / "dup.dnw"), "Dup", "", start="a") as writer:
+            writer.add_scene("a", "A", "")
+            writer.add_scene("a", "A again", "")
+    assert not list(tmp_path.iterdir())
+
+    (tmp_path / "junk.dnw").write_bytes(b"x" * 64)
+    with pytest.raises(ValueError):
+        World(str(tmp_path / "junk.dnw"))
+
+
+def test_adventure_in_world_mode(tmp_path):
+    path = build_world(tmp_path / "corridor.dnw")
+    player = Character("Hero", "Human", 10)
+    with World(path, cache_size=8) as world:
+        adventure = Adventure("Corridor", "Walk it.", player, world=world)
+        assert adventure.current_scene == "s0"
+        assert adventure.get_available_encounters_list() == ["e0"]
+        assert adventure.choose_encounter("e0")
+        adventure.complete_encounter("e0")
+        assert adventure.get_available_encounters_list() == []
+        with pytest.raises(KeyError):
+            adventure.choose_encounter("e5")  # not in this scene
+
+        for n in range(1, 50):
+            adventure.move_to(f"s{n}")
+            adventure.complete_encounter(f"e{n}")
+        with pytest.raises(ValueError):
+            adventure.move_to("s10")
+        assert adventure.get_exits() == ["s48", "s50"]
+        assert adventure.get_adventure_status()["current_scene"] == "s49"
+        assert len(adventure.completed_encounters) == 50
+        # Memory follows the player: only the neighborhood stays resident
+        assert len(world.resident_scenes()) <= 8
+        assert world.loads < 120